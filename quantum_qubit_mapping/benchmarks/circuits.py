@@ -0,0 +1,65 @@
+from pyquil import Program
+from pyquil.gates import CNOT, CPHASE, H, RX, RZ
+
+import random
+import numpy as np
+
+def random_cnot_circuit(num_qubits: int, num_gates: int, seed: int = 0) -> Program:
+    """Creates a circuit of CNOT gates acting on uniformly random pairs of qubits
+
+    Args:
+        num_qubits (int): number of logical qubits
+        num_gates (int): number of CNOT gates
+        seed (int, optional): seed of the random qubit pairs. Defaults to 0
+
+    Returns:
+        Program: random CNOT circuit
+    """
+    rng = random.Random(seed)
+    qubits = range(num_qubits)
+    return Program([CNOT(*rng.sample(qubits, 2)) for _ in range(num_gates)])
+
+def qft_circuit(num_qubits: int) -> Program:
+    """Creates a quantum Fourier transform circuit without the final qubit reversal
+
+    Args:
+        num_qubits (int): number of logical qubits
+
+    Returns:
+        Program: QFT circuit of Hadamard and controlled phase gates
+    """
+    instructions = list()
+    for target_qubit in range(num_qubits):
+        instructions.append(H(target_qubit))
+        for control_qubit in range(target_qubit + 1, num_qubits):
+            instructions.append(CPHASE(np.pi / 2 ** (control_qubit - target_qubit), control_qubit, target_qubit))
+    return Program(instructions)
+
+def qaoa_circuit(num_qubits: int, num_layers: int, edge_probability: float = 0.5, seed: int = 0) -> Program:
+    """Creates a QAOA-style circuit for MaxCut on a random graph. Every layer applies a ZZ interaction,
+        decomposed into CNOT, RZ and CNOT, on every edge of the problem graph followed by RX mixers
+
+    Args:
+        num_qubits (int): number of logical qubits
+        num_layers (int): number of QAOA layers
+        edge_probability (float, optional): probability of every edge of the random problem graph. Defaults to 0.5
+        seed (int, optional): seed of the problem graph and angles. Defaults to 0
+
+    Returns:
+        Program: QAOA-style circuit
+    """
+    rng = random.Random(seed)
+    edges = [(u, v) for u in range(num_qubits) for v in range(u + 1, num_qubits) if rng.random() < edge_probability]
+    instructions = [H(qubit) for qubit in range(num_qubits)]
+    for _ in range(num_layers):
+        gamma, beta = rng.uniform(0, np.pi), rng.uniform(0, np.pi)
+        for u, v in edges:
+            instructions.extend([CNOT(u, v), RZ(2 * gamma, v), CNOT(u, v)])
+        instructions.extend(RX(2 * beta, qubit) for qubit in range(num_qubits))
+    return Program(instructions)
+
+CIRCUIT_FAMILIES = {
+    'random_cnot': random_cnot_circuit,
+    'qft': qft_circuit,
+    'qaoa': qaoa_circuit,
+}
@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+CORE_MODULES = ('sabre_tools.sabre', 'sabre_tools.coupling_map', 'sabre_tools.distance_matrix', 'sabre_tools.layout', 'sabre_tools.placement', 'sabre_tools.routing_strategy', 'sabre_tools.verification')
+ADAPTER_DEPENDENCIES = ('pyquil', 'networkx')
+CORE_IMPORT_TIME_LIMIT = 0.3
+
+IMPORT_TIME_SCRIPT = '''
+import json, sys, time
+start_time = time.perf_counter()
+for module_name in {modules!r}:
+    __import__(module_name)
+import_seconds = time.perf_counter() - start_time
+
+from sabre_tools.coupling_map import CouplingMap
+from sabre_tools.distance_matrix import compute_distance_matrix
+from sabre_tools.sabre import SABRE
+coupling_map = CouplingMap([(qubit, qubit + 1) for qubit in range(7)])
+sabre = SABRE(compute_distance_matrix(coupling_map), coupling_map)
+sabre.route_gate_qubits([(0, 7), (1, 6), (2, 5), (3, 4)], {{qubit: qubit for qubit in range(8)}})
+
+loaded_dependencies = sorted({{module_name.split('.')[0] for module_name in sys.modules}} & set({dependencies!r}))
+print(json.dumps({{'import_seconds': import_seconds, 'loaded_adapter_dependencies': loaded_dependencies}}))
+'''
+
+def measure_core_import_time(repeats: int = 5) -> dict:
+    """Imports the routing core and routes a small circuit of integer qubit pairs in fresh interpreters, recording
+        the import time and whether pyquil or networkx were loaded. The fastest of several runs is reported, as
+        the first run also pays for reading the files from disk
+
+    Args:
+        repeats (int, optional): number of fresh interpreters to measure. Defaults to 5
+
+    Returns:
+        dict: fastest import time in seconds, the limit and the adapter dependencies loaded by the core
+    """
+    script = IMPORT_TIME_SCRIPT.format(modules=CORE_MODULES, dependencies=ADAPTER_DEPENDENCIES)
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    measurements = list()
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', script], cwd=package_dir, capture_output=True, text=True, check=True).stdout
+        measurements.append(json.loads(output))
+    return {
+        'import_seconds': min(measurement['import_seconds'] for measurement in measurements),
+        'limit_seconds': CORE_IMPORT_TIME_LIMIT,
+        'loaded_adapter_dependencies': sorted(set().union(*(measurement['loaded_adapter_dependencies'] for measurement in measurements))),
+    }
+
+def main(argv: list = None) -> None:
+    """Measures the import time of the routing core and exits with an error if it exceeds CORE_IMPORT_TIME_LIMIT
+        or if importing and routing with the core loads pyquil or networkx
+
+    Args:
+        argv (list, optional): command line arguments. Defaults to sys.argv
+    """
+    parser = argparse.ArgumentParser(description="Check the import time of the pyquil-free routing core")
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    result = measure_core_import_time(args.repeats)
+    print("core import: {import_seconds:.3f}s (limit {limit_seconds:.3f}s), adapter dependencies loaded: {loaded_adapter_dependencies}".format(**result))
+    if result['import_seconds'] > CORE_IMPORT_TIME_LIMIT or result['loaded_adapter_dependencies']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+from benchmarks.circuits import CIRCUIT_FAMILIES
+from benchmarks.import_time import measure_core_import_time
+from sabre_tools.circuit_preprocess import get_distance_matrix, get_initial_mapping
+from sabre_tools.layout import Layout
+from sabre_tools.routing import route_dag_bidirectional
+from sabre_tools.routing_strategy import RoutingStrategy
+from sabre_tools.sabre import SABRE
+from sabre_tools.topologies import get_topology
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+
+BENCHMARK_SUITES = {
+    'small': [
+        ('random_cnot', {'num_gates': 500}, 'line:16'),
+        ('random_cnot', {'num_gates': 500}, 'ring:16'),
+        ('random_cnot', {'num_gates': 500}, 'grid:4x4'),
+        ('random_cnot', {'num_gates': 500}, 'heavy_hex:1x1'),
+        ('qft', {}, 'line:12'),
+        ('qft', {}, 'grid:3x4'),
+        ('qaoa', {'num_layers': 2}, 'ring:12'),
+        ('qaoa', {'num_layers': 2}, 'grid:3x4'),
+        ('random_cnot', {'num_qubits': 10, 'num_gates': 500}, 'grid:4x4'),
+        ('qft', {'num_qubits': 8}, 'heavy_hex:1x1'),
+    ],
+    'default': [
+        ('random_cnot', {'num_gates': 2000}, 'line:32'),
+        ('random_cnot', {'num_gates': 2000}, 'ring:32'),
+        ('random_cnot', {'num_gates': 5000}, 'grid:5x5'),
+        ('random_cnot', {'num_gates': 5000}, 'heavy_hex:2x3'),
+        ('qft', {}, 'line:25'),
+        ('qft', {}, 'grid:5x5'),
+        ('qft', {}, 'heavy_hex:2x3'),
+        ('qaoa', {'num_layers': 3}, 'ring:20'),
+        ('qaoa', {'num_layers': 3}, 'grid:5x5'),
+        ('random_cnot', {'num_qubits': 16, 'num_gates': 5000}, 'heavy_hex:2x3'),
+    ],
+    'large': [
+        ('random_cnot', {'num_gates': 100000}, 'grid:10x10'),
+        ('random_cnot', {'num_gates': 100000}, 'heavy_hex:4x5'),
+        ('qft', {}, 'grid:10x10'),
+        ('qaoa', {'num_layers': 4}, 'heavy_hex:2x3'),
+        ('random_cnot', {'num_gates': 1000000}, 'grid:4x4'),
+    ],
+}
+
+def run_benchmark(family: str, circuit_params: dict, topology_spec: str, seed: int = 0, passes: int = 3, measure_memory: bool = True, routing_strategy: RoutingStrategy = None) -> dict:
+    """Generates a benchmark circuit for a topology, routes it with bidirectional SABRE and records
+        speed and quality metrics. The circuit uses every physical qubit of the topology unless circuit_params
+        gives a smaller num_qubits, in which case the free physical qubits hold ancillas
+
+    Args:
+        family (str): name of the circuit family in CIRCUIT_FAMILIES
+        circuit_params (dict): parameters of the circuit family. num_qubits defaults to the number of physical qubits
+        topology_spec (str): topology specification understood by get_topology
+        seed (int, optional): seed of the random initial mapping. Defaults to 0
+        passes (int, optional): maximum number of bidirectional passes. Defaults to 3
+        measure_memory (bool, optional): whether to trace the peak memory of the run. Tracing slows down
+                                        allocations, so wall times are only comparable between runs with the same setting
+        routing_strategy (RoutingStrategy, optional): strategy generating and scoring the candidate SWAPs. Defaults to
+                                                    the lookahead and decay heuristic of the SABRE paper
+
+    Returns:
+        dict: benchmark record with wall times, peak memory, heuristic evaluations, inserted SWAPs and cnot_count
+    """
+    coupling_graph = get_topology(topology_spec)
+    family_params = dict(circuit_params)
+    num_qubits = family_params.pop('num_qubits', coupling_graph.number_of_nodes())
+    circuit = CIRCUIT_FAMILIES[family](num_qubits, **family_params)
+    initial_mapping = get_initial_mapping(circuit, coupling_graph, seed=seed)
+
+    if measure_memory:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph, collect_stats=True, routing_strategy=routing_strategy)
+    setup_time = time.perf_counter()
+    circuit_dag = sabre.build_circuit_dag(circuit)
+    dag_build_time = time.perf_counter()
+    layout = Layout.from_mapping(initial_mapping, len(sabre.adjacency_bitmap))
+    routed_schedule, pass_layout = route_dag_bidirectional(sabre, circuit_dag, layout, passes)
+    routing_time = time.perf_counter()
+    final_program = sabre.emit_program(routed_schedule, circuit_dag)
+    end_time = time.perf_counter()
+    peak_memory = None
+    if measure_memory:
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        'name': get_benchmark_name(family, circuit_params, topology_spec),
+        'family': family,
+        'circuit_params': circuit_params,
+        'topology': topology_spec,
+        'num_logical_qubits': num_qubits,
+        'num_physical_qubits': coupling_graph.number_of_nodes(),
+        'num_gates': circuit_dag.num_gates,
+        'seed': seed,
+        'passes': passes,
+        'routing_strategy': sabre.routing_strategy.get_settings(),
+        'setup_seconds': setup_time - start_time,
+        'dag_build_seconds': dag_build_time - setup_time,
+        'routing_seconds': routing_time - dag_build_time,
+        'emit_seconds': end_time - routing_time,
+        'wall_seconds': end_time - start_time,
+        'peak_memory_bytes': peak_memory,
+        'heuristic_evaluations': sabre.heuristic_evaluations,
+        'swaps_inserted': sum(1 for operation in routed_schedule if isinstance(operation, tuple)),
+        'cnot_count': sabre.cnot_count(final_program),
+        'routing_stats': sabre.stats.to_dict(),
+    }
+
+def get_benchmark_name(family: str, circuit_params: dict, topology_spec: str) -> str:
+    """Builds a stable name identifying a benchmark case across runs
+
+    Args:
+        family (str): name of the circuit family
+        circuit_params (dict): parameters of the circuit family
+        topology_spec (str): topology specification
+
+    Returns:
+        str: benchmark name such as "random_cnot[num_gates=500]@grid:4x4"
+    """
+    params = ','.join('{}={}'.format(key, value) for key, value in sorted(circuit_params.items()))
+    return '{}[{}]@{}'.format(family, params, topology_spec)
+
+def get_environment_metadata() -> dict:
+    """Collects the versions and platform information stored with benchmark results
+
+    Returns:
+        dict: package and dependency versions, Python version, platform and timestamp
+    """
+    from importlib import metadata
+    versions = dict()
+    for package in ('quantum-qubit-mapping', 'numpy', 'networkx', 'pyquil'):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {
+        'versions': versions,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+def compare_results(baseline_results: dict, current_results: dict) -> list:
+    """Compares two benchmark result files case by case
+
+    Args:
+        baseline_results (dict): results of an earlier run
+        current_results (dict): results of the current run
+
+    Returns:
+        list: for every case present in both runs, its name, wall time ratio and cnot_count difference
+    """
+    baseline_records = {record['name']: record for record in baseline_results['results']}
+    comparison = list()
+    for record in current_results['results']:
+        baseline_record = baseline_records.get(record['name'])
+        if baseline_record is None:
+            continue
+        comparison.append({
+            'name': record['name'],
+            'wall_time_ratio': record['wall_seconds'] / baseline_record['wall_seconds'],
+            'cnot_count_difference': record['cnot_count'] - baseline_record['cnot_count'],
+        })
+    return comparison
+
+def main(argv: list = None) -> None:
+    """Runs a benchmark suite and writes the results as JSON
+
+    Args:
+        argv (list, optional): command line arguments. Defaults to sys.argv
+    """
+    parser = argparse.ArgumentParser(description="Benchmark SABRE routing speed and quality")
+    parser.add_argument('--suite', choices=sorted(BENCHMARK_SUITES), default='small')
+    parser.add_argument('--output', default='benchmark_results.json', help="path of the JSON results file")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--passes', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help="do not trace peak memory")
+    args = parser.parse_args(argv)
+
+    results = {'metadata': get_environment_metadata(), 'suite': args.suite, 'core_import': measure_core_import_time(), 'results': list()}
+    for family, circuit_params, topology_spec in BENCHMARK_SUITES[args.suite]:
+        record = run_benchmark(family, circuit_params, topology_spec, seed=args.seed, passes=args.passes, measure_memory=not args.no_memory)
+        results['results'].append(record)
+        print("{name}: {wall_seconds:.3f}s, {swaps_inserted} SWAPs, cnot_count {cnot_count}".format(**record))
+
+    with open(args.output, 'w') as output_file:
+        json.dump(results, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline_results = json.load(baseline_file)
+        for case in compare_results(baseline_results, results):
+            print("{name}: {wall_time_ratio:.2f}x wall time, {cnot_count_difference:+d} cnot_count".format(**case))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+from benchmarks.run_benchmarks import BENCHMARK_SUITES, get_environment_metadata, run_benchmark
+from sabre_tools.routing_strategy import get_routing_strategy
+
+import argparse
+import json
+import numpy as np
+
+DEFAULT_STRATEGIES = ('basic', 'lookahead', 'decay:0.25', 'decay', 'decay:1.0')
+
+def run_strategy_sweep(strategy_specs: list, suite: str = 'small', seeds: list = (0,), passes: int = 3) -> list:
+    """Routes every benchmark circuit of a suite with every routing strategy and seed. Memory is not traced so
+        that the wall times of the strategies are comparable
+
+    Args:
+        strategy_specs (list): routing strategy specifications understood by get_routing_strategy
+        suite (str, optional): name of the suite in BENCHMARK_SUITES. Defaults to 'small'
+        seeds (list, optional): seeds of the random initial mappings. Defaults to (0,)
+        passes (int, optional): maximum number of bidirectional passes. Defaults to 3
+
+    Returns:
+        list: benchmark record of every run with the strategy specification added
+    """
+    records = list()
+    for family, circuit_params, topology_spec in BENCHMARK_SUITES[suite]:
+        for seed in seeds:
+            for strategy_spec in strategy_specs:
+                record = run_benchmark(family, circuit_params, topology_spec, seed=seed, passes=passes, measure_memory=False,
+                                       routing_strategy=get_routing_strategy(strategy_spec))
+                record['strategy'] = strategy_spec
+                records.append(record)
+    return records
+
+def summarize_strategies(records: list, baseline_strategy: str) -> list:
+    """Compares the speed and quality of every strategy to a baseline strategy over the runs they share. Ratios are
+        averaged as geometric means, so a case taking twice as long weighs as much as one taking half as long
+
+    Args:
+        records (list): benchmark records returned by run_strategy_sweep
+        baseline_strategy (str): specification of the strategy the others are compared to
+
+    Returns:
+        list: for every strategy, its total routing time and cnot_count and the geometric mean of its routing time
+                and cnot_count ratios to the baseline
+    """
+    baseline_records = {(record['name'], record['seed']): record for record in records if record['strategy'] == baseline_strategy}
+    strategy_records = dict()
+    for record in records:
+        strategy_records.setdefault(record['strategy'], list()).append(record)
+
+    summaries = list()
+    for strategy_spec, strategy_record_list in strategy_records.items():
+        paired_records = [(record, baseline_records[record['name'], record['seed']]) for record in strategy_record_list
+                          if (record['name'], record['seed']) in baseline_records]
+        time_ratios = [record['routing_seconds'] / baseline_record['routing_seconds'] for record, baseline_record in paired_records]
+        cnot_ratios = [record['cnot_count'] / baseline_record['cnot_count'] for record, baseline_record in paired_records]
+        summaries.append({
+            'strategy': strategy_spec,
+            'runs': len(strategy_record_list),
+            'routing_seconds': sum(record['routing_seconds'] for record in strategy_record_list),
+            'cnot_count': sum(record['cnot_count'] for record in strategy_record_list),
+            'swaps_inserted': sum(record['swaps_inserted'] for record in strategy_record_list),
+            'routing_time_ratio': float(np.exp(np.mean(np.log(time_ratios)))) if paired_records else None,
+            'cnot_count_ratio': float(np.exp(np.mean(np.log(cnot_ratios)))) if paired_records else None,
+        })
+    return summaries
+
+def main(argv: list = None) -> None:
+    """Sweeps routing strategies over a benchmark suite and writes the runs and the speed/quality summary as JSON
+
+    Args:
+        argv (list, optional): command line arguments. Defaults to sys.argv
+    """
+    parser = argparse.ArgumentParser(description="Measure the speed and quality trade-off of SABRE routing strategies")
+    parser.add_argument('--suite', choices=sorted(BENCHMARK_SUITES), default='small')
+    parser.add_argument('--strategy', action='append', dest='strategies', help="routing strategy to sweep, may be repeated. Defaults to {}".format(', '.join(DEFAULT_STRATEGIES)))
+    parser.add_argument('--baseline', default='decay', help="strategy the others are compared to. Defaults to decay")
+    parser.add_argument('--output', default='strategy_sweep.json', help="path of the JSON results file")
+    parser.add_argument('--seeds', type=int, default=1, help="number of random initial mappings per circuit")
+    parser.add_argument('--passes', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    strategy_specs = list(args.strategies or DEFAULT_STRATEGIES)
+    if args.baseline not in strategy_specs:
+        strategy_specs.append(args.baseline)
+    try:
+        for strategy_spec in strategy_specs:
+            get_routing_strategy(strategy_spec)
+    except ValueError as error:
+        parser.error(str(error))
+
+    records = run_strategy_sweep(strategy_specs, args.suite, list(range(args.seeds)), args.passes)
+    summaries = summarize_strategies(records, args.baseline)
+    for summary in summaries:
+        print("{strategy}: {routing_seconds:.3f}s, {swaps_inserted} SWAPs, cnot_count {cnot_count}, "
+              "{routing_time_ratio:.2f}x routing time and {cnot_count_ratio:.3f}x cnot_count of the baseline".format(**summary))
+
+    with open(args.output, 'w') as output_file:
+        json.dump({'metadata': get_environment_metadata(), 'suite': args.suite, 'baseline': args.baseline, 'summary': summaries, 'results': records}, output_file, indent=2)
+
+if __name__ == '__main__':
+    main()
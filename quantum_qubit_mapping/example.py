@@ -2,8 +2,9 @@ from pyquil import Program
 from pyquil.gates import CNOT, Gate, H, SWAP
 import networkx as nx
 from sabre_tools.sabre import SABRE
+from sabre_tools.routing import route_bidirectional
 
-from sabre_tools.circuit_preprocess import preprocess_input_circuit, get_initial_mapping, get_distance_matrix
+from sabre_tools.circuit_preprocess import get_initial_mapping, get_distance_matrix
     
 
 #inputs
@@ -30,24 +31,12 @@ forbidden_gates = sabre_proc.rewiring_correctness(original_circuit, initial_mapp
 print("forbidden gates: ", forbidden_gates)
 print("number of gates in input circuit: ", sabre_proc.cnot_count(original_circuit))
 print()
-temp_mapping = initial_mapping.copy()
-temp_circuit = original_circuit.copy()
-
-for iteration in range(3):
-    front_layer_gates, circuit_dag = preprocess_input_circuit(circuit=temp_circuit)
-    final_program, final_mapping = sabre_proc.execute_sabre_algorithm(front_layer_gates = front_layer_gates, qubit_mapping = temp_mapping, circuit_dag = circuit_dag)
-
-    reversed_ins = reversed(temp_circuit.instructions)
-    temp_circuit = Program()
-    for ins in reversed_ins:
-        temp_circuit.inst(ins)
-
-    temp_mapping = final_mapping.copy()
+final_program, last_pass_mapping, final_mapping = route_bidirectional(original_circuit, coupling_graph, passes=3, initial_mapping=initial_mapping, sabre=sabre_proc)
 
 print("final output circuit:")
 print(final_program)
 print("final mapping after rewiring: ", final_mapping)
-forbidden_gates = sabre_proc.rewiring_correctness(final_program, final_mapping)
+forbidden_gates = sabre_proc.rewiring_correctness(final_program, last_pass_mapping)
 if forbidden_gates:
     print("", forbidden_gates)
 else:
@@ -0,0 +1,117 @@
+from networkx import Graph
+from pyquil import Program
+from sabre_tools.circuit_preprocess import get_distance_matrix, get_initial_mapping
+from sabre_tools.device_router import get_circuit_seeds
+from sabre_tools.layout import Layout
+from sabre_tools.placement import get_initial_placement
+from sabre_tools.sabre import SABRE
+
+import time
+import numpy as np
+
+class AnytimeResult():
+    def __init__(self, final_program: Program, initial_mapping: dict, final_mapping: dict, swaps_inserted: int) -> None:
+        """Initialize the best result found by deadline-bounded routing
+
+        Args:
+            final_program (Program): best routed program found before the deadline
+            initial_mapping (dict): logical to physical qubit mapping the routed program starts from
+            final_mapping (dict): logical to physical qubit mapping after the routed program
+            swaps_inserted (int): number of SWAPs in the routed program
+        """
+        self.final_program = final_program
+        self.initial_mapping = initial_mapping
+        self.final_mapping = final_mapping
+        self.swaps_inserted = swaps_inserted
+        self.trials_completed = 0
+        self.passes_completed = 0
+        self.first_result_seconds = None
+        self.elapsed_seconds = None
+        self.budget_overrun_seconds = 0.0
+        self.deadline_reached = False
+
+def route_anytime(circuit: Program, coupling_graph: Graph, time_budget: float, seed: int = None, passes: int = 3, max_trials: int = None, sabre: SABRE = None) -> AnytimeResult:
+    """Routes a circuit within a wall clock budget and returns the routed program with the fewest SWAPs found.
+        The first trial starts from the interaction graph placement, so a valid result is available after a
+        single forward pass; circuits that fit the device are returned unrouted at once. Further trials start
+        from seeded random mappings and run bidirectional passes until the budget is spent. A pass is only
+        started if the slowest pass so far would still finish before the deadline. The placement search takes
+        at most a tenth of the budget, but the first forward pass always runs so that a routed program can be
+        returned, and its duration only depends on the circuit and the device. The budget can therefore be
+        overrun by the first forward pass, by any amount on large circuits; the overrun is reported in the
+        budget_overrun_seconds of the result
+
+    Args:
+        circuit (Program): input pyquil program
+        coupling_graph (Graph): coupling graph representing qubit connections
+        time_budget (float): wall clock budget in seconds
+        seed (int, optional): seed from which the random initial mappings are derived. Random if not given
+        passes (int, optional): maximum number of passes per trial. Must be odd so that the last pass is a forward pass. Defaults to 3
+        max_trials (int, optional): stop after this many trials even if time is left. Unlimited if not given
+        sabre (SABRE, optional): SABRE instance of the device. Created from the coupling graph if not given
+
+    Returns:
+        AnytimeResult: best routed program, its mappings, the number of trials and passes completed and the time
+                        spent beyond the budget
+    """
+    if passes < 1 or passes % 2 == 0:
+        raise ValueError("passes must be a positive odd number so that the last pass is a forward pass, got {}".format(passes))
+    start_time = time.perf_counter()
+    deadline = start_time + time_budget
+    if sabre is None:
+        sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+    circuit_dag = sabre.build_circuit_dag(circuit)
+    placement, is_executable = get_initial_placement(circuit_dag, coupling_graph, sabre.distance_matrix, time_budget / 10)
+    if is_executable:
+        anytime_result = AnytimeResult(circuit.copy(), placement, dict(placement), 0)
+        anytime_result.trials_completed = 1
+        anytime_result.first_result_seconds = anytime_result.elapsed_seconds = time.perf_counter() - start_time
+        anytime_result.budget_overrun_seconds = max(0.0, anytime_result.elapsed_seconds - time_budget)
+        return anytime_result
+
+    best_schedule = best_swaps_inserted = best_pass_layout = best_final_layout = None
+    trials_completed = passes_completed = 0
+    first_result_seconds = None
+    slowest_pass_seconds = 0.0
+    deadline_reached = False
+    trial_seeds = get_circuit_seeds(seed)
+    initial_mapping = placement
+    while not deadline_reached:
+        layout = Layout.from_mapping(initial_mapping, len(sabre.adjacency_bitmap))
+        pass_index = 0
+        while pass_index < passes:
+            if best_schedule is not None and time.perf_counter() + slowest_pass_seconds > deadline:
+                deadline_reached = True
+                break
+            is_forward_pass = pass_index % 2 == 0
+            pass_dag = circuit_dag if is_forward_pass else circuit_dag.reverse()
+            pass_layout = layout.copy()
+            pass_start_time = time.perf_counter()
+            routed_schedule = sabre.route_circuit_dag(pass_dag.front_layer(), layout, pass_dag)
+            slowest_pass_seconds = max(slowest_pass_seconds, time.perf_counter() - pass_start_time)
+            passes_completed += 1
+            layout_unchanged = np.array_equal(layout.logical_to_physical, pass_layout.logical_to_physical)
+            if is_forward_pass:
+                swaps_inserted = sum(1 for operation in routed_schedule if isinstance(operation, tuple))
+                if best_schedule is None or swaps_inserted < best_swaps_inserted:
+                    best_schedule, best_swaps_inserted = routed_schedule, swaps_inserted
+                    best_pass_layout, best_final_layout = pass_layout, layout.copy()
+                if first_result_seconds is None:
+                    first_result_seconds = time.perf_counter() - start_time
+                if layout_unchanged:
+                    break
+            pass_index = passes - 1 if layout_unchanged else pass_index + 1
+        if not deadline_reached:
+            trials_completed += 1
+        if trials_completed == max_trials:
+            break
+        initial_mapping = get_initial_mapping(circuit, coupling_graph, seed=next(trial_seeds))
+
+    anytime_result = AnytimeResult(sabre.emit_program(best_schedule, circuit_dag), best_pass_layout.to_mapping(), best_final_layout.to_mapping(), best_swaps_inserted)
+    anytime_result.trials_completed = trials_completed
+    anytime_result.passes_completed = passes_completed
+    anytime_result.first_result_seconds = first_result_seconds
+    anytime_result.elapsed_seconds = time.perf_counter() - start_time
+    anytime_result.budget_overrun_seconds = max(0.0, anytime_result.elapsed_seconds - time_budget)
+    anytime_result.deadline_reached = deadline_reached
+    return anytime_result
@@ -0,0 +1,201 @@
+from sabre_tools.circuit_dag import CircuitDAG, NO_QUBIT, build_circuit_dag
+from sabre_tools.layout import Layout, pad_mapping
+from typing import TYPE_CHECKING, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pyquil import Program
+    from sabre_tools.sabre import SABRE
+
+class RoutingCheckpoint():
+    def __init__(self, schedule_length: int, max_executed_gate_id: int, pending_gates: np.ndarray, layout: Layout) -> None:
+        """Initialize a snapshot of the routing state. Checkpoints are taken directly after a batch of gates was
+            executed, where the decay parameters and the count of SWAPs without progress have just been reset, so
+            the routing can be resumed from the executed gates, the layout and the position in the routed schedule
+
+        Args:
+            schedule_length (int): number of operations of the routed schedule emitted before the checkpoint
+            max_executed_gate_id (int): largest id of an executed gate, -1 if no gate was executed
+            pending_gates (np.ndarray): sorted ids of the gates below max_executed_gate_id that were not executed.
+                                        Together with max_executed_gate_id they form the executed gate frontier
+            layout (Layout): logical to physical qubit layout at the checkpoint
+        """
+        self.schedule_length = schedule_length
+        self.max_executed_gate_id = max_executed_gate_id
+        self.pending_gates = pending_gates
+        self.layout = layout
+
+    def map_to_circuit(self, gate_ids: np.ndarray, schedule_offset: int, min_executed_gate_id: int) -> 'RoutingCheckpoint':
+        """Translates a checkpoint taken while routing the remaining gates of a circuit to the ids of the whole circuit
+
+        Args:
+            gate_ids (np.ndarray): id in the whole circuit of every remaining gate, in increasing order
+            schedule_offset (int): number of operations routed before the remaining gates
+            min_executed_gate_id (int): largest id of a gate executed before the remaining gates were routed
+
+        Returns:
+            RoutingCheckpoint: the same checkpoint in terms of the whole circuit
+        """
+        if self.max_executed_gate_id < 0:
+            max_executed_gate_id = min_executed_gate_id
+        else:
+            max_executed_gate_id = max(min_executed_gate_id, int(gate_ids[self.max_executed_gate_id]))
+        unexecuted_end = int(np.searchsorted(gate_ids, max_executed_gate_id, side='right'))
+        pending_gates = np.concatenate((gate_ids[self.pending_gates], gate_ids[self.max_executed_gate_id + 1:unexecuted_end]))
+        return RoutingCheckpoint(self.schedule_length + schedule_offset, max_executed_gate_id, pending_gates, self.layout)
+
+class CheckpointedRouting():
+    def __init__(self, gate_qubits: np.ndarray, routed_schedule: list, checkpoints: list, final_layout: Layout) -> None:
+        """Initialize a routed circuit together with the checkpoints taken while routing it
+
+        Args:
+            gate_qubits (np.ndarray): logical qubits of every gate of the routed circuit, padded with NO_QUBIT
+            routed_schedule (list): routed schedule where gates are their int ids and SWAPs are tuples of logical qubits
+            checkpoints (list): RoutingCheckpoint objects in schedule order. The first one is the initial state
+            final_layout (Layout): logical to physical qubit layout after the routed schedule
+        """
+        self.gate_qubits = gate_qubits
+        self.routed_schedule = routed_schedule
+        self.checkpoints = checkpoints
+        self.final_layout = final_layout
+
+    @property
+    def initial_mapping(self) -> dict:
+        """Logical to physical qubit mapping the routed schedule starts from
+
+        Returns:
+            dict: a dictionary containing logical to physical qubit mapping
+        """
+        return self.checkpoints[0].layout.to_mapping()
+
+    @property
+    def final_mapping(self) -> dict:
+        """Logical to physical qubit mapping after the routed schedule
+
+        Returns:
+            dict: a dictionary containing logical to physical qubit mapping
+        """
+        return self.final_layout.to_mapping()
+
+    def find_checkpoint(self, first_changed_gate: int) -> RoutingCheckpoint:
+        """Finds the latest checkpoint at which no gate from first_changed_gate onwards had been executed
+
+        Args:
+            first_changed_gate (int): id of the first gate that differs in the edited circuit
+
+        Returns:
+            RoutingCheckpoint: latest checkpoint that is still valid for the edited circuit
+        """
+        max_executed_gate_ids = [checkpoint.max_executed_gate_id for checkpoint in self.checkpoints]
+        return self.checkpoints[int(np.searchsorted(max_executed_gate_ids, first_changed_gate, side='left')) - 1]
+
+def route_with_checkpoints(sabre: 'SABRE', circuit_dag: CircuitDAG, layout: Layout, checkpoint_interval: int = 1000) -> CheckpointedRouting:
+    """Routes a circuit in a single forward pass and takes a checkpoint every checkpoint_interval executed gates
+
+    Args:
+        sabre (SABRE): SABRE instance of the device
+        circuit_dag (CircuitDAG): compact DAG of the circuit
+        layout (Layout): logical to physical qubit layout the routing starts from. Holds the final layout afterwards
+        checkpoint_interval (int, optional): number of executed gates between checkpoints. Defaults to 1000
+
+    Returns:
+        CheckpointedRouting: routed schedule and checkpoints of the circuit
+    """
+    checkpoints = [RoutingCheckpoint(0, -1, np.empty(0, dtype=np.int64), layout.copy())]
+    routed_schedule = sabre.route_circuit_dag(circuit_dag.front_layer(), layout, circuit_dag, checkpoints, checkpoint_interval)
+    return CheckpointedRouting(circuit_dag.gate_qubits, routed_schedule, checkpoints, layout)
+
+def get_first_changed_gate(gate_qubits: np.ndarray, edited_gate_qubits: np.ndarray) -> int:
+    """Finds the first gate whose qubits differ between two versions of a circuit. Gate names and parameters do not
+        change the routing, so only the qubits are compared
+
+    Args:
+        gate_qubits (np.ndarray): logical qubits of every gate of the routed circuit, padded with NO_QUBIT
+        edited_gate_qubits (np.ndarray): logical qubits of every gate of the edited circuit, padded with NO_QUBIT
+
+    Returns:
+        int: id of the first changed gate, or the length of the shorter circuit if one is a prefix of the other
+    """
+    common_length = min(len(gate_qubits), len(edited_gate_qubits))
+    changed_gates = np.flatnonzero((gate_qubits[:common_length] != edited_gate_qubits[:common_length]).any(axis=1))
+    return int(changed_gates[0]) if len(changed_gates) else common_length
+
+def resume_routing(sabre: 'SABRE', checkpointed_routing: CheckpointedRouting, edited_gate_qubits: np.ndarray, checkpoint_interval: int = 1000) -> CheckpointedRouting:
+    """Re-routes an edited circuit from the latest checkpoint taken before its first changed gate. Only the gates
+        not executed at the checkpoint are built into a DAG and routed, so the cost depends on the edited suffix and
+        not on the length of the circuit. The routed schedule up to the checkpoint is kept as it is
+
+    Args:
+        sabre (SABRE): SABRE instance of the device
+        checkpointed_routing (CheckpointedRouting): routing of the original circuit
+        edited_gate_qubits (np.ndarray): logical qubits of every gate of the edited circuit, padded with NO_QUBIT
+        checkpoint_interval (int, optional): number of executed gates between new checkpoints. Defaults to 1000
+
+    Returns:
+        CheckpointedRouting: routed schedule and checkpoints of the edited circuit
+    """
+    first_changed_gate = get_first_changed_gate(checkpointed_routing.gate_qubits, edited_gate_qubits)
+    checkpoint = checkpointed_routing.find_checkpoint(first_changed_gate)
+    remaining_gate_ids = np.concatenate((checkpoint.pending_gates, np.arange(checkpoint.max_executed_gate_id + 1, len(edited_gate_qubits), dtype=np.int64)))
+    remaining_gate_qubits = edited_gate_qubits[remaining_gate_ids]
+
+    layout = checkpoint.layout.copy()
+    unmapped_qubits = layout.get_unmapped_qubits(remaining_gate_qubits[remaining_gate_qubits != NO_QUBIT])
+    if len(unmapped_qubits):
+        raise ValueError("the edited circuit uses logical qubits {} which are not mapped".format(unmapped_qubits.tolist()))
+
+    remaining_dag = build_circuit_dag([[qubit for qubit in qubits if qubit != NO_QUBIT] for qubits in remaining_gate_qubits.tolist()])
+    remaining_checkpoints = list()
+    remaining_schedule = sabre.route_circuit_dag(remaining_dag.front_layer(), layout, remaining_dag, remaining_checkpoints, checkpoint_interval)
+
+    checkpoint_index = checkpointed_routing.checkpoints.index(checkpoint)
+    checkpoints = checkpointed_routing.checkpoints[:checkpoint_index + 1]
+    checkpoints.extend(remaining_checkpoint.map_to_circuit(remaining_gate_ids, checkpoint.schedule_length, checkpoint.max_executed_gate_id)
+                       for remaining_checkpoint in remaining_checkpoints)
+    remaining_gate_id_list = remaining_gate_ids.tolist()
+    routed_schedule = checkpointed_routing.routed_schedule[:checkpoint.schedule_length]
+    routed_schedule.extend(operation if isinstance(operation, tuple) else remaining_gate_id_list[operation] for operation in remaining_schedule)
+    return CheckpointedRouting(edited_gate_qubits, routed_schedule, checkpoints, layout)
+
+def route_program_with_checkpoints(sabre: 'SABRE', circuit: 'Program', qubit_mapping: dict, checkpoint_interval: int = 1000) -> Union['Program', CheckpointedRouting]:
+    """Routes a pyquil program in a single forward pass like SABRE.execute_sabre_algorithm and keeps checkpoints,
+        so that edited versions of the program can be re-routed with reroute_edited_program
+
+    Args:
+        sabre (SABRE): SABRE instance of the device
+        circuit (Program): input pyquil program
+        qubit_mapping (dict): a dictionary containing logical to physical qubit mapping. Physical qubits it leaves
+                            free are given logical qubits with pad_mapping, which edited programs can then use
+        checkpoint_interval (int, optional): number of executed gates between checkpoints. Defaults to 1000
+
+    Returns:
+        Union[Program, CheckpointedRouting]: program with SWAPs inserted and the routing with its checkpoints
+    """
+    circuit_dag = sabre.build_circuit_dag(circuit)
+    num_physical_qubits = len(sabre.adjacency_bitmap)
+    layout = Layout.from_mapping(pad_mapping(qubit_mapping, num_physical_qubits), num_physical_qubits)
+    checkpointed_routing = route_with_checkpoints(sabre, circuit_dag, layout, checkpoint_interval)
+    return sabre.emit_program(checkpointed_routing.routed_schedule, circuit_dag), checkpointed_routing
+
+def reroute_edited_program(sabre: 'SABRE', checkpointed_routing: CheckpointedRouting, edited_circuit: 'Program', checkpoint_interval: int = 1000) -> Union['Program', CheckpointedRouting]:
+    """Routes an edited version of a pyquil program by resuming from the checkpoints of the original routing
+
+    Args:
+        sabre (SABRE): SABRE instance of the device
+        checkpointed_routing (CheckpointedRouting): routing of the original program
+        edited_circuit (Program): edited pyquil program
+        checkpoint_interval (int, optional): number of executed gates between new checkpoints. Defaults to 1000
+
+    Returns:
+        Union[Program, CheckpointedRouting]: edited program with SWAPs inserted and its routing with checkpoints
+    """
+    from sabre_tools.circuit_preprocess import get_routed_program
+    from sabre_tools.verification import MULTI_QUBIT_OPERATION, get_instruction_arrays
+    instructions = edited_circuit.instructions
+    edited_gate_qubits, operation_codes = get_instruction_arrays(instructions)
+    multi_qubit_indices = np.flatnonzero(operation_codes == MULTI_QUBIT_OPERATION)
+    if len(multi_qubit_indices):
+        raise ValueError("gates acting on more than 2 qubits are not supported, got {}".format(instructions[multi_qubit_indices[0]]))
+    edited_routing = resume_routing(sabre, checkpointed_routing, edited_gate_qubits, checkpoint_interval)
+    return get_routed_program(edited_routing.routed_schedule, instructions), edited_routing
@@ -0,0 +1,141 @@
+from typing import Union
+
+import numpy as np
+
+NO_QUBIT = -1
+
+class CircuitDAG():
+    def __init__(self, gate_qubits: np.ndarray, successor_offsets: np.ndarray, successor_indices: np.ndarray, instructions: list = None) -> None:
+        """Initialize a compact directed acyclic graph of a circuit. Every gate is identified by an integer id,
+            its logical qubits are stored in an array of shape (num_gates, 2) and its successors are stored in
+            compressed sparse row (CSR) form
+
+        Args:
+            gate_qubits (np.ndarray): logical qubits of every gate. Single qubit gates use NO_QUBIT as second qubit
+            successor_offsets (np.ndarray): successors of gate i are successor_indices[successor_offsets[i]:successor_offsets[i + 1]]
+            successor_indices (np.ndarray): concatenated successor gate ids of all gates
+            instructions (list, optional): instructions the gate ids refer to. Only used when emitting output
+        """
+        self.gate_qubits = gate_qubits
+        self.successor_offsets = successor_offsets
+        self.successor_indices = successor_indices
+        self.instructions = instructions
+        self.in_degree = np.bincount(successor_indices, minlength=len(gate_qubits)).astype(np.int32)
+        self.reversed_dag = None
+
+    @property
+    def num_gates(self) -> int:
+        """Number of gates in the DAG
+
+        Returns:
+            int: number of gates in the DAG
+        """
+        return len(self.gate_qubits)
+
+    def successors(self, gate_id: int) -> np.ndarray:
+        """Returns the ids of the gates that directly depend on the input gate
+
+        Args:
+            gate_id (int): id of a gate in the DAG
+
+        Returns:
+            np.ndarray: ids of the successors of the gate
+        """
+        return self.successor_indices[self.successor_offsets[gate_id]:self.successor_offsets[gate_id + 1]]
+
+    def get_gate_qubits(self, gate_id: int) -> Union[int, int]:
+        """Returns the logical qubits a gate acts on
+
+        Args:
+            gate_id (int): id of a gate in the DAG
+
+        Returns:
+            Union[int, int]: logical qubits of the gate. The second qubit is NO_QUBIT for single qubit gates
+        """
+        qubits = self.gate_qubits[gate_id]
+        return int(qubits[0]), int(qubits[1])
+
+    def get_instruction(self, gate_id: int):
+        """Returns the instruction corresponding to a gate id. This is the only place where gate ids
+            are turned back into instruction objects
+
+        Args:
+            gate_id (int): id of a gate in the DAG
+
+        Returns:
+            instruction the gate id was built from
+        """
+        return self.instructions[gate_id]
+
+    def reverse(self) -> 'CircuitDAG':
+        """Returns the DAG of the reversed circuit, in which the predecessors of every gate become its
+            successors. Gate i of this DAG is gate num_gates - 1 - i of the reversed DAG, so the reversed DAG is
+            the one built from the reversed circuit and backward passes break ties as if it had been rebuilt.
+            Only the CSR arrays are recomputed, the qubit array is shared as a reversed view. The result is
+            cached, and reversing it again returns this DAG
+
+        Returns:
+            CircuitDAG: compact DAG of the reversed circuit
+        """
+        if self.reversed_dag is None:
+            last_gate_id = self.num_gates - 1
+            edge_sources = np.repeat(np.arange(self.num_gates, dtype=np.int32), np.diff(self.successor_offsets))
+            reversed_sources = last_gate_id - self.successor_indices
+            reversed_targets = last_gate_id - edge_sources
+            order = np.lexsort((reversed_targets, reversed_sources))
+            successor_indices = reversed_targets[order].astype(np.int32)
+            successor_offsets = np.zeros(self.num_gates + 1, dtype=np.int64)
+            np.cumsum(np.bincount(reversed_sources, minlength=self.num_gates), out=successor_offsets[1:])
+            instructions = None if self.instructions is None else self.instructions[::-1]
+            self.reversed_dag = CircuitDAG(self.gate_qubits[::-1], successor_offsets, successor_indices, instructions)
+            self.reversed_dag.reversed_dag = self
+        return self.reversed_dag
+
+    def front_layer(self) -> list:
+        """Finds gates that have no predecessors in the DAG
+
+        Returns:
+            list: ids of the gates that have no predecessors in the DAG
+        """
+        return np.flatnonzero(self.in_degree == 0).tolist()
+
+def build_circuit_dag(gate_qubits: list, instructions: list = None) -> CircuitDAG:
+    """Builds a compact DAG in a single pass over the gates, keeping track of the last gate applied
+        on each qubit. Each gate depends on the last earlier gate acting on each of its qubits
+
+    Args:
+        gate_qubits (list): qubits of every gate in program order as tuples of one or two logical qubits
+        instructions (list, optional): instructions the gates were extracted from
+
+    Returns:
+        CircuitDAG: compact DAG representing qubit dependencies between the gates
+    """
+    num_gates = len(gate_qubits)
+    qubit_array = np.full((num_gates, 2), NO_QUBIT, dtype=np.int32)
+    flat_qubits = list()
+    flat_positions = list()
+    edge_sources = list()
+    edge_targets = list()
+    last_gate_on_qubit = dict()
+    for gate_id, qubits in enumerate(gate_qubits):
+        if len(qubits) > 2:
+            raise ValueError("gates acting on more than 2 qubits are not supported, got qubits {}".format(list(qubits)))
+        linked_gate_id = None
+        for position, qubit in enumerate(qubits):
+            flat_positions.append(2 * gate_id + position)
+            flat_qubits.append(qubit)
+            prev_gate_id = last_gate_on_qubit.get(qubit)
+            if prev_gate_id is not None and prev_gate_id != linked_gate_id:
+                edge_sources.append(prev_gate_id)
+                edge_targets.append(gate_id)
+                linked_gate_id = prev_gate_id
+            last_gate_on_qubit[qubit] = gate_id
+
+    qubit_array.reshape(-1)[flat_positions] = flat_qubits
+    edge_sources = np.asarray(edge_sources, dtype=np.int32)
+    edge_targets = np.asarray(edge_targets, dtype=np.int32)
+    order = np.argsort(edge_sources, kind='stable')
+    successor_indices = edge_targets[order]
+    successor_offsets = np.zeros(num_gates + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edge_sources, minlength=num_gates), out=successor_offsets[1:])
+    return CircuitDAG(qubit_array, successor_offsets, successor_indices, instructions)
@@ -1,23 +1,26 @@
 from pyquil import Program
-from networkx import Graph, DiGraph, floyd_warshall_numpy
+from pyquil.gates import SWAP
+from networkx import Graph, DiGraph
+from sabre_tools.circuit_dag import CircuitDAG, build_circuit_dag
+from sabre_tools.distance_matrix import default_distance_matrix_cache
 from typing import Union
 
 import random
 import numpy as np
 
-def preprocess_input_circuit(circuit: Program) -> Union[list, DiGraph]:
-    """Preprocesses input pyquil circuit to return a directed acyclic graph
+def preprocess_input_circuit(circuit: Program) -> Union[list, CircuitDAG]:
+    """Preprocesses input pyquil circuit to return a compact directed acyclic graph
     and a list of gates that have no unexecuted predecessors in the DAG
 
     Args:
         circuit (Program): input pyquil circuit
 
     Returns:
-        Union[list, DiGraph]: list of gates that have no qubit depedency on any other gate
-                                and a directed acyclic graph
+        Union[list, CircuitDAG]: list of ids of gates that have no qubit depedency on any other gate
+                                and a compact directed acyclic graph
     """    
-    circuit_dag = get_circuit_dag(circuit=circuit)
-    front_layer_gates = initialize_front_layer(circuit_dag=circuit_dag)
+    circuit_dag = get_compact_circuit_dag(circuit=circuit)
+    front_layer_gates = circuit_dag.front_layer()
     return front_layer_gates, circuit_dag
 
 def get_circuit_dag(circuit: Program) -> DiGraph:
@@ -37,25 +40,91 @@ def get_circuit_dag(circuit: Program) -> DiGraph:
     circuit_dag = create_dag(circuit_dag_mapping)
     return circuit_dag
 
-def get_distance_matrix(coupling_graph: Graph) -> np.matrix:
-    """Computes the distance matrix from the input qubit coupling graph
+def get_compact_circuit_dag(circuit: Program) -> CircuitDAG:
+    """Scans the input pyquil circuit and returns a compact directed acyclic graph where
+    each gate is an integer id, its qubits are stored in a NumPy array and its successors
+    are stored in CSR form. The pyquil instructions are only kept to emit the output
+
+    Args:
+        circuit (Program): input pyquil program
+
+    Returns:
+        CircuitDAG: a compact directed acyclic graph representing the qubit dependencies
+                    between the gates of the input circuit
+    """    
+    instructions = circuit.instructions
+    gate_qubits = [get_instruction_qubits(instruction) for instruction in instructions]
+    return build_circuit_dag(gate_qubits, instructions)
+
+def get_routed_program(routed_schedule: list, instructions: list) -> Program:
+    """Turns a routed schedule into a pyquil program, inserting a SWAP gate for every SWAP of the schedule
+
+    Args:
+        routed_schedule (list): gate ids and SWAP qubit tuples in execution order
+        instructions (list): pyquil instructions the gate ids refer to
+
+    Returns:
+        Program: program with SWAPs inserted
+    """    
+    final_circuit = Program()
+    for operation in routed_schedule:
+        if isinstance(operation, tuple):
+            final_circuit.inst(SWAP(*operation))
+        else:
+            final_circuit.inst(instructions[operation])
+    return final_circuit
+
+def get_routed_quil(circuit: Program, routed_program: Program) -> str:
+    """Returns the Quil source of a routed program together with the gate definitions of the input program,
+    which are kept in defined_gates and not in the instructions the routed program is emitted from
+
+    Args:
+        circuit (Program): input pyquil program
+        routed_program (Program): program with SWAPs inserted
+
+    Returns:
+        str: Quil source of the routed program
+    """    
+    return ''.join(defined_gate.out() + '\n' for defined_gate in circuit.defined_gates) + routed_program.out()
+
+def get_instruction_qubits(instruction) -> list:
+    """Returns the qubits an instruction acts on. Instructions such as declarations do not
+    act on any qubit. get_qubit_indices is used where available, as the deprecated get_qubits
+    spends most of its time emitting the deprecation warning
+
+    Args:
+        instruction: pyquil instruction
+
+    Returns:
+        list: qubits the instruction acts on
+    """    
+    if hasattr(instruction, 'get_qubit_indices'):
+        return list(instruction.get_qubit_indices() or ())
+    if not hasattr(instruction, 'get_qubits'):
+        return list()
+    return list(instruction.get_qubits())
+
+def get_distance_matrix(coupling_graph: Graph) -> np.ndarray:
+    """Computes the distance matrix from the input qubit coupling graph. Distance matrices are cached
+    by coupling graph fingerprint, in memory and in the directory named by the QUBIT_MAPPING_CACHE_DIR
+    environment variable if it is set
 
     Args:
         coupling_graph (Graph): input graph representing qubit connections
 
     Returns:
-        np.matrix: distance matrix computed from coupling graph using Floyd Warshall Algorithm
+        np.ndarray: read-only integer distance matrix computed from coupling graph using breadth first search
     """    
-    distance_matrix = floyd_warshall_numpy(coupling_graph)
-    return distance_matrix
+    return default_distance_matrix_cache.get_distance_matrix(coupling_graph)
 
-def get_initial_mapping(circuit: Program, coupling_graph: Graph) -> dict:
+def get_initial_mapping(circuit: Program, coupling_graph: Graph, seed: int = None) -> dict:
     """Computes a random logical to physical qubit mapping using qubits
     in the input pyquil program and coupling graph
 
     Args:
         circuit (Program): input pyquil program
         coupling_graph (Graph): coupling graph representing qubit connections
+        seed (int, optional): seed of the random shuffle. The global random state is used if not given
 
     Returns:
         dict: a dictionary containing a random logical to physical qubit mapping
@@ -63,7 +132,10 @@ def get_initial_mapping(circuit: Program, coupling_graph: Graph) -> dict:
     initial_mapping = dict()
     physical_qubits = list(coupling_graph.nodes())
     logical_qubits = list(circuit.get_qubits())
-    random.shuffle(physical_qubits)
+    if seed is None:
+        random.shuffle(physical_qubits)
+    else:
+        random.Random(seed).shuffle(physical_qubits)
     for logical_qubit, physical_qubit in zip(logical_qubits, physical_qubits):
         initial_mapping.update({logical_qubit: physical_qubit})
     return initial_mapping
@@ -86,7 +158,9 @@ def initialize_front_layer(circuit_dag: Graph) -> list:
 
 def get_dag_mapping(instructions: list) -> dict:
     """Scans 2 qubit pyquil gate instructions to compute a mapping between two gates representing 
-    qubit dependencies. This mapping is used to construct a directed acyclic graph
+    qubit dependencies. This mapping is used to construct a directed acyclic graph.
+    The instructions are scanned in a single pass while keeping track of the last gate applied
+    on each qubit, so the mapping is computed in time linear in the number of instructions
 
     Args:
         instructions (list): pyquil gate instructions
@@ -95,16 +169,16 @@ def get_dag_mapping(instructions: list) -> dict:
         dict: mapping representing qubit dependencies between two qubit gates
     """    
     circuit_dag_mapping = dict()
-    circuit_instructions = enumerate(instructions)
-    for curr_gate_index, curr_gate in circuit_instructions:
+    last_gate_on_qubit = dict()
+    for curr_gate_index, curr_gate in enumerate(instructions):
         curr_gate_qubits = list(curr_gate.get_qubits())
         if len(curr_gate_qubits) == 2:
             for curr_gate_qubit in curr_gate_qubits:
-                current_instructions = enumerate(instructions[:curr_gate_index])
-                for prev_gate_index, prev_gate in current_instructions:
-                    prev_gate_qubits = prev_gate.get_qubits()
-                    if curr_gate_qubit in prev_gate_qubits:
-                        circuit_dag_mapping.update({(curr_gate_qubit, curr_gate_index, curr_gate): (prev_gate_index, prev_gate)})
+                prev_gate_details = last_gate_on_qubit.get(curr_gate_qubit)
+                if prev_gate_details is not None:
+                    circuit_dag_mapping.update({(curr_gate_qubit, curr_gate_index, curr_gate): prev_gate_details})
+        for curr_gate_qubit in curr_gate_qubits:
+            last_gate_on_qubit[curr_gate_qubit] = (curr_gate_index, curr_gate)
 
     return circuit_dag_mapping
 
@@ -0,0 +1,191 @@
+from concurrent.futures import ProcessPoolExecutor
+from pyquil import Program
+from sabre_tools.circuit_preprocess import get_routed_quil
+from sabre_tools.device_router import DeviceRouter, device_router_worker_state, get_circuit_seeds, initialize_device_router_worker
+from sabre_tools.routing_strategy import get_routing_strategy
+from sabre_tools.topologies import get_topology, read_edge_list
+from sabre_tools.verification import SWAP_OPERATION, get_cnot_count, get_operation_codes
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import numpy as np
+
+def find_quil_files(inputs: list) -> list:
+    """Collects the Quil files named by the command line inputs. A directory contributes every .quil file below
+        it, any other input is expanded as a glob pattern
+
+    Args:
+        inputs (list): directories, glob patterns or file paths
+
+    Returns:
+        list: sorted paths of the Quil files without duplicates
+    """
+    quil_file_paths = set()
+    for input_path in inputs:
+        if os.path.isdir(input_path):
+            quil_file_paths.update(glob.glob(os.path.join(input_path, '**', '*.quil'), recursive=True))
+        else:
+            quil_file_paths.update(path for path in glob.glob(input_path, recursive=True) if os.path.isfile(path))
+    return sorted(quil_file_paths)
+
+def get_output_paths(quil_file_path: str, input_root: str, output_dir: str) -> dict:
+    """Computes where the routed program and the mappings of a Quil file are written. The directory structure
+        below the common root of all inputs is kept, so files with the same name in different directories do not
+        overwrite each other
+
+    Args:
+        quil_file_path (str): path of the input Quil file
+        input_root (str): common directory of all input files
+        output_dir (str): directory the results are written to
+
+    Returns:
+        dict: paths of the routed Quil file and of the JSON mapping file
+    """
+    relative_path = os.path.splitext(os.path.relpath(quil_file_path, input_root))[0]
+    output_stem = os.path.join(output_dir, relative_path)
+    return {'routed_quil': output_stem + '.routed.quil', 'mapping': output_stem + '.mapping.json'}
+
+def route_quil_file(device_router: DeviceRouter, quil_file_path: str, output_paths: dict, seed: int) -> dict:
+    """Parses a Quil file, routes it and writes the routed program and its mappings. Failures are recorded in
+        the summary instead of raised, so one broken file does not stop a bulk run
+
+    Args:
+        device_router (DeviceRouter): router of the device
+        quil_file_path (str): path of the input Quil file
+        output_paths (dict): paths returned by get_output_paths
+        seed (int): seed of the random initial mapping
+
+    Returns:
+        dict: summary of the file with its timing, cnot_count before and after routing and inserted SWAPs
+    """
+    start_time = time.perf_counter()
+    summary = {'file': quil_file_path, 'routed_quil': output_paths['routed_quil'], 'mapping': output_paths['mapping']}
+    try:
+        with open(quil_file_path) as quil_file:
+            circuit = Program(quil_file.read())
+        parse_time = time.perf_counter()
+        routing_result = device_router.route(circuit, seed=seed)
+        routed_operation_codes = get_operation_codes(routing_result.final_program.instructions)
+
+        os.makedirs(os.path.dirname(output_paths['routed_quil']) or '.', exist_ok=True)
+        with open(output_paths['routed_quil'], 'w') as routed_quil_file:
+            routed_quil_file.write(get_routed_quil(circuit, routing_result.final_program))
+        with open(output_paths['mapping'], 'w') as mapping_file:
+            json.dump({'initial_mapping': routing_result.initial_mapping, 'final_mapping': routing_result.final_mapping}, mapping_file, indent=2)
+    except Exception as error:
+        summary.update(status='error', error="{}: {}".format(type(error).__name__, error), total_seconds=time.perf_counter() - start_time)
+        return summary
+
+    summary.update(
+        status='ok',
+        num_instructions=len(circuit.instructions),
+        input_cnot_count=get_cnot_count(get_operation_codes(circuit.instructions)),
+        cnot_count=get_cnot_count(routed_operation_codes),
+        swaps_inserted=int(np.count_nonzero(routed_operation_codes == SWAP_OPERATION)),
+        parse_seconds=parse_time - start_time,
+        routing_seconds=routing_result.runtime,
+        total_seconds=time.perf_counter() - start_time,
+    )
+    return summary
+
+def route_quil_file_in_worker(task: tuple) -> dict:
+    """Routes a Quil file in a worker process initialized by initialize_device_router_worker
+
+    Args:
+        task (tuple): path of the Quil file, its output paths and the seed of its random initial mapping
+
+    Returns:
+        dict: summary of the file as returned by route_quil_file
+    """
+    return route_quil_file(device_router_worker_state['device_router'], *task)
+
+def route_quil_files(device_router: DeviceRouter, quil_file_paths: list, output_dir: str, seed: int = None, num_workers: int = None) -> list:
+    """Routes Quil files on a process pool whose workers build the device data once, writing the routed programs
+        and mappings of every file to the output directory
+
+    Args:
+        device_router (DeviceRouter): router of the device
+        quil_file_paths (list): paths of the input Quil files
+        output_dir (str): directory the results are written to
+        seed (int, optional): seed from which the seed of the random initial mapping of every file is derived.
+                            Random if not given
+        num_workers (int, optional): number of worker processes. Files are routed in the calling process if 1,
+                                    the number of CPUs is used if None
+
+    Returns:
+        list: summary of every file in input order
+    """
+    if not quil_file_paths:
+        return list()
+    input_root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in quil_file_paths])
+    tasks = [(quil_file_path, get_output_paths(os.path.abspath(quil_file_path), input_root, output_dir), file_seed)
+             for quil_file_path, file_seed in zip(quil_file_paths, get_circuit_seeds(seed))]
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = min(num_workers, len(tasks))
+
+    if num_workers <= 1:
+        return [route_quil_file(device_router, *task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=initialize_device_router_worker,
+                             initargs=(device_router.coupling_graph, device_router.passes, device_router.extended_set_size,
+                                       device_router.distance_matrix, device_router.placement_time_budget, device_router.routing_strategy)) as executor:
+        return list(executor.map(route_quil_file_in_worker, tasks))
+
+def main(argv: list = None) -> None:
+    """Routes a library of Quil files for a device and writes the routed programs, their mappings and a summary
+        of timing and cnot_count per file. Exits with status 1 if any file could not be routed
+
+    Args:
+        argv (list, optional): command line arguments. Defaults to sys.argv
+    """
+    parser = argparse.ArgumentParser(description="Route Quil files for a device with bidirectional SABRE")
+    parser.add_argument('inputs', nargs='+', help="directories of .quil files, glob patterns or files")
+    coupling_group = parser.add_mutually_exclusive_group(required=True)
+    coupling_group.add_argument('--topology', help="named topology such as line:16, ring:16, grid:4x5 or heavy_hex:2x3")
+    coupling_group.add_argument('--edge-list', help="file with one edge of the coupling graph per line")
+    parser.add_argument('--output-dir', default='routed', help="directory of the routed programs, mappings and summary")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes. Defaults to the number of CPUs")
+    parser.add_argument('--passes', type=int, default=3, help="maximum number of bidirectional passes, must be odd")
+    parser.add_argument('--seed', type=int, default=None, help="seed of the random initial mappings")
+    parser.add_argument('--strategy', default='decay', help="routing strategy such as basic, lookahead, decay or decay:0.3. Defaults to decay")
+    parser.add_argument('--placement-time-budget', type=float, default=None,
+                        help="place qubits with the interaction graph placement using this budget in seconds instead of randomly")
+    args = parser.parse_args(argv)
+
+    try:
+        coupling_graph = get_topology(args.topology) if args.topology else read_edge_list(args.edge_list)
+        device_router = DeviceRouter(coupling_graph, passes=args.passes, placement_time_budget=args.placement_time_budget,
+                                     routing_strategy=get_routing_strategy(args.strategy))
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    quil_file_paths = find_quil_files(args.inputs)
+    if not quil_file_paths:
+        parser.error("no .quil files found in {}".format(args.inputs))
+
+    start_time = time.perf_counter()
+    summaries = route_quil_files(device_router, quil_file_paths, args.output_dir, args.seed, args.workers)
+    for summary in summaries:
+        if summary['status'] == 'ok':
+            print("{file}: {routing_seconds:.3f}s, {swaps_inserted} SWAPs, cnot_count {input_cnot_count} -> {cnot_count}".format(**summary))
+        else:
+            print("{file}: {error}".format(**summary), file=sys.stderr)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    with open(os.path.join(args.output_dir, 'summary.json'), 'w') as summary_file:
+        json.dump({
+            'coupling_graph': args.topology or args.edge_list,
+            'passes': args.passes,
+            'strategy': args.strategy,
+            'seed': args.seed,
+            'wall_seconds': time.perf_counter() - start_time,
+            'files': summaries,
+        }, summary_file, indent=2)
+    if any(summary['status'] != 'ok' for summary in summaries):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
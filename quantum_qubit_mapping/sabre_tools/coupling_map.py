@@ -0,0 +1,83 @@
+import numpy as np
+
+class CouplingMap():
+    def __init__(self, edges: list, num_physical_qubits: int = None) -> None:
+        """Initialize a coupling graph stored as plain integer edges. It provides the nodes, edges and neighbors
+            methods the routing core reads from a coupling graph, so devices can be described without networkx
+
+        Args:
+            edges (list): pairs of connected physical qubits. Physical qubits must be labelled 0 to n - 1.
+                        Self loops and repeated edges are dropped
+            num_physical_qubits (int, optional): number of physical qubits of the device. Defaults to the
+                                                largest physical qubit in the edges + 1
+        """
+        edge_array = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if num_physical_qubits is None:
+            num_physical_qubits = int(edge_array.max(initial=-1)) + 1
+        self.num_physical_qubits = num_physical_qubits
+        self.edge_list = list()
+        self.neighbour_lists = [list() for _ in range(num_physical_qubits)]
+        seen_edges = set()
+        for physical_qubit_1, physical_qubit_2 in edge_array.tolist():
+            edge_key = (min(physical_qubit_1, physical_qubit_2), max(physical_qubit_1, physical_qubit_2))
+            if physical_qubit_1 == physical_qubit_2 or edge_key in seen_edges:
+                continue
+            seen_edges.add(edge_key)
+            self.edge_list.append((physical_qubit_1, physical_qubit_2))
+            self.neighbour_lists[physical_qubit_1].append(physical_qubit_2)
+            self.neighbour_lists[physical_qubit_2].append(physical_qubit_1)
+
+    @classmethod
+    def from_graph(cls, coupling_graph) -> 'CouplingMap':
+        """Creates a coupling map from any graph providing nodes and edges methods, such as a networkx Graph
+
+        Args:
+            coupling_graph: coupling graph representing qubit connections
+
+        Returns:
+            CouplingMap: coupling map with the same physical qubits and connections
+        """
+        return cls(list(coupling_graph.edges()), max(coupling_graph.nodes(), default=-1) + 1)
+
+    def nodes(self) -> range:
+        """Physical qubits of the device
+
+        Returns:
+            range: physical qubits 0 to n - 1
+        """
+        return range(self.num_physical_qubits)
+
+    def edges(self) -> list:
+        """Connections of the device
+
+        Returns:
+            list: pairs of connected physical qubits
+        """
+        return self.edge_list
+
+    def neighbors(self, physical_qubit: int) -> list:
+        """Physical qubits connected to a physical qubit
+
+        Args:
+            physical_qubit (int): physical qubit of the device
+
+        Returns:
+            list: neighbouring physical qubits
+        """
+        return self.neighbour_lists[physical_qubit]
+
+    def number_of_nodes(self) -> int:
+        """Number of physical qubits of the device
+
+        Returns:
+            int: number of physical qubits
+        """
+        return self.num_physical_qubits
+
+    def number_of_edges(self) -> int:
+        """Number of connections of the device
+
+        Returns:
+            int: number of edges
+        """
+        return len(self.edge_list)
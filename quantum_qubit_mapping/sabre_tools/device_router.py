@@ -0,0 +1,159 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from networkx import Graph
+from pyquil import Program
+from sabre_tools.circuit_preprocess import get_distance_matrix
+from sabre_tools.placement import get_initial_placement
+from sabre_tools.routing import route_bidirectional
+from sabre_tools.routing_strategy import RoutingStrategy
+from sabre_tools.sabre import SABRE
+from typing import Iterable, Iterator
+
+import os
+import time
+import numpy as np
+
+device_router_worker_state = dict()
+
+class RoutingResult():
+    def __init__(self, final_program: Program, initial_mapping: dict, final_mapping: dict, runtime: float) -> None:
+        """Initialize the result of routing a single circuit
+
+        Args:
+            final_program (Program): program with SWAPs inserted by the last forward pass
+            initial_mapping (dict): logical to physical qubit mapping the routed program starts from
+            final_mapping (dict): logical to physical qubit mapping after the routed program
+            runtime (float): wall clock time spent routing the circuit in seconds
+        """
+        self.final_program = final_program
+        self.initial_mapping = initial_mapping
+        self.final_mapping = final_mapping
+        self.runtime = runtime
+
+class DeviceRouter():
+    def __init__(self, coupling_graph: Graph, passes: int = 3, extended_set_size: int = 20, distance_matrix: np.ndarray = None, placement_time_budget: float = None, routing_strategy: RoutingStrategy = None) -> None:
+        """Initialize a router for a single device. The distance matrix, neighbour table and adjacency bitmap
+            are computed once and shared by every circuit routed afterwards
+
+        Args:
+            coupling_graph (Graph): represents qubit connections based on the underlying chip architecture
+            passes (int, optional): maximum number of bidirectional passes per circuit. Must be odd. Defaults to 3
+            extended_set_size (int, optional): maximum number of gates in the lookahead window. Defaults to 20
+            distance_matrix (np.ndarray, optional): distance matrix of the coupling graph. Computed if not given
+            placement_time_budget (float, optional): if given, circuits without an initial mapping are placed with
+                                                    get_initial_placement using this time budget in seconds instead of
+                                                    a random mapping, and circuits that fit the device are not routed
+            routing_strategy (RoutingStrategy, optional): generates and scores the candidate SWAPs. Defaults to the
+                                                        lookahead and decay heuristic of the SABRE paper
+        """
+        if passes < 1 or passes % 2 == 0:
+            raise ValueError("passes must be a positive odd number so that the last pass is a forward pass, got {}".format(passes))
+        self.coupling_graph = coupling_graph
+        self.passes = passes
+        self.extended_set_size = extended_set_size
+        if distance_matrix is None:
+            distance_matrix = get_distance_matrix(coupling_graph)
+        self.distance_matrix = distance_matrix
+        self.routing_strategy = routing_strategy
+        self.sabre = SABRE(self.distance_matrix, coupling_graph, extended_set_size, routing_strategy=routing_strategy)
+        self.placement_time_budget = placement_time_budget
+
+    def route(self, circuit: Program, initial_mapping: dict = None, seed: int = None) -> RoutingResult:
+        """Routes a single circuit with bidirectional SABRE passes
+
+        Args:
+            circuit (Program): input pyquil program
+            initial_mapping (dict, optional): logical to physical qubit mapping of the first pass. Placed, or random
+                                            as in route_bidirectional, if not given. Physical qubits it leaves free are
+                                            given ancilla logical qubits
+            seed (int, optional): seed of the random initial mapping
+
+        Returns:
+            RoutingResult: routed program and its mappings
+        """
+        start_time = time.perf_counter()
+        circuit_dag = self.sabre.build_circuit_dag(circuit)
+        if initial_mapping is None and self.placement_time_budget is not None:
+            initial_mapping, is_executable = get_initial_placement(circuit_dag, self.coupling_graph, self.distance_matrix, self.placement_time_budget)
+            if is_executable:
+                return RoutingResult(circuit.copy(), initial_mapping, dict(initial_mapping), time.perf_counter() - start_time)
+        final_program, last_pass_mapping, final_mapping = route_bidirectional(circuit, self.coupling_graph, self.passes, initial_mapping, seed,
+                                                                              sabre=self.sabre, circuit_dag=circuit_dag)
+        return RoutingResult(final_program, last_pass_mapping, final_mapping, time.perf_counter() - start_time)
+
+    def route_circuits(self, circuits: Iterable, seed: int = None, num_workers: int = 1, chunk_size: int = 16) -> Iterator[RoutingResult]:
+        """Routes circuits one after another and yields their results in input order. Circuits are read from
+            the iterable lazily, so it can be a generator over more circuits than fit in memory. With several
+            workers, chunks of circuits are routed on a process pool whose workers build the device data once,
+            and at most two chunks per worker are in flight at any time
+
+        Args:
+            circuits (Iterable): pyquil programs to route
+            seed (int, optional): seed from which the seed of the random initial mapping of every circuit is derived.
+                                Random if not given
+            num_workers (int, optional): number of worker processes. Circuits are routed in the calling process if 1,
+                                        the number of CPUs is used if None. Defaults to 1
+            chunk_size (int, optional): number of circuits sent to a worker at once. Defaults to 16
+
+        Yields:
+            Iterator[RoutingResult]: routed program and mappings of every circuit
+        """
+        seeded_circuits = zip(circuits, get_circuit_seeds(seed))
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+
+        if num_workers <= 1:
+            for circuit, circuit_seed in seeded_circuits:
+                yield self.route(circuit, seed=circuit_seed)
+            return
+
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=initialize_device_router_worker, initargs=(self.coupling_graph, self.passes, self.extended_set_size, self.distance_matrix, self.placement_time_budget, self.routing_strategy)) as executor:
+            pending_chunks = deque()
+            while True:
+                while len(pending_chunks) < 2 * num_workers:
+                    chunk = list(islice(seeded_circuits, chunk_size))
+                    if not chunk:
+                        break
+                    pending_chunks.append(executor.submit(route_chunk_in_worker, chunk))
+                if not pending_chunks:
+                    return
+                yield from pending_chunks.popleft().result()
+
+def get_circuit_seeds(seed: int = None) -> Iterator[int]:
+    """Derives an endless deterministic stream of seeds from a single seed
+
+    Args:
+        seed (int, optional): seed from which the stream is derived. Random if not given
+
+    Yields:
+        Iterator[int]: seed of the random initial mapping of every circuit
+    """
+    seed_sequence = np.random.SeedSequence(seed)
+    while True:
+        yield int(seed_sequence.spawn(1)[0].generate_state(1)[0])
+
+def initialize_device_router_worker(coupling_graph: Graph, passes: int, extended_set_size: int, distance_matrix: np.ndarray, placement_time_budget: float, routing_strategy: RoutingStrategy = None) -> None:
+    """Builds the DeviceRouter of a worker process from the data of the parent router
+
+    Args:
+        coupling_graph (Graph): coupling graph representing qubit connections
+        passes (int): maximum number of bidirectional passes per circuit
+        extended_set_size (int): maximum number of gates in the lookahead window
+        distance_matrix (np.ndarray): distance matrix of the coupling graph
+        placement_time_budget (float): time budget of the initial placement, None for random initial mappings
+        routing_strategy (RoutingStrategy, optional): routing strategy of the parent router. Defaults to the SABRE heuristic
+    """
+    device_router_worker_state.update(device_router=DeviceRouter(coupling_graph, passes, extended_set_size, distance_matrix, placement_time_budget, routing_strategy))
+
+def route_chunk_in_worker(chunk: list) -> list:
+    """Routes a chunk of circuits in a worker process initialized by initialize_device_router_worker
+
+    Args:
+        chunk (list): pairs of pyquil program and seed of its random initial mapping
+
+    Returns:
+        list: RoutingResult of every circuit in the chunk
+    """
+    device_router = device_router_worker_state['device_router']
+    return [device_router.route(circuit, seed=circuit_seed) for circuit, circuit_seed in chunk]
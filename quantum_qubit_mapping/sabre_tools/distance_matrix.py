@@ -0,0 +1,231 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import hashlib
+import heapq
+import os
+import numpy as np
+
+if TYPE_CHECKING:
+    from networkx import Graph
+
+class DistanceMatrixCache():
+    def __init__(self, maxsize: int = 8, cache_dir: str = None) -> None:
+        """Initialize a two tier cache of distance matrices keyed by the fingerprint of the coupling graph.
+            Matrices are kept in memory with least recently used eviction and, if a cache directory is
+            given, stored as .npy files that are memory-mapped when loaded again
+
+        Args:
+            maxsize (int, optional): maximum number of distance matrices kept in memory. Defaults to 8
+            cache_dir (str, optional): directory of the on-disk cache. Disabled if not given
+        """
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self.distance_matrices = OrderedDict()
+
+    def get_distance_matrix(self, coupling_graph: 'Graph') -> np.ndarray:
+        """Returns the distance matrix of the coupling graph, computing it only if it is neither
+            in memory nor on disk
+
+        Args:
+            coupling_graph (Graph): input graph representing qubit connections
+
+        Returns:
+            np.ndarray: read-only distance matrix of the coupling graph
+        """
+        fingerprint = get_coupling_graph_fingerprint(coupling_graph)
+        distance_matrix = self.distance_matrices.get(fingerprint)
+        if distance_matrix is not None:
+            self.distance_matrices.move_to_end(fingerprint)
+            return distance_matrix
+
+        distance_matrix = self.load_distance_matrix(fingerprint)
+        if distance_matrix is None:
+            distance_matrix = compute_distance_matrix(coupling_graph)
+            distance_matrix.setflags(write=False)
+            self.save_distance_matrix(fingerprint, distance_matrix)
+
+        self.distance_matrices[fingerprint] = distance_matrix
+        if len(self.distance_matrices) > self.maxsize:
+            self.distance_matrices.popitem(last=False)
+        return distance_matrix
+
+    def get_cache_path(self, fingerprint: str) -> str:
+        """Returns the path of the on-disk cache file of a coupling graph fingerprint
+
+        Args:
+            fingerprint (str): fingerprint of a coupling graph
+
+        Returns:
+            str: path of the .npy file
+        """
+        return os.path.join(self.cache_dir, "distance_matrix_{}.npy".format(fingerprint))
+
+    def load_distance_matrix(self, fingerprint: str) -> np.ndarray:
+        """Memory-maps a distance matrix from the on-disk cache
+
+        Args:
+            fingerprint (str): fingerprint of a coupling graph
+
+        Returns:
+            np.ndarray: memory-mapped distance matrix or None if it is not on disk
+        """
+        if self.cache_dir is None:
+            return None
+        try:
+            return np.load(self.get_cache_path(fingerprint), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+
+    def save_distance_matrix(self, fingerprint: str, distance_matrix: np.ndarray) -> None:
+        """Writes a distance matrix to the on-disk cache. The file is written under a temporary name
+            and renamed so that concurrent readers never see a partial file
+
+        Args:
+            fingerprint (str): fingerprint of a coupling graph
+            distance_matrix (np.ndarray): distance matrix of the coupling graph
+        """
+        if self.cache_dir is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_path = self.get_cache_path(fingerprint)
+        temp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+        with open(temp_path, 'wb') as cache_file:
+            np.save(cache_file, distance_matrix)
+        os.replace(temp_path, cache_path)
+
+    def clear(self) -> None:
+        """Removes all distance matrices from the in-memory cache
+        """
+        self.distance_matrices.clear()
+
+def get_coupling_graph_fingerprint(coupling_graph: 'Graph') -> str:
+    """Computes a canonical hash of the coupling graph which does not depend on the order in which
+        nodes and edges were added
+
+    Args:
+        coupling_graph (Graph): input graph representing qubit connections
+
+    Returns:
+        str: hexadecimal SHA-256 digest of the sorted nodes and undirected edges, and of the edge weights if the
+                graph has any
+    """
+    nodes = sorted(coupling_graph.nodes())
+    edges = sorted((min(u, v), max(u, v)) for u, v in coupling_graph.edges())
+    digest = hashlib.sha256()
+    digest.update(repr(nodes).encode())
+    digest.update(repr(edges).encode())
+    edge_weights = get_edge_weights(coupling_graph)
+    if edge_weights is not None:
+        digest.update(repr(sorted(edge_weights.items())).encode())
+    return digest.hexdigest()
+
+def get_edge_weights(coupling_graph: 'Graph') -> dict:
+    """Reads the weight attribute of the edges of a networkx coupling graph. Edges without a weight count as 1,
+        as in networkx shortest path functions
+
+    Args:
+        coupling_graph (Graph): input graph representing qubit connections
+
+    Returns:
+        dict: weight of every undirected edge as (smaller, larger physical qubit), None if no edge has a weight
+    """
+    try:
+        weighted_edges = list(coupling_graph.edges(data='weight'))
+    except TypeError:
+        return None
+    if all(weight is None for _, _, weight in weighted_edges):
+        return None
+    return {(min(u, v), max(u, v)): 1 if weight is None else weight for u, v, weight in weighted_edges}
+
+def compute_distance_matrix(coupling_graph: 'Graph') -> np.ndarray:
+    """Computes all pairs shortest path lengths of an unweighted coupling graph with a breadth first
+        search from every physical qubit, which takes O(V * (V + E)) time instead of the O(V^3) of
+        Floyd Warshall. Graphs with a weight attribute on their edges are passed to
+        compute_weighted_distance_matrix. Physical qubits must be labelled 0 to n - 1
+
+    Args:
+        coupling_graph (Graph): input graph representing qubit connections
+
+    Returns:
+        np.ndarray: distance matrix in the smallest unsigned integer dtype that fits the largest distance.
+                    Unreachable pairs hold the maximum value of the dtype instead of inf, see get_unreachable_distance.
+                    Weighted graphs give a float matrix
+    """
+    edge_weights = get_edge_weights(coupling_graph)
+    if edge_weights is not None:
+        return compute_weighted_distance_matrix(coupling_graph, edge_weights)
+    num_physical_qubits = max(coupling_graph.nodes(), default=-1) + 1
+    neighbours = [list() for _ in range(num_physical_qubits)]
+    for physical_qubit_1, physical_qubit_2 in coupling_graph.edges():
+        neighbours[physical_qubit_1].append(physical_qubit_2)
+        neighbours[physical_qubit_2].append(physical_qubit_1)
+
+    distance_matrix = np.empty((num_physical_qubits, num_physical_qubits), dtype=np.int64)
+    for source in range(num_physical_qubits):
+        distances = [-1] * num_physical_qubits
+        distances[source] = 0
+        queue = [source]
+        for physical_qubit in queue:
+            next_distance = distances[physical_qubit] + 1
+            for neighbour in neighbours[physical_qubit]:
+                if distances[neighbour] < 0:
+                    distances[neighbour] = next_distance
+                    queue.append(neighbour)
+        distance_matrix[source] = distances
+
+    dtype = np.min_scalar_type(int(distance_matrix.max(initial=0)) + 1)
+    unreachable = distance_matrix < 0
+    distance_matrix = distance_matrix.astype(dtype)
+    distance_matrix[unreachable] = np.iinfo(dtype).max
+    return distance_matrix
+
+def compute_weighted_distance_matrix(coupling_graph: 'Graph', edge_weights: dict) -> np.ndarray:
+    """Computes all pairs shortest path lengths of a coupling graph with weighted edges with Dijkstra's
+        algorithm from every physical qubit. Physical qubits must be labelled 0 to n - 1
+
+    Args:
+        coupling_graph (Graph): input graph representing qubit connections
+        edge_weights (dict): non-negative weight of every undirected edge as returned by get_edge_weights
+
+    Returns:
+        np.ndarray: float distance matrix, unreachable pairs hold inf
+    """
+    num_physical_qubits = max(coupling_graph.nodes(), default=-1) + 1
+    neighbours = [list() for _ in range(num_physical_qubits)]
+    for (physical_qubit_1, physical_qubit_2), weight in edge_weights.items():
+        neighbours[physical_qubit_1].append((physical_qubit_2, weight))
+        neighbours[physical_qubit_2].append((physical_qubit_1, weight))
+
+    distance_matrix = np.full((num_physical_qubits, num_physical_qubits), np.inf)
+    for source in range(num_physical_qubits):
+        distances = distance_matrix[source]
+        queue = [(0.0, source)]
+        while queue:
+            distance, physical_qubit = heapq.heappop(queue)
+            if distance >= distances[physical_qubit]:
+                continue
+            distances[physical_qubit] = distance
+            for neighbour, weight in neighbours[physical_qubit]:
+                if distance + weight < distances[neighbour]:
+                    heapq.heappush(queue, (distance + weight, neighbour))
+    return distance_matrix
+
+def get_unreachable_distance(distance_matrix: np.ndarray) -> float:
+    """Returns the value a distance matrix holds for pairs of physical qubits that no path connects. Integer
+        matrices from compute_distance_matrix hold the maximum value of their dtype, which is larger than every
+        finite distance, so sums and comparisons treat unreachable pairs as the farthest ones. Float matrices hold
+        inf, as do the float matrices of weighted coupling graphs. Compare against this value instead of np.inf
+
+    Args:
+        distance_matrix (np.ndarray): distance matrix of a coupling graph
+
+    Returns:
+        float: distance of unreachable pairs
+    """
+    dtype = np.asarray(distance_matrix).dtype
+    if np.issubdtype(dtype, np.integer):
+        return np.iinfo(dtype).max
+    return np.inf
+
+default_distance_matrix_cache = DistanceMatrixCache(cache_dir=os.environ.get('QUBIT_MAPPING_CACHE_DIR'))
@@ -0,0 +1,54 @@
+from itertools import islice
+from sabre_tools.circuit_dag import CircuitDAG, NO_QUBIT
+
+EXTENDED_SET_SIZE = 20
+
+class ExtendedSet():
+    def __init__(self, circuit_dag: CircuitDAG, size: int = EXTENDED_SET_SIZE) -> None:
+        """Initialize a lookahead window over the 2 qubit successors of the front layer. The window is
+            updated incrementally when gates enter or leave the front layer instead of being rebuilt
+
+        Args:
+            circuit_dag (CircuitDAG): compact DAG the gate ids refer to
+            size (int, optional): maximum number of gates in the extended set. Defaults to 20
+        """
+        self.circuit_dag = circuit_dag
+        self.size = size
+        self.front_predecessor_count = dict()
+
+    def add_front_gate(self, gate_id: int) -> None:
+        """Adds the 2 qubit successors of a gate that entered the front layer to the lookahead window
+
+        Args:
+            gate_id (int): id of the gate that entered the front layer
+        """
+        counts = self.front_predecessor_count
+        gate_qubits = self.circuit_dag.gate_qubits
+        for successor_id in self.circuit_dag.successors(gate_id).tolist():
+            if gate_qubits[successor_id, 1] != NO_QUBIT:
+                counts[successor_id] = counts.get(successor_id, 0) + 1
+
+    def remove_front_gate(self, gate_id: int) -> None:
+        """Removes the successors of a gate that left the front layer from the lookahead window unless
+            they are still successors of another gate in the front layer
+
+        Args:
+            gate_id (int): id of the gate that left the front layer
+        """
+        counts = self.front_predecessor_count
+        for successor_id in self.circuit_dag.successors(gate_id).tolist():
+            count = counts.get(successor_id)
+            if count is None:
+                continue
+            if count > 1:
+                counts[successor_id] = count - 1
+            else:
+                del counts[successor_id]
+
+    def get_gates(self) -> list:
+        """Returns the gates of the extended set, oldest successors first
+
+        Returns:
+            list: ids of at most size gates that directly succeed the front layer
+        """
+        return list(islice(self.front_predecessor_count, self.size))
@@ -1,73 +1,173 @@
-from networkx import DiGraph
-from pyquil.gates import Gate
+from sabre_tools.circuit_dag import CircuitDAG, NO_QUBIT
+from sabre_tools.extended_set import EXTENDED_SET_SIZE
+from sabre_tools.layout import Layout
 import numpy as np
 
-def heuristic_function(F: list, circuit_dag: DiGraph, initial_mapping: dict, distance_matrix: np.matrix, swap_gate: Gate, decay_parameter: list) -> float:
+def heuristic_function(F: list, circuit_dag: CircuitDAG, layout: Layout, distance_matrix: np.matrix, swap_qubits: tuple, decay_parameter: list) -> float:
     """Computes a heuristic cost function that is used to rate a candidate SWAP to determine whether the SWAP gate can be inserted in a program to resolve
         qubit dependencies
 
     Args:
-        F (list): list of gates that have no unexecuted predecessors in the DAG
-        circuit_dag (DiGraph): a directed acyclic graph representing qubit dependencies between
+        F (list): list of ids of gates that have no unexecuted predecessors in the DAG
+        circuit_dag (CircuitDAG): a compact directed acyclic graph representing qubit dependencies between
                                 gates
-        initial_mapping (dict): a dictionary containing logical to physical qubit mapping
+        layout (Layout): logical to physical qubit layout with the candidate SWAP applied
         distance_matrix (np.matrix): represents qubit connections from given coupling graph
-        swap_gate (Gate): candidate SWAP gate
+        swap_qubits (tuple): logical qubits of the candidate SWAP gate
         decay_parameter (list): decay parameters for each logical qubit in the mapping
 
     Returns:
         float: heuristic score for the candidate SWAP gate
     """                  
     E = create_extended_successor_set(F, circuit_dag)
-    min_score_swap_qubits = list(swap_gate.get_qubits())
+    min_score_swap_qubits = swap_qubits
     size_E = len(E)
     size_F = len(F)
     W = 0.5
     max_decay = max(decay_parameter[min_score_swap_qubits[0]], decay_parameter[min_score_swap_qubits[1]])
     f_distance = 0
     e_distance = 0
-    for gate_details in F:
-        f_distance += calculate_distance(gate_details, distance_matrix, initial_mapping)
+    for gate_id in F:
+        f_distance += calculate_distance(circuit_dag.get_gate_qubits(gate_id), distance_matrix, layout)
     
-    for gate_details in E:
-        e_distance += calculate_distance(gate_details, distance_matrix, initial_mapping)
+    for gate_id in E:
+        e_distance += calculate_distance(circuit_dag.get_gate_qubits(gate_id), distance_matrix, layout)
 
     f_distance = f_distance / size_F
-    e_distance = W * (e_distance / size_E)
+    if size_E > 0:
+        e_distance = W * (e_distance / size_E)
     H = max_decay * (f_distance + e_distance)
     return H
 
-def calculate_distance(gate_details: tuple, distance_matrix: np.matrix, initial_mapping: dict) -> float:
+def calculate_distance(gate_qubits: tuple, distance_matrix: np.matrix, layout: Layout) -> float:
     """Obtains the value of the distance matrix for physical qubits corresponding to the logical qubits of the
         given gate
 
     Args:
-        gate_details (tuple): Gate object
+        gate_qubits (tuple): logical qubits of a 2 qubit gate
         distance_matrix (np.matrix): represents qubit connections from given coupling graph
-        initial_mapping (dict): a dictionary containing logical to physical qubit mapping
+        layout (Layout): logical to physical qubit layout
 
     Returns:
         float: value of the distance matrix for physical qubits corresponding to the logical qubits of the
                 given gate
     """    
-    gate = gate_details[0]
-    qubits = list(gate.get_qubits())
-    return distance_matrix[initial_mapping.get(qubits[0]), initial_mapping.get(qubits[1])]
+    logical_to_physical = layout.logical_to_physical
+    return float(distance_matrix[logical_to_physical[gate_qubits[0]], logical_to_physical[gate_qubits[1]]])
 
-def create_extended_successor_set(F: list, circuit_dag: DiGraph) -> list:
-    """Creates an extended set which contains some closet successors of the gates from F in the DAG
+def create_extended_successor_set(F: list, circuit_dag: CircuitDAG) -> list:
+    """Creates an extended set which contains some closet 2 qubit successors of the gates from F in the DAG.
+        It holds at most EXTENDED_SET_SIZE gates, the default size of the ExtendedSet window SABRE maintains
 
     Args:
-        F (list): list of gates that have no unexecuted predecessors in the DAG
-        circuit_dag (DiGraph): a directed acyclic graph representing qubit dependencies between
+        F (list): list of ids of gates that have no unexecuted predecessors in the DAG
+        circuit_dag (CircuitDAG): a compact directed acyclic graph representing qubit dependencies between
                                 gates
 
     Returns:
-        list: an extended set which contains some closet successors of the gates from F in the DAG
+        list: an extended set which contains ids of some closet successors of the gates from F in the DAG
     """    
     E = list()
     for gate in  F:
         for gate_successor in circuit_dag.successors(gate):
-            if len(E) <= 20:
-                E.append(gate_successor)
-    return E
\ No newline at end of file
+            if len(E) < EXTENDED_SET_SIZE and circuit_dag.gate_qubits[gate_successor, 1] != NO_QUBIT:
+                E.append(int(gate_successor))
+    return E
+
+def batch_heuristic_function(F: list, circuit_dag: CircuitDAG, layout: Layout, distance_matrix: np.ndarray, swap_candidates: np.ndarray, decay_parameter: list, E: list = None, extended_set_weight: float = 0.5, use_decay: bool = True) -> np.ndarray:
+    """Computes the heuristic cost function of heuristic_function for a batch of candidate SWAPs at once.
+        The distances of F and E are summed once for the current layout and every candidate only recomputes
+        the terms of the gates acting on one of its two swapped qubits
+
+    Args:
+        F (list): list of ids of gates that have no unexecuted predecessors in the DAG
+        circuit_dag (CircuitDAG): a compact directed acyclic graph representing qubit dependencies between
+                                gates
+        layout (Layout): logical to physical qubit layout without any candidate SWAP applied
+        distance_matrix (np.ndarray): represents qubit connections from given coupling graph
+        swap_candidates (np.ndarray): logical qubits of the candidate SWAP gates, of shape (number of candidates, 2)
+        decay_parameter (list): decay parameters for each logical qubit in the mapping
+        E (list, optional): ids of the gates of an incrementally maintained extended set. Built from F with
+                            create_extended_successor_set if not given
+        extended_set_weight (float, optional): weight W of the extended set term. Defaults to 0.5
+        use_decay (bool, optional): whether scores are multiplied by the decay of the swapped qubits. Defaults to True
+
+    Returns:
+        np.ndarray: heuristic score for every candidate SWAP gate. The front layer term is 0 if F has no 2 qubit gate
+    """
+    distance_matrix = np.asarray(distance_matrix)
+    swap_candidates = np.asarray(swap_candidates, dtype=np.int64).reshape(-1, 2)
+    if E is None:
+        E = create_extended_successor_set(F, circuit_dag)
+    f_gate_qubits = circuit_dag.gate_qubits[F]
+    f_gate_qubits = f_gate_qubits[f_gate_qubits[:, 1] != NO_QUBIT]
+    e_gate_qubits = circuit_dag.gate_qubits[E]
+    size_E = len(E)
+    size_F = len(f_gate_qubits)
+    W = extended_set_weight
+    H = np.zeros(len(swap_candidates))
+    if size_F > 0:
+        f_distance = calculate_swap_distance_sums(f_gate_qubits, layout, distance_matrix, swap_candidates)
+        H = f_distance / size_F
+    if size_E > 0 and W != 0:
+        e_distance = calculate_swap_distance_sums(e_gate_qubits, layout, distance_matrix, swap_candidates)
+        H = H + W * (e_distance / size_E)
+    if use_decay:
+        max_decay = np.asarray(decay_parameter)[swap_candidates].max(axis=1)
+        H = max_decay * H
+    return H
+
+def calculate_swap_distance_sums(gate_qubits: np.ndarray, layout: Layout, distance_matrix: np.ndarray, swap_candidates: np.ndarray) -> np.ndarray:
+    """Sums the distance matrix values of a set of 2 qubit gates for every candidate SWAP applied to the layout.
+        The sum for the current layout is computed once and, for every candidate, only the gates acting on one
+        of the swapped logical qubits are looked up again
+
+    Args:
+        gate_qubits (np.ndarray): logical qubits of the gates, of shape (number of gates, 2)
+        layout (Layout): logical to physical qubit layout without any candidate SWAP applied
+        distance_matrix (np.ndarray): represents qubit connections from given coupling graph
+        swap_candidates (np.ndarray): logical qubits of the candidate SWAP gates, of shape (number of candidates, 2)
+
+    Returns:
+        np.ndarray: sum of the distances of the gates for every candidate SWAP gate
+    """
+    logical_to_physical = layout.logical_to_physical
+    num_candidates = len(swap_candidates)
+    gate_physical_qubits = logical_to_physical[gate_qubits]
+    gate_distances = distance_matrix[gate_physical_qubits[:, 0], gate_physical_qubits[:, 1]].astype(np.float64)
+    if len(gate_qubits) == 0 or num_candidates == 0:
+        return np.full(num_candidates, gate_distances.sum())
+
+    # index the gate endpoints by logical qubit so the gates touching a qubit form a contiguous slice
+    endpoint_qubits = gate_qubits.ravel()
+    endpoint_order = np.argsort(endpoint_qubits, kind='stable')
+    sorted_qubits = endpoint_qubits[endpoint_order]
+    sorted_gates = endpoint_order // 2
+
+    candidate_ids = list()
+    touched_gates = list()
+    for position in (0, 1):
+        swapped_qubits = swap_candidates[:, position]
+        lower = np.searchsorted(sorted_qubits, swapped_qubits, side='left')
+        counts = np.searchsorted(sorted_qubits, swapped_qubits, side='right') - lower
+        candidate_id = np.repeat(np.arange(num_candidates), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        touched_gate = sorted_gates[np.repeat(lower, counts) + offsets]
+        if position == 1:
+            # gates acting on both swapped qubits were already collected through the first qubit
+            first_qubit = swap_candidates[candidate_id, 0]
+            keep = (gate_qubits[touched_gate, 0] != first_qubit) & (gate_qubits[touched_gate, 1] != first_qubit)
+            candidate_id, touched_gate = candidate_id[keep], touched_gate[keep]
+        candidate_ids.append(candidate_id)
+        touched_gates.append(touched_gate)
+    candidate_id = np.concatenate(candidate_ids)
+    touched_gate = np.concatenate(touched_gates)
+
+    swap_physical_qubits = logical_to_physical[swap_candidates]
+    touched_qubits = gate_qubits[touched_gate]
+    touched_physical_qubits = gate_physical_qubits[touched_gate]
+    for qubit_position, other_position in ((0, 1), (1, 0)):
+        is_swapped = touched_qubits == swap_candidates[candidate_id, qubit_position][:, None]
+        touched_physical_qubits = np.where(is_swapped, swap_physical_qubits[candidate_id, other_position][:, None], touched_physical_qubits)
+    distance_deltas = distance_matrix[touched_physical_qubits[:, 0], touched_physical_qubits[:, 1]].astype(np.float64) - gate_distances[touched_gate]
+    return gate_distances.sum() + np.bincount(candidate_id, weights=distance_deltas, minlength=num_candidates)
@@ -0,0 +1,103 @@
+ROUTING_PHASES = ('dag_build', 'front_layer_update', 'candidate_generation', 'heuristic_scoring', 'output_emission')
+
+class RoutingStats():
+    def __init__(self) -> None:
+        """Initialize the timers and counters collected by an instrumented SABRE instance. Phase times are
+            accumulated in seconds over all routing calls until reset
+        """
+        self.phase_seconds = dict.fromkeys(ROUTING_PHASES, 0.0)
+        self.iterations = 0
+        self.gates_executed = 0
+        self.swaps_inserted = 0
+        self.forced_gates = 0
+        self.candidates_scored = 0
+        self.scoring_calls = 0
+        self.max_front_layer_size = 0
+        self.max_extended_set_size = 0
+        self.extended_set_size_sum = 0
+
+    def add_phase_time(self, phase: str, seconds: float) -> None:
+        """Adds the time spent in a routing phase
+
+        Args:
+            phase (str): one of ROUTING_PHASES
+            seconds (float): time spent in the phase
+        """
+        self.phase_seconds[phase] += seconds
+
+    def record_scoring(self, num_candidates: int, front_layer_size: int, extended_set_size: int) -> None:
+        """Records the sizes involved in scoring the candidate SWAPs of a front layer gate
+
+        Args:
+            num_candidates (int): number of candidate SWAPs scored
+            front_layer_size (int): number of gates in the front layer
+            extended_set_size (int): number of gates in the extended set
+        """
+        self.candidates_scored += num_candidates
+        self.scoring_calls += 1
+        self.max_front_layer_size = max(self.max_front_layer_size, front_layer_size)
+        self.max_extended_set_size = max(self.max_extended_set_size, extended_set_size)
+        self.extended_set_size_sum += extended_set_size
+
+    @property
+    def mean_extended_set_size(self) -> float:
+        """Mean number of gates in the extended set over all scoring calls
+
+        Returns:
+            float: mean extended set size, 0 if no SWAP was scored
+        """
+        if self.scoring_calls == 0:
+            return 0.0
+        return self.extended_set_size_sum / self.scoring_calls
+
+    def reset(self) -> None:
+        """Sets all timers and counters back to zero
+        """
+        self.__init__()
+
+    def to_dict(self) -> dict:
+        """Returns the timers and counters as a JSON serializable dictionary
+
+        Returns:
+            dict: phase times in seconds and counters
+        """
+        return {
+            'phase_seconds': dict(self.phase_seconds),
+            'iterations': self.iterations,
+            'gates_executed': self.gates_executed,
+            'swaps_inserted': self.swaps_inserted,
+            'forced_gates': self.forced_gates,
+            'candidates_scored': self.candidates_scored,
+            'scoring_calls': self.scoring_calls,
+            'max_front_layer_size': self.max_front_layer_size,
+            'max_extended_set_size': self.max_extended_set_size,
+            'mean_extended_set_size': self.mean_extended_set_size,
+        }
+
+class RoutingObserver():
+    """Receives callbacks from an instrumented SABRE instance. All callbacks do nothing by default,
+        subclasses override the ones they need
+    """
+
+    def on_gates_executed(self, gate_ids: list) -> None:
+        """Called when gates of the front layer have been executed
+
+        Args:
+            gate_ids (list): ids of the executed gates
+        """
+
+    def on_swap_inserted(self, swap_qubits: tuple, score: float) -> None:
+        """Called when a SWAP gate has been inserted
+
+        Args:
+            swap_qubits (tuple): logical qubits of the SWAP gate
+            score (float): heuristic score of the SWAP gate, None for SWAPs inserted along a shortest path
+                            after routing made no progress
+        """
+
+    def on_routing_finished(self, stats: RoutingStats) -> None:
+        """Called when a routing pass has finished
+
+        Args:
+            stats (RoutingStats): statistics accumulated so far
+        """
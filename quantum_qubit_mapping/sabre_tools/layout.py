@@ -0,0 +1,154 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from networkx import Graph
+
+UNMAPPED = -1
+
+class Layout():
+    def __init__(self, logical_to_physical: np.ndarray, physical_to_logical: np.ndarray) -> None:
+        """Initialize a bidirectional logical to physical qubit layout. Both directions are stored in NumPy
+            arrays so that lookups and SWAPs take constant time. Unused entries hold UNMAPPED
+
+        Args:
+            logical_to_physical (np.ndarray): physical qubit of every logical qubit
+            physical_to_logical (np.ndarray): logical qubit of every physical qubit
+        """
+        self.logical_to_physical = logical_to_physical
+        self.physical_to_logical = physical_to_logical
+
+    @classmethod
+    def from_mapping(cls, qubit_mapping: dict, num_physical_qubits: int = 0) -> 'Layout':
+        """Creates a layout from a dictionary containing logical to physical qubit mapping. Physical qubits the
+            mapping leaves free are given logical qubits with pad_mapping, so every physical qubit can take part
+            in a SWAP
+
+        Args:
+            qubit_mapping (dict): a dictionary containing logical to physical qubit mapping
+            num_physical_qubits (int, optional): number of physical qubits of the device. Defaults to the
+                                                largest mapped physical qubit + 1
+
+        Returns:
+            Layout: layout representing the padded input mapping
+        """
+        num_physical_qubits = max(num_physical_qubits, max(qubit_mapping.values(), default=-1) + 1)
+        qubit_mapping = pad_mapping(qubit_mapping, num_physical_qubits)
+        logical_qubits = np.fromiter(qubit_mapping.keys(), dtype=np.int32, count=len(qubit_mapping))
+        physical_qubits = np.fromiter(qubit_mapping.values(), dtype=np.int32, count=len(qubit_mapping))
+        num_logical_qubits = int(logical_qubits.max()) + 1 if len(logical_qubits) else 0
+        logical_to_physical = np.full(num_logical_qubits, UNMAPPED, dtype=np.int32)
+        physical_to_logical = np.full(num_physical_qubits, UNMAPPED, dtype=np.int32)
+        logical_to_physical[logical_qubits] = physical_qubits
+        physical_to_logical[physical_qubits] = logical_qubits
+        return cls(logical_to_physical, physical_to_logical)
+
+    def to_mapping(self) -> dict:
+        """Returns the layout as a dictionary containing logical to physical qubit mapping
+
+        Returns:
+            dict: a dictionary containing logical to physical qubit mapping
+        """
+        logical_qubits = np.flatnonzero(self.logical_to_physical != UNMAPPED)
+        return dict(zip(logical_qubits.tolist(), self.logical_to_physical[logical_qubits].tolist()))
+
+    def copy(self) -> 'Layout':
+        """Returns an independent copy of the layout
+
+        Returns:
+            Layout: copy of the layout
+        """
+        return Layout(self.logical_to_physical.copy(), self.physical_to_logical.copy())
+
+    @property
+    def num_logical_qubits(self) -> int:
+        """Size of the logical qubit index space
+
+        Returns:
+            int: largest mapped logical qubit + 1
+        """
+        return len(self.logical_to_physical)
+
+    def get_unmapped_qubits(self, logical_qubits: np.ndarray) -> np.ndarray:
+        """Finds the logical qubits that have no physical qubit in the layout
+
+        Args:
+            logical_qubits (np.ndarray): logical qubits to check
+
+        Returns:
+            np.ndarray: sorted unmapped logical qubits without duplicates
+        """
+        logical_qubits = np.asarray(logical_qubits, dtype=np.int64).ravel()
+        is_unmapped = (logical_qubits < 0) | (logical_qubits >= self.num_logical_qubits)
+        is_unmapped[~is_unmapped] = self.logical_to_physical[logical_qubits[~is_unmapped]] == UNMAPPED
+        return np.unique(logical_qubits[is_unmapped])
+
+    def swap_logical_qubits(self, logical_qubit_1: int, logical_qubit_2: int) -> None:
+        """Exchanges the physical qubits of two logical qubits in place, as done by a SWAP gate
+
+        Args:
+            logical_qubit_1 (int): first logical qubit of the SWAP gate
+            logical_qubit_2 (int): second logical qubit of the SWAP gate
+        """
+        l2p = self.logical_to_physical
+        physical_qubit_1, physical_qubit_2 = l2p[logical_qubit_1], l2p[logical_qubit_2]
+        l2p[logical_qubit_1], l2p[logical_qubit_2] = physical_qubit_2, physical_qubit_1
+        self.physical_to_logical[physical_qubit_1] = logical_qubit_2
+        self.physical_to_logical[physical_qubit_2] = logical_qubit_1
+
+def pad_mapping(qubit_mapping: dict, num_physical_qubits: int) -> dict:
+    """Places a logical qubit on every physical qubit the mapping leaves free. Logical qubits missing below the
+        largest mapped logical qubit are placed first, then ancilla logical qubits numbered after it. SWAPs are
+        inserted between logical qubits, so a physical qubit without a logical qubit could never be used to move
+        a logical qubit across the device
+
+    Args:
+        qubit_mapping (dict): a dictionary containing logical to physical qubit mapping
+        num_physical_qubits (int): number of physical qubits of the device
+
+    Returns:
+        dict: mapping with every physical qubit 0 to num_physical_qubits - 1 holding a logical qubit
+    """
+    used_physical_qubits = set(qubit_mapping.values())
+    free_physical_qubits = [physical_qubit for physical_qubit in range(num_physical_qubits) if physical_qubit not in used_physical_qubits]
+    if not free_physical_qubits:
+        return qubit_mapping
+    num_logical_qubits = max(qubit_mapping, default=-1) + 1
+    missing_logical_qubits = [logical_qubit for logical_qubit in range(num_logical_qubits) if logical_qubit not in qubit_mapping]
+    ancilla_qubits = range(num_logical_qubits, num_logical_qubits + max(len(free_physical_qubits) - len(missing_logical_qubits), 0))
+    padded_mapping = dict(qubit_mapping)
+    padded_mapping.update(zip(missing_logical_qubits + list(ancilla_qubits), free_physical_qubits))
+    return padded_mapping
+
+def get_neighbour_table(coupling_graph: 'Graph') -> list:
+    """Precomputes the neighbours of every physical qubit of the coupling graph
+
+    Args:
+        coupling_graph (Graph): coupling graph representing qubit connections
+
+    Returns:
+        list: array of neighbouring physical qubits for every physical qubit
+    """
+    num_physical_qubits = max(coupling_graph.nodes(), default=-1) + 1
+    neighbour_table = [np.empty(0, dtype=np.int32)] * num_physical_qubits
+    for physical_qubit in coupling_graph.nodes():
+        neighbour_table[physical_qubit] = np.fromiter(coupling_graph.neighbors(physical_qubit), dtype=np.int32)
+    return neighbour_table
+
+def get_adjacency_bitmap(coupling_graph: 'Graph') -> np.ndarray:
+    """Precomputes a boolean adjacency matrix of the coupling graph so that checking whether two
+        physical qubits are connected is a single array lookup
+
+    Args:
+        coupling_graph (Graph): coupling graph representing qubit connections
+
+    Returns:
+        np.ndarray: boolean matrix which is True for physical qubits connected by an edge
+    """
+    num_physical_qubits = max(coupling_graph.nodes(), default=-1) + 1
+    adjacency_bitmap = np.zeros((num_physical_qubits, num_physical_qubits), dtype=bool)
+    edges = np.array(list(coupling_graph.edges()), dtype=np.int64).reshape(-1, 2)
+    adjacency_bitmap[edges[:, 0], edges[:, 1]] = True
+    adjacency_bitmap[edges[:, 1], edges[:, 0]] = True
+    return adjacency_bitmap
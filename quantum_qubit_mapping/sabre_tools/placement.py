@@ -0,0 +1,174 @@
+from sabre_tools.circuit_dag import CircuitDAG, NO_QUBIT
+from sabre_tools.layout import get_adjacency_bitmap, get_neighbour_table
+from typing import TYPE_CHECKING, Union
+
+import time
+import numpy as np
+
+if TYPE_CHECKING:
+    from networkx import Graph
+
+def get_interaction_graph(circuit_dag: CircuitDAG) -> 'Graph':
+    """Builds the qubit interaction graph of a circuit, where logical qubits are nodes and two qubits are
+        connected if a 2-qubit gate acts on both. Edge weights count the 2-qubit gates between the qubits
+
+    Args:
+        circuit_dag (CircuitDAG): compact DAG of the circuit
+
+    Returns:
+        Graph: interaction graph containing every logical qubit of the circuit
+    """
+    from networkx import Graph
+    gate_qubits = circuit_dag.gate_qubits
+    interaction_graph = Graph()
+    interaction_graph.add_nodes_from(np.unique(gate_qubits[gate_qubits != NO_QUBIT]).tolist())
+    two_qubit_gates = gate_qubits[gate_qubits[:, 1] != NO_QUBIT]
+    qubit_pairs, gate_counts = np.unique(np.sort(two_qubit_gates, axis=1), axis=0, return_counts=True)
+    for (logical_qubit_1, logical_qubit_2), gate_count in zip(qubit_pairs.tolist(), gate_counts.tolist()):
+        interaction_graph.add_edge(logical_qubit_1, logical_qubit_2, weight=gate_count)
+    return interaction_graph
+
+def find_embedding(interaction_graph: 'Graph', coupling_graph: 'Graph', time_budget: float = 1.0) -> Union[dict, None]:
+    """Searches for a subgraph monomorphism of the interaction graph into the coupling graph, i.e. a mapping under
+        which every 2-qubit gate of the circuit acts on connected physical qubits. Logical qubits are placed in
+        breadth first order so that each one is placed next to an already placed neighbour, and the search
+        backtracks until a mapping is found or the time budget is spent. The deadline is checked before every
+        placement step
+
+    Args:
+        interaction_graph (Graph): interaction graph of the circuit
+        coupling_graph (Graph): coupling graph representing qubit connections
+        time_budget (float, optional): maximum search time in seconds. Defaults to 1.0
+
+    Returns:
+        Union[dict, None]: logical to physical qubit mapping without any non-executable gate, or None if no such
+                            mapping was found within the time budget
+    """
+    if interaction_graph.number_of_nodes() > coupling_graph.number_of_nodes() or interaction_graph.number_of_edges() > coupling_graph.number_of_edges():
+        return None
+    max_physical_degree = max((degree for _, degree in coupling_graph.degree()), default=0)
+    if any(degree > max_physical_degree for _, degree in interaction_graph.degree()):
+        return None
+
+    neighbour_table = get_neighbour_table(coupling_graph)
+    adjacency_bitmap = get_adjacency_bitmap(coupling_graph)
+    physical_degrees = np.array([len(neighbours) for neighbours in neighbour_table])
+    physical_qubits = sorted(coupling_graph.nodes(), key=lambda physical_qubit: -physical_degrees[physical_qubit])
+    placement_order, parents = get_placement_order(interaction_graph)
+    placement_positions = {logical_qubit: position for position, logical_qubit in enumerate(placement_order)}
+    placed_neighbours = [[neighbour for neighbour in interaction_graph.neighbors(logical_qubit) if placement_positions[neighbour] < position]
+                         for position, logical_qubit in enumerate(placement_order)]
+
+    deadline = time.perf_counter() + time_budget
+    mapping = dict()
+    used_physical_qubits = set()
+    candidate_stack = list()
+    position = 0
+    while 0 <= position < len(placement_order):
+        if time.perf_counter() > deadline:
+            return None
+        logical_qubit = placement_order[position]
+        if len(candidate_stack) == position:
+            parent = parents[logical_qubit]
+            candidates = physical_qubits if parent is None else neighbour_table[mapping[parent]].tolist()
+            degree = interaction_graph.degree(logical_qubit)
+            candidate_stack.append(iter([physical_qubit for physical_qubit in candidates
+                                         if physical_degrees[physical_qubit] >= degree and physical_qubit not in used_physical_qubits
+                                         and all(adjacency_bitmap[physical_qubit, mapping[neighbour]] for neighbour in placed_neighbours[position])]))
+        else:
+            used_physical_qubits.discard(mapping.pop(logical_qubit))
+
+        physical_qubit = next(candidate_stack[-1], None)
+        if physical_qubit is None:
+            candidate_stack.pop()
+            position -= 1
+            continue
+        mapping[logical_qubit] = physical_qubit
+        used_physical_qubits.add(physical_qubit)
+        position += 1
+    if position < 0:
+        return None
+    return mapping
+
+def get_placement_order(interaction_graph: 'Graph') -> Union[list, dict]:
+    """Orders the logical qubits breadth first, starting every connected component of the interaction graph
+        from its qubit with the most interaction partners
+
+    Args:
+        interaction_graph (Graph): interaction graph of the circuit
+
+    Returns:
+        Union[list, dict]: logical qubits in placement order and the already placed neighbour each one is placed
+                            next to, None for the first qubit of every component
+    """
+    placement_order = list()
+    parents = dict()
+    for logical_qubit in sorted(interaction_graph.nodes(), key=lambda logical_qubit: -interaction_graph.degree(logical_qubit)):
+        if logical_qubit in parents:
+            continue
+        parents[logical_qubit] = None
+        queue = [logical_qubit]
+        for current_qubit in queue:
+            placement_order.append(current_qubit)
+            neighbours = sorted(interaction_graph.neighbors(current_qubit), key=lambda neighbour: -interaction_graph.degree(neighbour))
+            for neighbour in neighbours:
+                if neighbour not in parents:
+                    parents[neighbour] = current_qubit
+                    queue.append(neighbour)
+    return placement_order, parents
+
+def get_greedy_placement(interaction_graph: 'Graph', coupling_graph: 'Graph', distance_matrix: np.ndarray) -> dict:
+    """Places logical qubits one at a time, the qubit with the most gates to already placed qubits first, on the
+        free physical qubit that minimizes the gate-weighted distance to its placed interaction partners. The
+        first qubit of every connected component goes to the free physical qubit closest to all others
+
+    Args:
+        interaction_graph (Graph): interaction graph of the circuit
+        coupling_graph (Graph): coupling graph representing qubit connections
+        distance_matrix (np.ndarray): distance matrix of the coupling graph
+
+    Returns:
+        dict: logical to physical qubit mapping
+    """
+    distance_matrix = np.asarray(distance_matrix, dtype=np.float64)
+    free_physical_qubits = np.array(sorted(coupling_graph.nodes()), dtype=np.int64)
+    total_distances = distance_matrix[free_physical_qubits][:, free_physical_qubits].sum(axis=1)
+    weight_to_placed = dict.fromkeys(interaction_graph.nodes(), 0)
+    mapping = dict()
+    while weight_to_placed and len(free_physical_qubits):
+        logical_qubit = max(weight_to_placed, key=lambda logical_qubit: (weight_to_placed[logical_qubit], interaction_graph.degree(logical_qubit, weight='weight')))
+        partner_qubits = [mapping[neighbour] for neighbour in interaction_graph.neighbors(logical_qubit) if neighbour in mapping]
+        if partner_qubits:
+            partner_weights = np.array([interaction_graph[logical_qubit][neighbour]['weight'] for neighbour in interaction_graph.neighbors(logical_qubit) if neighbour in mapping], dtype=np.int64)
+            costs = distance_matrix[free_physical_qubits][:, partner_qubits] @ partner_weights
+        else:
+            costs = total_distances
+        best_index = int(np.argmin(costs))
+        mapping[logical_qubit] = int(free_physical_qubits[best_index])
+        free_physical_qubits = np.delete(free_physical_qubits, best_index)
+        total_distances = np.delete(total_distances, best_index)
+        del weight_to_placed[logical_qubit]
+        for neighbour, edge_data in interaction_graph[logical_qubit].items():
+            if neighbour in weight_to_placed:
+                weight_to_placed[neighbour] += edge_data['weight']
+    return mapping
+
+def get_initial_placement(circuit_dag: CircuitDAG, coupling_graph: 'Graph', distance_matrix: np.ndarray, time_budget: float = 1.0) -> Union[dict, bool]:
+    """Places the logical qubits of a circuit on the coupling graph. A mapping under which every gate is
+        already executable is searched first, and the greedy distance driven placement is used if none is
+        found within the time budget
+
+    Args:
+        circuit_dag (CircuitDAG): compact DAG of the circuit
+        coupling_graph (Graph): coupling graph representing qubit connections
+        distance_matrix (np.ndarray): distance matrix of the coupling graph
+        time_budget (float, optional): maximum time in seconds spent searching for an executable mapping. Defaults to 1.0
+
+    Returns:
+        Union[dict, bool]: logical to physical qubit mapping and whether the circuit can run on it without SWAPs
+    """
+    interaction_graph = get_interaction_graph(circuit_dag)
+    embedding = find_embedding(interaction_graph, coupling_graph, time_budget)
+    if embedding is not None:
+        return embedding, True
+    return get_greedy_placement(interaction_graph, coupling_graph, distance_matrix), False
@@ -0,0 +1,248 @@
+from collections import OrderedDict
+from networkx import Graph
+from sabre_tools.circuit_dag import CircuitDAG
+from sabre_tools.distance_matrix import get_coupling_graph_fingerprint
+
+import hashlib
+import os
+import zipfile
+import numpy as np
+
+CACHE_FORMAT_VERSION = 1
+SWAP_OPERATION = -1
+
+class CachedRouting():
+    def __init__(self, schedule_array: np.ndarray, initial_mapping_array: np.ndarray, final_mapping_array: np.ndarray) -> None:
+        """Initialize a cached routing result stored as integer arrays
+
+        Args:
+            schedule_array (np.ndarray): one row per operation of the routed schedule. Gates are stored as
+                                        (gate id, 0, 0) and SWAPs as (SWAP_OPERATION, logical qubit, logical qubit)
+            initial_mapping_array (np.ndarray): (logical qubit, physical qubit) rows of the mapping the schedule starts from
+            final_mapping_array (np.ndarray): (logical qubit, physical qubit) rows of the mapping after the schedule
+        """
+        self.schedule_array = schedule_array
+        self.initial_mapping_array = initial_mapping_array
+        self.final_mapping_array = final_mapping_array
+
+    @classmethod
+    def from_routing(cls, routed_schedule: list, initial_mapping: dict, final_mapping: dict) -> 'CachedRouting':
+        """Creates a cache entry from a routed schedule and its mappings
+
+        Args:
+            routed_schedule (list): routed schedule where gates are their int ids and SWAPs are tuples of logical qubits
+            initial_mapping (dict): logical to physical qubit mapping the schedule starts from
+            final_mapping (dict): logical to physical qubit mapping after the schedule
+
+        Returns:
+            CachedRouting: cache entry holding the schedule and mappings as arrays
+        """
+        schedule_array = np.zeros((len(routed_schedule), 3), dtype=np.int64)
+        for index, operation in enumerate(routed_schedule):
+            if isinstance(operation, tuple):
+                schedule_array[index] = (SWAP_OPERATION, operation[0], operation[1])
+            else:
+                schedule_array[index, 0] = operation
+        initial_mapping_array = np.array(list(initial_mapping.items()), dtype=np.int64).reshape(-1, 2)
+        final_mapping_array = np.array(list(final_mapping.items()), dtype=np.int64).reshape(-1, 2)
+        return cls(schedule_array, initial_mapping_array, final_mapping_array)
+
+    def is_valid_for(self, num_gates: int) -> bool:
+        """Determines if the entry is a routed schedule of a circuit with the given number of gates, i.e. its arrays
+            have the stored shapes, every gate id appears exactly once and SWAPs act on logical qubits of the mapping
+
+        Args:
+            num_gates (int): number of gates of the circuit the schedule is emitted for
+
+        Returns:
+            bool: True if the schedule can be emitted for the circuit
+        """
+        arrays = (self.schedule_array, self.initial_mapping_array, self.final_mapping_array)
+        if any(array.ndim != 2 or not np.issubdtype(array.dtype, np.integer) for array in arrays):
+            return False
+        if self.schedule_array.shape[1] != 3 or self.initial_mapping_array.shape[1] != 2 or self.final_mapping_array.shape[1] != 2:
+            return False
+        is_swap = self.schedule_array[:, 0] == SWAP_OPERATION
+        if not np.array_equal(np.sort(self.schedule_array[~is_swap, 0]), np.arange(num_gates)):
+            return False
+        return bool(np.isin(self.schedule_array[is_swap, 1:], self.initial_mapping_array[:, 0]).all())
+
+    @property
+    def routed_schedule(self) -> list:
+        """Routed schedule in the form returned by SABRE.route_circuit_dag
+
+        Returns:
+            list: gates as their int ids and SWAPs as tuples of logical qubits
+        """
+        return [(logical_qubit_1, logical_qubit_2) if gate_id == SWAP_OPERATION else gate_id
+                for gate_id, logical_qubit_1, logical_qubit_2 in self.schedule_array.tolist()]
+
+    @property
+    def initial_mapping(self) -> dict:
+        """Logical to physical qubit mapping the schedule starts from
+
+        Returns:
+            dict: a dictionary containing logical to physical qubit mapping
+        """
+        return dict(self.initial_mapping_array.tolist())
+
+    @property
+    def final_mapping(self) -> dict:
+        """Logical to physical qubit mapping after the schedule
+
+        Returns:
+            dict: a dictionary containing logical to physical qubit mapping
+        """
+        return dict(self.final_mapping_array.tolist())
+
+class RoutingResultCache():
+    def __init__(self, maxsize: int = 128, cache_dir: str = None) -> None:
+        """Initialize a two tier cache of routed schedules keyed by the gate structure of the circuit, the coupling
+            graph, the initial mapping or seed and the routing settings. Entries are kept in memory with least
+            recently used eviction and, if a cache directory is given, stored as .npz files
+
+        Args:
+            maxsize (int, optional): maximum number of routed schedules kept in memory. Defaults to 128
+            cache_dir (str, optional): directory of the on-disk cache. Disabled if not given
+        """
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self.cached_routings = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cache_key: str, num_gates: int = None) -> CachedRouting:
+        """Looks up a routed schedule in memory and then on disk. Entries that cannot be read or do not fit the
+            circuit are treated as misses, so they are routed again and overwritten
+
+        Args:
+            cache_key (str): key computed by get_routing_cache_key
+            num_gates (int, optional): number of gates of the circuit, checked with CachedRouting.is_valid_for if given
+
+        Returns:
+            CachedRouting: cached routing result or None if it is not cached
+        """
+        cached_routing = self.cached_routings.get(cache_key)
+        if cached_routing is not None and (num_gates is None or cached_routing.is_valid_for(num_gates)):
+            self.cached_routings.move_to_end(cache_key)
+            self.hits += 1
+            return cached_routing
+        self.cached_routings.pop(cache_key, None)
+
+        cached_routing = self.load_cached_routing(cache_key)
+        if cached_routing is None or (num_gates is not None and not cached_routing.is_valid_for(num_gates)):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.store_in_memory(cache_key, cached_routing)
+        return cached_routing
+
+    def put(self, cache_key: str, cached_routing: CachedRouting) -> None:
+        """Stores a routed schedule in memory and on disk
+
+        Args:
+            cache_key (str): key computed by get_routing_cache_key
+            cached_routing (CachedRouting): routing result to cache
+        """
+        self.store_in_memory(cache_key, cached_routing)
+        self.save_cached_routing(cache_key, cached_routing)
+
+    def store_in_memory(self, cache_key: str, cached_routing: CachedRouting) -> None:
+        """Adds a routed schedule to the in-memory tier, evicting the least recently used one if it is full
+
+        Args:
+            cache_key (str): key computed by get_routing_cache_key
+            cached_routing (CachedRouting): routing result to cache
+        """
+        self.cached_routings[cache_key] = cached_routing
+        self.cached_routings.move_to_end(cache_key)
+        if len(self.cached_routings) > self.maxsize:
+            self.cached_routings.popitem(last=False)
+
+    def get_cache_path(self, cache_key: str) -> str:
+        """Returns the path of the on-disk cache file of a cache key
+
+        Args:
+            cache_key (str): key computed by get_routing_cache_key
+
+        Returns:
+            str: path of the .npz file
+        """
+        return os.path.join(self.cache_dir, "routing_{}.npz".format(cache_key))
+
+    def load_cached_routing(self, cache_key: str) -> CachedRouting:
+        """Loads a routed schedule from the on-disk cache
+
+        Args:
+            cache_key (str): key computed by get_routing_cache_key
+
+        Returns:
+            CachedRouting: cached routing result or None if it is not on disk or the file is truncated or corrupt
+        """
+        if self.cache_dir is None:
+            return None
+        try:
+            with np.load(self.get_cache_path(cache_key)) as cache_file:
+                return CachedRouting(cache_file['schedule'], cache_file['initial_mapping'], cache_file['final_mapping'])
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            return None
+
+    def save_cached_routing(self, cache_key: str, cached_routing: CachedRouting) -> None:
+        """Writes a routed schedule to the on-disk cache. The file is written under a temporary name and
+            renamed so that concurrent readers never see a partial file
+
+        Args:
+            cache_key (str): key computed by get_routing_cache_key
+            cached_routing (CachedRouting): routing result to cache
+        """
+        if self.cache_dir is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_path = self.get_cache_path(cache_key)
+        temp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+        with open(temp_path, 'wb') as cache_file:
+            np.savez(cache_file, schedule=cached_routing.schedule_array, initial_mapping=cached_routing.initial_mapping_array,
+                     final_mapping=cached_routing.final_mapping_array)
+        os.replace(temp_path, cache_path)
+
+    def clear(self) -> None:
+        """Removes all routed schedules from the in-memory cache
+        """
+        self.cached_routings.clear()
+
+def get_circuit_structure_hash(circuit_dag: CircuitDAG) -> str:
+    """Computes a canonical hash of the qubits every gate of a circuit acts on. Gate names and parameters are
+        not part of the hash, so circuits that differ only in their gate parameters have the same hash
+
+    Args:
+        circuit_dag (CircuitDAG): compact DAG of the circuit
+
+    Returns:
+        str: hexadecimal SHA-256 digest of the gate qubits in program order
+    """
+    return hashlib.sha256(np.ascontiguousarray(circuit_dag.gate_qubits, dtype=np.int32).tobytes()).hexdigest()
+
+def get_routing_cache_key(circuit_dag: CircuitDAG, coupling_graph: Graph, routing_settings: dict, initial_mapping: dict = None, seed: int = None) -> str:
+    """Computes the cache key of a routing problem
+
+    Args:
+        circuit_dag (CircuitDAG): compact DAG of the circuit
+        coupling_graph (Graph): coupling graph representing qubit connections
+        routing_settings (dict): every setting that changes the routed schedule, such as the number of passes
+                                and the heuristic parameters
+        initial_mapping (dict, optional): logical to physical qubit mapping the routing starts from
+        seed (int, optional): seed of the random initial mapping, used if no initial mapping is given
+
+    Returns:
+        str: hexadecimal SHA-256 digest identifying the routing problem
+    """
+    digest = hashlib.sha256()
+    digest.update(repr(CACHE_FORMAT_VERSION).encode())
+    digest.update(get_circuit_structure_hash(circuit_dag).encode())
+    digest.update(get_coupling_graph_fingerprint(coupling_graph).encode())
+    digest.update(repr(sorted(routing_settings.items())).encode())
+    if initial_mapping is not None:
+        digest.update(repr(sorted(initial_mapping.items())).encode())
+    else:
+        digest.update(repr(('seed', seed)).encode())
+    return digest.hexdigest()
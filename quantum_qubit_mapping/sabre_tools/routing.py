@@ -0,0 +1,106 @@
+from networkx import Graph
+from pyquil import Program
+from sabre_tools.circuit_dag import CircuitDAG
+from sabre_tools.circuit_preprocess import get_distance_matrix, get_initial_mapping
+from sabre_tools.layout import Layout
+from sabre_tools.placement import get_initial_placement
+from sabre_tools.result_cache import CachedRouting, RoutingResultCache, get_routing_cache_key
+from sabre_tools.sabre import SABRE
+from typing import Union
+
+import numpy as np
+
+def route_bidirectional(circuit: Program, coupling_graph: Graph, passes: int = 3, initial_mapping: dict = None, seed: int = None, sabre: SABRE = None, cache: RoutingResultCache = None, circuit_dag: CircuitDAG = None) -> Union[Program, dict, dict]:
+    """Routes a circuit with alternating forward and backward SABRE passes, where the final mapping of each
+        pass is the initial mapping of the next one. The dependency DAG is built once and the backward passes
+        walk it in reverse
+
+    Args:
+        circuit (Program): input pyquil program
+        coupling_graph (Graph): coupling graph representing qubit connections
+        passes (int, optional): maximum number of passes. Must be odd so that the last pass is a forward pass. Defaults to 3
+        initial_mapping (dict, optional): logical to physical qubit mapping of the first pass. Random if not given.
+                                        Physical qubits it leaves free are given ancilla logical qubits
+        seed (int, optional): seed of the random initial mapping
+        sabre (SABRE, optional): SABRE instance of the device. Created from the coupling graph if not given
+        cache (RoutingResultCache, optional): cache of routed schedules. On a hit the cached SWAP schedule is applied to
+                                            the gates of the circuit without routing it. Only used if an initial mapping
+                                            or a seed is given, as the routing is not reproducible otherwise
+        circuit_dag (CircuitDAG, optional): compact DAG of the circuit if the caller has built it already
+
+    Returns:
+        Union[Program, dict, dict]: program with SWAPs inserted by the last forward pass, the mapping that program
+                                    starts from and the mapping it ends with
+    """
+    if sabre is None:
+        sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+    if circuit_dag is None:
+        circuit_dag = sabre.build_circuit_dag(circuit)
+    cache_key = None
+    if cache is not None and (initial_mapping is not None or seed is not None):
+        routing_settings = dict(sabre.get_routing_settings(), passes=passes)
+        cache_key = get_routing_cache_key(circuit_dag, coupling_graph, routing_settings, initial_mapping, seed)
+        cached_routing = cache.get(cache_key, circuit_dag.num_gates)
+        if cached_routing is not None:
+            return sabre.emit_program(cached_routing.routed_schedule, circuit_dag), cached_routing.initial_mapping, cached_routing.final_mapping
+
+    if initial_mapping is None:
+        initial_mapping = get_initial_mapping(circuit, coupling_graph, seed=seed)
+    layout = Layout.from_mapping(initial_mapping, len(sabre.adjacency_bitmap))
+    routed_schedule, pass_layout = route_dag_bidirectional(sabre, circuit_dag, layout, passes)
+    last_pass_mapping, final_mapping = pass_layout.to_mapping(), layout.to_mapping()
+    if cache_key is not None:
+        cache.put(cache_key, CachedRouting.from_routing(routed_schedule, last_pass_mapping, final_mapping))
+    return sabre.emit_program(routed_schedule, circuit_dag), last_pass_mapping, final_mapping
+
+def route_with_placement(circuit: Program, coupling_graph: Graph, passes: int = 3, time_budget: float = 1.0, sabre: SABRE = None) -> Union[Program, dict, dict]:
+    """Places the circuit with get_initial_placement and routes it from that placement. Circuits whose interaction
+        graph embeds into the coupling graph are returned unchanged without running SABRE
+
+    Args:
+        circuit (Program): input pyquil program
+        coupling_graph (Graph): coupling graph representing qubit connections
+        passes (int, optional): maximum number of passes. Must be odd so that the last pass is a forward pass. Defaults to 3
+        time_budget (float, optional): maximum time in seconds spent searching for an executable mapping. Defaults to 1.0
+        sabre (SABRE, optional): SABRE instance of the device. Created from the coupling graph if not given
+
+    Returns:
+        Union[Program, dict, dict]: routed program, the mapping it starts from and the mapping it ends with
+    """
+    if sabre is None:
+        sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+    circuit_dag = sabre.build_circuit_dag(circuit)
+    initial_mapping, is_executable = get_initial_placement(circuit_dag, coupling_graph, sabre.distance_matrix, time_budget)
+    if is_executable:
+        return circuit.copy(), initial_mapping, dict(initial_mapping)
+    layout = Layout.from_mapping(initial_mapping, len(sabre.adjacency_bitmap))
+    routed_schedule, pass_layout = route_dag_bidirectional(sabre, circuit_dag, layout, passes)
+    return sabre.emit_program(routed_schedule, circuit_dag), pass_layout.to_mapping(), layout.to_mapping()
+
+def route_dag_bidirectional(sabre: SABRE, circuit_dag: CircuitDAG, layout: Layout, passes: int = 3) -> Union[list, Layout]:
+    """Runs alternating forward and backward SABRE passes on a compact DAG. Passes stop early when a pass
+        leaves the layout unchanged: after a forward pass its schedule is returned, after a backward pass
+        only the final forward pass is run
+
+    Args:
+        sabre (SABRE): SABRE instance of the device
+        circuit_dag (CircuitDAG): compact DAG of the circuit
+        layout (Layout): layout of the first pass. Holds the final layout of the last pass afterwards
+        passes (int, optional): maximum number of passes. Must be odd so that the last pass is a forward pass. Defaults to 3
+
+    Returns:
+        Union[list, Layout]: routed schedule of the last forward pass and the layout it starts from
+    """
+    if passes < 1 or passes % 2 == 0:
+        raise ValueError("passes must be a positive odd number so that the last pass is a forward pass, got {}".format(passes))
+
+    pass_index = 0
+    while True:
+        is_forward_pass = pass_index % 2 == 0
+        pass_dag = circuit_dag if is_forward_pass else circuit_dag.reverse()
+        pass_layout = layout.copy()
+        routed_schedule = sabre.route_circuit_dag(pass_dag.front_layer(), layout, pass_dag)
+        layout_unchanged = np.array_equal(layout.logical_to_physical, pass_layout.logical_to_physical)
+        if is_forward_pass and (layout_unchanged or pass_index == passes - 1):
+            return routed_schedule, pass_layout
+        pass_index = passes - 1 if layout_unchanged else pass_index + 1
@@ -0,0 +1,107 @@
+from sabre_tools.circuit_dag import CircuitDAG
+from sabre_tools.heuristic_function import batch_heuristic_function
+from sabre_tools.layout import Layout
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from sabre_tools.sabre import SABRE
+
+class RoutingStrategy():
+    def __init__(self, name: str = 'decay', extended_set_weight: float = 0.5, use_decay: bool = True) -> None:
+        """Initialize the strategy SABRE uses to generate and score candidate SWAPs. The default is the heuristic
+            of the SABRE paper with the lookahead over the extended set and the decay of recently swapped qubits.
+            Subclasses can override generate_swap_candidates and score_swap_candidates to change either step
+
+        Args:
+            name (str, optional): name of the strategy. Defaults to 'decay'
+            extended_set_weight (float, optional): weight W of the extended set term. The extended set is not
+                                                    maintained at all if 0. Defaults to 0.5
+            use_decay (bool, optional): whether scores are multiplied by the decay of the swapped qubits. Defaults to True
+        """
+        self.name = name
+        self.extended_set_weight = extended_set_weight
+        self.use_decay = use_decay
+
+    @property
+    def uses_extended_set(self) -> bool:
+        """Whether the scores depend on the extended set, so that SABRE has to maintain it
+
+        Returns:
+            bool: True if the extended set term has a non-zero weight
+        """
+        return self.extended_set_weight != 0
+
+    def generate_swap_candidates(self, sabre: 'SABRE', gate_id: int, layout: Layout, circuit_dag: CircuitDAG) -> list:
+        """Generates the candidate SWAPs for a front layer gate, which swap one of its qubits with a qubit
+            mapped to a neighbouring physical qubit
+
+        Args:
+            sabre (SABRE): SABRE instance of the device
+            gate_id (int): id of the front layer gate
+            layout (Layout): logical to physical qubit layout
+            circuit_dag (CircuitDAG): compact DAG the gate ids refer to
+
+        Returns:
+            list: logical qubits of the candidate SWAP gates
+        """
+        control_logical_qubit, target_logical_qubit = circuit_dag.get_gate_qubits(gate_id)
+        control_logical_qubit_neighbours, target_logical_qubit_neighbours = sabre.get_qubit_neighbours(control_logical_qubit, target_logical_qubit, layout)
+        swap_candidate_list = [(control_logical_qubit, neighbour) for neighbour in control_logical_qubit_neighbours]
+        swap_candidate_list.extend((target_logical_qubit, neighbour) for neighbour in target_logical_qubit_neighbours)
+        return swap_candidate_list
+
+    def score_swap_candidates(self, front_layer_gates: list, circuit_dag: CircuitDAG, layout: Layout, distance_matrix: np.ndarray, swap_candidates: list, decay_parameter: list, extended_set_gates: list) -> np.ndarray:
+        """Scores candidate SWAPs, the candidate with the lowest score is inserted
+
+        Args:
+            front_layer_gates (list): list of ids of gates that have no unexecuted predecessors in the DAG
+            circuit_dag (CircuitDAG): compact DAG the gate ids refer to
+            layout (Layout): logical to physical qubit layout without any candidate SWAP applied
+            distance_matrix (np.ndarray): represents qubit connections from given coupling graph
+            swap_candidates (list): logical qubits of the candidate SWAP gates
+            decay_parameter (list): decay parameters for each logical qubit in the mapping
+            extended_set_gates (list): ids of the gates of the extended set, empty if uses_extended_set is False
+
+        Returns:
+            np.ndarray: heuristic score for every candidate SWAP gate
+        """
+        return batch_heuristic_function(front_layer_gates, circuit_dag, layout, distance_matrix, swap_candidates, decay_parameter, extended_set_gates,
+                                        extended_set_weight=self.extended_set_weight, use_decay=self.use_decay)
+
+    def get_settings(self) -> dict:
+        """Returns the settings of the strategy that change the routed schedule
+
+        Returns:
+            dict: name, extended set weight and whether decay is used
+        """
+        return {'name': self.name, 'extended_set_weight': self.extended_set_weight, 'use_decay': self.use_decay}
+
+ROUTING_STRATEGIES = {
+    'basic': lambda: RoutingStrategy('basic', 0.0, use_decay=False),
+    'lookahead': lambda extended_set_weight=0.5: RoutingStrategy('lookahead', extended_set_weight, use_decay=False),
+    'decay': lambda extended_set_weight=0.5: RoutingStrategy('decay', extended_set_weight, use_decay=True),
+}
+
+def get_routing_strategy(strategy_spec: str) -> RoutingStrategy:
+    """Creates a named routing strategy from a specification such as "basic", "lookahead" or "decay:0.3".
+        "basic" scores candidates by the front layer alone, "lookahead" adds the extended set and "decay"
+        additionally penalizes recently swapped qubits
+
+    Args:
+        strategy_spec (str): strategy name, optionally followed by a colon and the weight of the extended set.
+                            "basic" takes no weight
+
+    Returns:
+        RoutingStrategy: routing strategy
+    """
+    name, _, extended_set_weight = strategy_spec.partition(':')
+    if name not in ROUTING_STRATEGIES:
+        raise ValueError("unknown routing strategy {!r}, expected one of {}".format(name, sorted(ROUTING_STRATEGIES)))
+    if not extended_set_weight:
+        return ROUTING_STRATEGIES[name]()
+    try:
+        return ROUTING_STRATEGIES[name](float(extended_set_weight))
+    except (TypeError, ValueError):
+        raise ValueError("invalid extended set weight in routing strategy {!r}".format(strategy_spec))
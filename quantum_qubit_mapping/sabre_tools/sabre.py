@@ -1,92 +1,366 @@
-from networkx import Graph, DiGraph
-from pyquil import Program
-from pyquil.gates import Gate, SWAP
-from sabre_tools.heuristic_function import heuristic_function
-from typing import Union
-
+from sabre_tools.checkpoint import RoutingCheckpoint
+from sabre_tools.circuit_dag import CircuitDAG, NO_QUBIT, build_circuit_dag
+from sabre_tools.distance_matrix import get_unreachable_distance
+from sabre_tools.extended_set import EXTENDED_SET_SIZE, ExtendedSet
+from sabre_tools.instrumentation import RoutingObserver, RoutingStats
+from sabre_tools.layout import Layout, UNMAPPED, get_adjacency_bitmap, get_neighbour_table, pad_mapping
+from sabre_tools.routing_strategy import RoutingStrategy
+from sabre_tools.verification import find_forbidden_gates, get_cnot_count, get_operation_codes
+from typing import TYPE_CHECKING, Union
+
+import time
 import numpy as np
 
+if TYPE_CHECKING:
+    from networkx import Graph
+    from pyquil import Program
+    from pyquil.gates import Gate
+
 class SABRE():
-    def __init__(self, distance_matrix: np.matrix, coupling_graph: Graph) -> None:
+    def __init__(self, distance_matrix: np.matrix, coupling_graph: 'Graph', extended_set_size: int = EXTENDED_SET_SIZE, collect_stats: bool = False, observer: RoutingObserver = None, max_swaps_without_progress: int = None, routing_strategy: RoutingStrategy = None) -> None:
         """Initialize an instance of SABRE with distance matrix and coupling graph
 
         Args:
             distance_matrix (np.matrix): represents qubit connections from given coupling graph
-            coupling_graph (Graph): represents qubit connections based on the underlying chip architecture
+            coupling_graph (Graph): represents qubit connections based on the underlying chip architecture. A networkx
+                                    Graph or a CouplingMap
+            extended_set_size (int, optional): maximum number of gates in the lookahead window used by the
+                                                heuristic function. Defaults to 20
+            collect_stats (bool, optional): whether to collect phase timers and counters in self.stats. Defaults to False
+            observer (RoutingObserver, optional): receives routing callbacks. Enables collect_stats if given
+            max_swaps_without_progress (int, optional): number of SWAPs inserted without executing a gate after which
+                                                        the closest front layer gate is routed along a shortest path.
+                                                        Defaults to 10 times the number of physical qubits
+            routing_strategy (RoutingStrategy, optional): generates and scores the candidate SWAPs. Defaults to the
+                                                        lookahead and decay heuristic of the SABRE paper
         """             
         self.distance_matrix = distance_matrix
+        self.unreachable_distance = get_unreachable_distance(distance_matrix)
         self.coupling_graph = coupling_graph
-
-    def execute_sabre_algorithm(self, front_layer_gates: list, qubit_mapping: dict, circuit_dag: DiGraph) -> Union[Program, dict]:
+        self.extended_set_size = extended_set_size
+        self.heuristic_evaluations = 0
+        self.observer = observer
+        self.stats = RoutingStats() if collect_stats or observer is not None else None
+        self.neighbour_table = get_neighbour_table(coupling_graph)
+        self.adjacency_bitmap = get_adjacency_bitmap(coupling_graph)
+        if max_swaps_without_progress is None:
+            max_swaps_without_progress = 10 * len(self.adjacency_bitmap)
+        self.max_swaps_without_progress = max_swaps_without_progress
+        if routing_strategy is None:
+            routing_strategy = RoutingStrategy()
+        self.routing_strategy = routing_strategy
+
+    def execute_sabre_algorithm(self, front_layer_gates: list, qubit_mapping: dict, circuit_dag: CircuitDAG) -> Union['Program', dict]:
         """Applies SABRE algorithm proposed in "Tackling the Qubit Mapping Problem for NISQ-Era Quantum Devices"
             by Gushu Li, Yufei Ding, and Yuan Xie (https://arxiv.org/pdf/1809.02573.pdf). This function returns 
             final program with SWAPs inserted and a mapping with qubit dependencies resolved
 
         Args:
-            front_layer_gates (list): list of gates that have no unexecuted predecessors in the DAG
-            qubit_mapping (dict): a dictionary containing logical to physical qubit mapping
-            circuit_dag (DiGraph): a directed acyclic graph where each vertex represents a gate in the 
+            front_layer_gates (list): list of ids of gates that have no unexecuted predecessors in the DAG
+            qubit_mapping (dict): a dictionary containing logical to physical qubit mapping. Physical qubits it
+                                leaves free are given logical qubits with pad_mapping
+            circuit_dag (CircuitDAG): a compact directed acyclic graph where each gate id represents a gate in the 
                                     input circuit and the edges represent the qubit dependencies of a gate on the other
 
         Returns:
             Union[Program, dict]: final program with SWAPs inserted and a mapping with qubit dependencies resolved
         """        
-        decay_parameter = self.initialize_decay_parameter(qubit_mapping)
-        final_circuit = Program()
+        layout = Layout.from_mapping(qubit_mapping, len(self.adjacency_bitmap))
+        routed_schedule = self.route_circuit_dag(front_layer_gates, layout, circuit_dag)
+        final_circuit = self.emit_program(routed_schedule, circuit_dag)
+        return final_circuit, layout.to_mapping()
+
+    def route_gate_qubits(self, gate_qubits: list, qubit_mapping: dict) -> Union[list, dict]:
+        """Routes a circuit given as plain logical qubit pairs. Neither pyquil nor networkx is used, so this is
+            the entry point for callers that keep circuits as integers
+
+        Args:
+            gate_qubits (list): logical qubits of every gate in program order, one or two per gate
+            qubit_mapping (dict): a dictionary containing logical to physical qubit mapping. Physical qubits it
+                                leaves free are given logical qubits with pad_mapping
+
+        Returns:
+            Union[list, dict]: routed schedule where gates are their indices in gate_qubits and SWAPs are tuples
+                                of logical qubits, and the mapping after the routed schedule
+        """
+        circuit_dag = build_circuit_dag(gate_qubits)
+        layout = Layout.from_mapping(qubit_mapping, len(self.adjacency_bitmap))
+        routed_schedule = self.route_circuit_dag(circuit_dag.front_layer(), layout, circuit_dag)
+        return routed_schedule, layout.to_mapping()
+
+    def get_routing_settings(self) -> dict:
+        """Returns the settings of this instance that change the routed schedule
+
+        Returns:
+            dict: extended set size, SWAP limit without progress and routing strategy settings
+        """
+        return {'extended_set_size': self.extended_set_size, 'max_swaps_without_progress': self.max_swaps_without_progress,
+                'routing_strategy': self.routing_strategy.get_settings()}
+
+    def route_circuit_dag(self, front_layer_gates: list, layout: Layout, circuit_dag: CircuitDAG, checkpoints: list = None, checkpoint_interval: int = 1000) -> list:
+        """Runs the SABRE search on a compact DAG and updates the layout in place with every inserted SWAP.
+            No pyquil objects are created, the routed circuit is returned as a schedule of gate ids and SWAPs.
+            If max_swaps_without_progress SWAPs are inserted without executing a gate, the closest front layer
+            gate is routed along a shortest path, which bounds the number of SWAPs inserted per gate. If a
+            checkpoints list is given, a RoutingCheckpoint is appended to it every checkpoint_interval executed gates.
+            Raises a ValueError if a logical qubit of the circuit is not mapped
+
+        Args:
+            front_layer_gates (list): list of ids of gates that have no unexecuted predecessors in the DAG
+            layout (Layout): logical to physical qubit layout the routing starts from. Holds the final layout afterwards
+            circuit_dag (CircuitDAG): a compact directed acyclic graph where each gate id represents a gate in the 
+                                    input circuit and the edges represent the qubit dependencies of a gate on the other
+            checkpoints (list, optional): list the checkpoints of the routing are appended to. No checkpoints are taken if not given
+            checkpoint_interval (int, optional): number of executed gates between checkpoints. Defaults to 1000
 
-        while len(front_layer_gates) > 0:
+        Returns:
+            list: routed schedule in execution order. Gates are their int ids and SWAPs are tuples of logical qubits
+        """        
+        gate_qubits = circuit_dag.gate_qubits
+        unmapped_qubits = layout.get_unmapped_qubits(gate_qubits[gate_qubits != NO_QUBIT])
+        if len(unmapped_qubits):
+            raise ValueError("the circuit uses logical qubits {} which are not mapped to a physical qubit".format(unmapped_qubits.tolist()))
+        stats = self.stats
+        observer = self.observer
+        decay_parameter = self.initialize_decay_parameter(layout)
+        routed_schedule = list()
+        remaining_predecessors = circuit_dag.in_degree.copy()
+        routing_strategy = self.routing_strategy
+        extended_set = ExtendedSet(circuit_dag, self.extended_set_size) if routing_strategy.uses_extended_set else None
+        front_layer = set()
+        front_gate_on_qubit = dict()
+        for gate_id in front_layer_gates:
+            self.add_front_gate(gate_id, front_layer, front_gate_on_qubit, extended_set, circuit_dag)
+        gates_to_check = list(front_layer)
+        swaps_without_progress = 0
+        max_executed_gate_id = -1
+        pending_gates = set()
+        gates_since_checkpoint = 0
+
+        while len(front_layer) > 0:
+            if stats is not None:
+                stats.iterations += 1
+                phase_start = time.perf_counter()
             execute_gate_list = list()
-            for gate_details in front_layer_gates:
-                if self.is_gate_executable(gate_details[0], qubit_mapping):
-                    execute_gate_list.append(gate_details)
-                    decay_parameter = self.initialize_decay_parameter(qubit_mapping)
+            for gate_id in gates_to_check:
+                logical_qubit_1, logical_qubit_2 = circuit_dag.get_gate_qubits(gate_id)
+                if self.are_qubits_connected(logical_qubit_1, logical_qubit_2, layout):
+                    execute_gate_list.append(gate_id)
 
             if len(execute_gate_list) > 0:
-                for gate_details in execute_gate_list:
-                    front_layer_gates.remove(gate_details)
-                    final_circuit.inst(gate_details[0])
-                    for successor_details in circuit_dag.successors(gate_details):
-                        dependency_found = self.is_dependent_on_successors(successor_details, front_layer_gates)
-                        if not dependency_found:
-                            front_layer_gates.append(successor_details)
+                decay_parameter = self.initialize_decay_parameter(layout)
+                swaps_without_progress = 0
+                gates_to_check = list()
+                for gate_id in execute_gate_list:
+                    self.remove_front_gate(gate_id, front_layer, front_gate_on_qubit, extended_set, circuit_dag)
+                    routed_schedule.append(gate_id)
+                    for successor_id in circuit_dag.successors(gate_id).tolist():
+                        remaining_predecessors[successor_id] -= 1
+                        if remaining_predecessors[successor_id] == 0:
+                            self.add_front_gate(successor_id, front_layer, front_gate_on_qubit, extended_set, circuit_dag)
+                            gates_to_check.append(successor_id)
+                if checkpoints is not None:
+                    for gate_id in execute_gate_list:
+                        if gate_id > max_executed_gate_id:
+                            pending_gates.update(range(max_executed_gate_id + 1, gate_id))
+                            max_executed_gate_id = gate_id
+                        else:
+                            pending_gates.discard(gate_id)
+                    gates_since_checkpoint += len(execute_gate_list)
+                    if gates_since_checkpoint >= checkpoint_interval:
+                        checkpoints.append(RoutingCheckpoint(len(routed_schedule), max_executed_gate_id, np.array(sorted(pending_gates), dtype=np.int64), layout.copy()))
+                        gates_since_checkpoint = 0
+                if stats is not None:
+                    stats.add_phase_time('front_layer_update', time.perf_counter() - phase_start)
+                    stats.gates_executed += len(execute_gate_list)
+                    if observer is not None:
+                        observer.on_gates_executed(execute_gate_list)
             else:
-                for gate_details in front_layer_gates:
-                    heuristic_score = dict()
-                    swap_candidate_list = list()
-                    f_gate = gate_details[0]
-                    f_qubits = list(f_gate.get_qubits())
-                    control_logical_qubit, target_logical_qubit = f_qubits[0], f_qubits[1]
-                    control_logical_qubit_neighbours, target_logical_qubit_neighbours = self.get_qubit_neighbours(control_logical_qubit, target_logical_qubit, qubit_mapping)
-                    for control_logical_qubit_neighbour in control_logical_qubit_neighbours:
-                        swap_candidate_list.append(SWAP(control_logical_qubit, control_logical_qubit_neighbour))
-                    for target_logical_qubit_neighbour in target_logical_qubit_neighbours:
-                        swap_candidate_list.append(SWAP(target_logical_qubit, target_logical_qubit_neighbour))
-                    for swap_gate in swap_candidate_list:
-                        temp_mapping = self.update_initial_mapping(swap_gate, qubit_mapping)
-                        swap_gate_score = heuristic_function(front_layer_gates, circuit_dag, temp_mapping, self.distance_matrix, swap_gate, decay_parameter)
-                        heuristic_score.update({swap_gate: swap_gate_score})
-                    min_score_swap_gate = self.find_min_score_swap_gate(heuristic_score, swap_candidate_list)
-                    final_circuit.inst(min_score_swap_gate)
-                    qubit_mapping = self.update_initial_mapping(min_score_swap_gate, qubit_mapping)
-                    decay_parameter = self.update_decay_parameter(min_score_swap_gate, decay_parameter)
-        return final_circuit, qubit_mapping
-                        
-
-    def initialize_decay_parameter(self, qubit_mapping: dict) -> list:
+                if stats is not None:
+                    phase_end = time.perf_counter()
+                    stats.add_phase_time('front_layer_update', phase_end - phase_start)
+                    phase_start = phase_end
+                front_layer_gates = list(front_layer)
+                swapped_qubits = set()
+                for gate_id in front_layer_gates:
+                    swap_candidate_list = routing_strategy.generate_swap_candidates(self, gate_id, layout, circuit_dag)
+                    extended_set_gates = extended_set.get_gates() if extended_set is not None else list()
+                    if stats is not None:
+                        scoring_start = time.perf_counter()
+                        stats.add_phase_time('candidate_generation', scoring_start - phase_start)
+                    self.heuristic_evaluations += len(swap_candidate_list)
+                    swap_gate_scores = routing_strategy.score_swap_candidates(front_layer_gates, circuit_dag, layout, self.distance_matrix, swap_candidate_list, decay_parameter, extended_set_gates)
+                    heuristic_score = dict(zip(swap_candidate_list, swap_gate_scores.tolist()))
+                    min_score_swap_qubits = self.find_min_score_swap_gate(heuristic_score, swap_candidate_list)
+                    routed_schedule.append(min_score_swap_qubits)
+                    layout.swap_logical_qubits(*min_score_swap_qubits)
+                    decay_parameter = self.update_decay_parameter(min_score_swap_qubits, decay_parameter)
+                    swapped_qubits.update(min_score_swap_qubits)
+                    if stats is not None:
+                        phase_start = time.perf_counter()
+                        stats.add_phase_time('heuristic_scoring', phase_start - scoring_start)
+                        stats.record_scoring(len(swap_candidate_list), len(front_layer_gates), len(extended_set_gates))
+                        stats.swaps_inserted += 1
+                        if observer is not None:
+                            observer.on_swap_inserted(min_score_swap_qubits, heuristic_score[min_score_swap_qubits])
+                swaps_without_progress += len(front_layer_gates)
+                if swaps_without_progress >= self.max_swaps_without_progress:
+                    forced_swaps = self.route_closest_front_gate(front_layer, layout, circuit_dag)
+                    routed_schedule.extend(forced_swaps)
+                    for swap_qubits in forced_swaps:
+                        swapped_qubits.update(swap_qubits)
+                    decay_parameter = self.initialize_decay_parameter(layout)
+                    swaps_without_progress = 0
+                    if stats is not None:
+                        phase_end = time.perf_counter()
+                        stats.add_phase_time('candidate_generation', phase_end - phase_start)
+                        phase_start = phase_end
+                        stats.forced_gates += 1
+                        stats.swaps_inserted += len(forced_swaps)
+                        if observer is not None:
+                            for swap_qubits in forced_swaps:
+                                observer.on_swap_inserted(swap_qubits, None)
+                gates_to_check = list({front_gate_on_qubit[qubit] for qubit in swapped_qubits if qubit in front_gate_on_qubit})
+                if stats is not None:
+                    stats.add_phase_time('front_layer_update', time.perf_counter() - phase_start)
+        if observer is not None:
+            observer.on_routing_finished(stats)
+        return routed_schedule
+
+    def route_closest_front_gate(self, front_layer: set, layout: Layout, circuit_dag: CircuitDAG) -> list:
+        """Makes the front layer gate whose qubits are closest in the coupling graph executable by moving its first
+            qubit along a shortest path towards its second qubit. Every step moves to the neighbour closest to the
+            second qubit, so the path also follows the distances of weighted coupling graphs. The layout is updated
+            with every SWAP. Raises a ValueError if the qubits of the closest gate are on physical qubits that no path
+            connects, or if no closer neighbour holds a logical qubit, so that the gate cannot be made executable
+            and the number of SWAPs per gate stays bounded
+
+        Args:
+            front_layer (set): ids of the gates in the front layer
+            layout (Layout): logical to physical qubit layout
+            circuit_dag (CircuitDAG): compact DAG of the circuit
+
+        Returns:
+            list: inserted SWAPs as tuples of logical qubits
+        """
+        logical_to_physical = layout.logical_to_physical
+        front_gate_distances = list()
+        for gate_id in front_layer:
+            logical_qubit_1, logical_qubit_2 = circuit_dag.get_gate_qubits(gate_id)
+            if logical_qubit_2 != NO_QUBIT:
+                front_gate_distances.append((self.distance_matrix[logical_to_physical[logical_qubit_1], logical_to_physical[logical_qubit_2]], gate_id))
+        if not front_gate_distances:
+            return list()
+        gate_distance, gate_id = min(front_gate_distances)
+        logical_qubit_1, logical_qubit_2 = circuit_dag.get_gate_qubits(gate_id)
+        if gate_distance >= self.unreachable_distance:
+            raise ValueError("gate {} acts on logical qubits {} and {}, whose physical qubits {} and {} are not connected by any path of the coupling graph".format(
+                gate_id, logical_qubit_1, logical_qubit_2, int(logical_to_physical[logical_qubit_1]), int(logical_to_physical[logical_qubit_2])))
+        target_physical_qubit = logical_to_physical[logical_qubit_2]
+        swaps = list()
+        current_physical_qubit = logical_to_physical[logical_qubit_1]
+        while not self.adjacency_bitmap[current_physical_qubit, target_physical_qubit]:
+            current_distance = self.distance_matrix[current_physical_qubit, target_physical_qubit]
+            next_physical_qubits = [physical_qubit for physical_qubit in self.neighbour_table[current_physical_qubit].tolist()
+                                    if self.distance_matrix[physical_qubit, target_physical_qubit] < current_distance and layout.physical_to_logical[physical_qubit] != UNMAPPED]
+            next_physical_qubits.sort(key=lambda physical_qubit: self.distance_matrix[physical_qubit, target_physical_qubit])
+            if not next_physical_qubits:
+                raise ValueError("logical qubit {} cannot move from physical qubit {} towards physical qubit {}, no next physical qubit on a shortest "
+                                 "path holds a logical qubit. Create the layout with Layout.from_mapping to pad free physical qubits".format(
+                                     logical_qubit_1, current_physical_qubit, int(target_physical_qubit)))
+            swap_qubits = (logical_qubit_1, int(layout.physical_to_logical[next_physical_qubits[0]]))
+            layout.swap_logical_qubits(*swap_qubits)
+            swaps.append(swap_qubits)
+            current_physical_qubit = next_physical_qubits[0]
+        return swaps
+
+    def emit_program(self, routed_schedule: list, circuit_dag: CircuitDAG) -> 'Program':
+        """Turns a routed schedule into a pyquil program. pyquil is only imported when this is called
+
+        Args:
+            routed_schedule (list): gate ids and SWAP qubit tuples in execution order
+            circuit_dag (CircuitDAG): compact DAG the gate ids refer to
+
+        Returns:
+            Program: program with SWAPs inserted
+        """        
+        from sabre_tools.circuit_preprocess import get_routed_program
+        if self.stats is None:
+            return get_routed_program(routed_schedule, circuit_dag.instructions)
+        emission_start = time.perf_counter()
+        final_circuit = get_routed_program(routed_schedule, circuit_dag.instructions)
+        self.stats.add_phase_time('output_emission', time.perf_counter() - emission_start)
+        return final_circuit
+
+    def build_circuit_dag(self, circuit: 'Program') -> CircuitDAG:
+        """Builds the compact DAG of a pyquil circuit, recording the time spent if stats are collected. pyquil
+            is only imported when this is called
+
+        Args:
+            circuit (Program): input pyquil program
+
+        Returns:
+            CircuitDAG: compact DAG of the circuit
+        """        
+        from sabre_tools.circuit_preprocess import get_compact_circuit_dag
+        if self.stats is None:
+            return get_compact_circuit_dag(circuit)
+        dag_build_start = time.perf_counter()
+        circuit_dag = get_compact_circuit_dag(circuit)
+        self.stats.add_phase_time('dag_build', time.perf_counter() - dag_build_start)
+        return circuit_dag
+
+    def add_front_gate(self, gate_id: int, front_layer: set, front_gate_on_qubit: dict, extended_set: ExtendedSet, circuit_dag: CircuitDAG) -> None:
+        """Adds a gate whose predecessors have all been executed to the front layer
+
+        Args:
+            gate_id (int): id of the gate entering the front layer
+            front_layer (set): ids of gates that have no unexecuted predecessors in the DAG
+            front_gate_on_qubit (dict): front layer gate acting on each logical qubit
+            extended_set (ExtendedSet): lookahead window over the successors of the front layer, None if the
+                                        routing strategy does not use it
+            circuit_dag (CircuitDAG): compact DAG the gate ids refer to
+        """        
+        front_layer.add(gate_id)
+        for qubit in circuit_dag.get_gate_qubits(gate_id):
+            if qubit != NO_QUBIT:
+                front_gate_on_qubit[qubit] = gate_id
+        if extended_set is not None:
+            extended_set.add_front_gate(gate_id)
+
+    def remove_front_gate(self, gate_id: int, front_layer: set, front_gate_on_qubit: dict, extended_set: ExtendedSet, circuit_dag: CircuitDAG) -> None:
+        """Removes an executed gate from the front layer
+
+        Args:
+            gate_id (int): id of the executed gate
+            front_layer (set): ids of gates that have no unexecuted predecessors in the DAG
+            front_gate_on_qubit (dict): front layer gate acting on each logical qubit
+            extended_set (ExtendedSet): lookahead window over the successors of the front layer, None if the
+                                        routing strategy does not use it
+            circuit_dag (CircuitDAG): compact DAG the gate ids refer to
+        """        
+        front_layer.discard(gate_id)
+        for qubit in circuit_dag.get_gate_qubits(gate_id):
+            if front_gate_on_qubit.get(qubit) == gate_id:
+                del front_gate_on_qubit[qubit]
+        if extended_set is not None:
+            extended_set.remove_front_gate(gate_id)
+
+    def initialize_decay_parameter(self, layout: Layout) -> list:
         """Initializes decay parameter for each logical qubit present in qubit mapping. This parameter
         is required to determine if a SWAP acting on 2 qubits must be selected to insertion into the program
 
         Args:
-            qubit_mapping (dict): logical to physical qubit mapping
+            layout (Layout): logical to physical qubit layout
 
         Returns:
             list: decay parameters for each logical qubit in the mapping
         """        
-        return [0.001] * len(list(qubit_mapping.keys()))
+        return [0.001] * layout.num_logical_qubits
 
-    def is_gate_executable(self, gate: Gate, qubit_mapping: dict) -> bool:
+    def is_gate_executable(self, gate: 'Gate', qubit_mapping: dict) -> bool:
         """Determines if a 2 qubut gate is executable, i.e., whether the gate acts on qubits which are connected in
-        the coupling graph
+        the coupling graph. Gates acting on a single qubit are always executable
 
         Args:
             gate (Gate): input 2 qubit gate
@@ -96,170 +370,164 @@ class SABRE():
             bool: True if the input gate acts on connected qubits. False otherwise
         """         
         gate_qubits = list(gate.get_qubits())
-        logical_qubit_1, logical_qubit_2 = gate_qubits[0], gate_qubits[1]
-        physical_qubit_1, physical_qubit_2 = qubit_mapping.get(logical_qubit_1), qubit_mapping.get(logical_qubit_2)
-        return self.coupling_graph.has_edge(physical_qubit_1, physical_qubit_2)
+        if len(gate_qubits) < 2:
+            return True
+        physical_qubit_1, physical_qubit_2 = qubit_mapping.get(gate_qubits[0]), qubit_mapping.get(gate_qubits[1])
+        return bool(self.adjacency_bitmap[physical_qubit_1, physical_qubit_2])
 
-    def is_dependent_on_successors(self, successor_details: tuple, front_layer_gates: list) -> bool:
-        """Determines if successors of an executed gate have qubit dependencies with gates in the front layer
+    def are_qubits_connected(self, logical_qubit_1: int, logical_qubit_2: int, layout: Layout) -> bool:
+        """Determines if the physical qubits corresponding to two logical qubits are connected in the coupling graph.
+        A NO_QUBIT second qubit denotes a single qubit gate, which is always executable
 
         Args:
-            successor_details (tuple): successors of an executed gate
-            front_layer_gates (list): list of gate that have no unexecuted predecessors in the DAG
+            logical_qubit_1 (int): first logical qubit of a gate
+            logical_qubit_2 (int): second logical qubit of a gate or NO_QUBIT
+            layout (Layout): logical to physical qubit layout
 
         Returns:
-            bool: True if there is a gate in the front layer that is applied on qubits of successors of an executed gate.
-                    False otherwise
-        """        
-        successor_gate = successor_details[0]
-        successor_qubits = set(successor_gate.get_qubits())
-        
-        for f_gate_details in front_layer_gates:
-            f_gate = f_gate_details[0]
-            f_qubits = set(f_gate.get_qubits())          
-            if successor_qubits.intersection(f_qubits):
-                return True
-        return False
-
-    def get_qubit_neighbours(self, control_logical_qubit: int, target_logical_qubit: int, qubit_mapping: dict) -> Union[list, list]:
+            bool: True if the logical qubits are mapped to connected physical qubits. False otherwise
+        """         
+        if logical_qubit_2 == NO_QUBIT:
+            return True
+        logical_to_physical = layout.logical_to_physical
+        return bool(self.adjacency_bitmap[logical_to_physical[logical_qubit_1], logical_to_physical[logical_qubit_2]])
+
+    def get_qubit_neighbours(self, control_logical_qubit: int, target_logical_qubit: int, layout: Layout) -> Union[list, list]:
         """Returns list of neighbours from qubit mapping for input control and target logical qubits whose corresponding 
             physical qubits are connected by an edge in the coupling graph
 
         Args:
             control_logical_qubit (int): logical control qubit of a 2 qubit gate
             target_logical_qubit (int): logical target qubut of a 2 qubit gate
-            qubit_mapping (dict): a dictionary containing logical to physical qubit mapping
+            layout (Layout): logical to physical qubit layout
 
         Returns:
             Union[list, list]: list of neighbours for control and target logical qubits whose corresponding physical qubits are 
                                 connected by an edge in the coupling graph
         """        
-        control_physical_qubit, target_physical_qubit = self.get_physical_qubit(control_logical_qubit, target_logical_qubit, qubit_mapping)
+        control_physical_qubit, target_physical_qubit = self.get_physical_qubit(control_logical_qubit, target_logical_qubit, layout)
         control_physical_qubit_neighbours, target_physical_qubit_neighbours = self.get_physical_qubit_neighbours(control_physical_qubit, target_physical_qubit)
 
-        control_logical_qubit_neighbours = self.get_logical_qubit_neighbours(control_physical_qubit_neighbours, qubit_mapping)
-        target_logical_qubit_neighbours = self.get_logical_qubit_neighbours(target_physical_qubit_neighbours, qubit_mapping)
+        control_logical_qubit_neighbours = self.get_logical_qubit_neighbours(control_physical_qubit_neighbours, layout)
+        target_logical_qubit_neighbours = self.get_logical_qubit_neighbours(target_physical_qubit_neighbours, layout)
 
         return control_logical_qubit_neighbours, target_logical_qubit_neighbours
 
-    def get_physical_qubit(self, control_logical_qubit: int, target_logical_qubit: int, qubit_mapping: dict) -> Union[int, int]:
+    def get_physical_qubit(self, control_logical_qubit: int, target_logical_qubit: int, layout: Layout) -> Union[int, int]:
         """Returns corresponding physical qubits from qubit mapping for input logical qubits of a 2 qubit gate
 
         Args:
             control_logical_qubit (int): logical control qubit of a 2 qubit gate
             target_logical_qubit (int): logical target qubut of a 2 qubit gate
-            qubit_mapping (dict): a dictionary containing logical to physical qubit mapping
+            layout (Layout): logical to physical qubit layout
 
         Returns:
             Union[int, int]: corresponding physical qubits for input logical qubits obtained from qubit mapping
         """        
-        return qubit_mapping.get(control_logical_qubit), qubit_mapping.get(target_logical_qubit)
+        return layout.logical_to_physical[control_logical_qubit], layout.logical_to_physical[target_logical_qubit]
 
-    def get_physical_qubit_neighbours(self, control_physical_qubit: int, target_logical_qubit: int) -> Union[list, list]:
-        """Returns neighbours from coupling graph for input physical qubits
+    def get_physical_qubit_neighbours(self, control_physical_qubit: int, target_physical_qubit: int) -> Union[np.ndarray, np.ndarray]:
+        """Returns neighbours from the precomputed neighbour table for input physical qubits
 
         Args:
             control_physical_qubit (int): physical control qubit of a 2 qubit gate
-            target_logical_qubit (int): physical target qubut of a 2 qubit gate
+            target_physical_qubit (int): physical target qubut of a 2 qubit gate
 
         Returns:
-            Union[list, list]: list of physical qubit neighbours for input physical control and target qubits
+            Union[np.ndarray, np.ndarray]: physical qubit neighbours for input physical control and target qubits
         """              
-        return self.coupling_graph.neighbors(control_physical_qubit), self.coupling_graph.neighbors(target_logical_qubit)
+        return self.neighbour_table[control_physical_qubit], self.neighbour_table[target_physical_qubit]
 
-    def get_logical_qubit_neighbours(self, physical_qubit_neighbours: list, qubit_mapping: dict) -> list:
-        """Returns corresponding logical qubits from qubit mapping for input physical qubits
+    def get_logical_qubit_neighbours(self, physical_qubit_neighbours: np.ndarray, layout: Layout) -> list:
+        """Returns corresponding logical qubits from qubit layout for input physical qubits. Physical qubits
+            that do not hold a logical qubit are skipped
 
         Args:
-            physical_qubit_neighbours (list): physical qubits whose corresponding logical qubits need to be obtained
-            qubit_mapping (dict): a dictionary containing logical to physical qubit mapping
+            physical_qubit_neighbours (np.ndarray): physical qubits whose corresponding logical qubits need to be obtained
+            layout (Layout): logical to physical qubit layout
 
         Returns:
-            list: list of corresponding logical qubits for input physical qubits obtained from qubit mapping
+            list: list of corresponding logical qubits for input physical qubits obtained from qubit layout
         """             
-        logical_qubits = list(qubit_mapping.keys())
-        physical_qubits = list(qubit_mapping.values())
-        logical_qubit_neighbours = list()
+        logical_qubit_neighbours = layout.physical_to_logical[physical_qubit_neighbours]
+        return logical_qubit_neighbours[logical_qubit_neighbours != UNMAPPED].tolist()
 
-        for qubit in physical_qubit_neighbours:
-            logical_qubit_neighbours.append(logical_qubits[physical_qubits.index(qubit)])
-        return logical_qubit_neighbours
-
-    def update_initial_mapping(self, swap_gate: Gate, qubit_mapping: dict) -> dict:
+    def update_initial_mapping(self, swap_gate: 'Gate', qubit_mapping: dict) -> dict:
         """Update qubit mapping between logical and physical if a SWAP gate is inserted in the program
 
         Args:
             swap_gate (Gate): a pyquil SWAP gate
             qubit_mapping (dict): a dictionary containing logical to physical qubit mapping
 
+        Returns:
+            dict: updated qubit mapping
+        """        
+        return self.swap_logical_qubits(tuple(swap_gate.get_qubits()), qubit_mapping)
+
+    def swap_logical_qubits(self, swap_qubits: tuple, qubit_mapping: dict) -> dict:
+        """Update qubit mapping between logical and physical if a SWAP acting on the input logical qubits is inserted
+        in the program
+
+        Args:
+            swap_qubits (tuple): logical qubits of a SWAP gate
+            qubit_mapping (dict): a dictionary containing logical to physical qubit mapping
+
         Returns:
             dict: updated qubit mapping
         """        
         temp_mapping = qubit_mapping.copy()
-        swap_qubits = list(swap_gate.get_qubits())
         p_qubit_1, p_qubit_2 = qubit_mapping.get(swap_qubits[0]), qubit_mapping.get(swap_qubits[1])
         p_qubit_1, p_qubit_2 = p_qubit_2, p_qubit_1
         temp_mapping.update({swap_qubits[0]: p_qubit_1, swap_qubits[1]: p_qubit_2})
         return temp_mapping
 
-    def find_min_score_swap_gate(self, heuristic_score: dict, swap_candidate_list: list) -> Gate:
+    def find_min_score_swap_gate(self, heuristic_score: dict, swap_candidate_list: list) -> tuple:
         """Finds the SWAP gate with the minimum score for the heuristic function
 
         Args:
             heuristic_score (dict): value of the heuristic function for each possible SWAP gate
-            swap_candidate_list (list): list of candidate SWAP gates that can be inserted in the program
+            swap_candidate_list (list): list of logical qubits of candidate SWAP gates that can be inserted in the program
 
         Returns:
-            Gate: SWAP gate with minimum score for heuristic function
+            tuple: logical qubits of the SWAP gate with minimum score for heuristic function
         """        
         all_scores = list(heuristic_score.values())
         min_score = min(all_scores)
         min_score_swap_gate = swap_candidate_list[all_scores.index(min_score)]
         return min_score_swap_gate
 
-    def update_decay_parameter(self, min_score_swap_gate: Gate, decay_parameter: list) -> list:
+    def update_decay_parameter(self, min_score_swap_qubits: tuple, decay_parameter: list) -> list:
         """Updates decay parameters for qubits on which SWAP gate with the minimum heuristic score is applied
 
         Args:
-            min_score_swap_gate (Gate): SWAP gate with the minimum heuristic score
+            min_score_swap_qubits (tuple): logical qubits of the SWAP gate with the minimum heuristic score
             decay_parameter (list): decay parameter list to be updated
 
         Returns:
             list: updated decay parameter list
         """        
-        min_score_swap_qubits = list(min_score_swap_gate.get_qubits())
         decay_parameter[min_score_swap_qubits[0]] = decay_parameter[min_score_swap_qubits[0]] + 0.001
         decay_parameter[min_score_swap_qubits[1]] = decay_parameter[min_score_swap_qubits[1]] + 0.001
         return decay_parameter
 
     
-    def rewiring_correctness(self, circuit: Program, qubit_mapping: dict) -> dict:
+    def rewiring_correctness(self, circuit: 'Program', qubit_mapping: dict) -> dict:
         """Determines if the qubit mapping and SWAP inserted Program obtained from application 
             of SABRE is able to resolve all qubit dependencies. This function can also be used to determine
             if the initial input program requires the use of SABRE
 
         Args:
             circuit (Program): a pyquil Program
-            qubit_mapping (dict): qubit mapping between logical and physical qubits
+            qubit_mapping (dict): qubit mapping between logical and physical qubits. Padded with pad_mapping like
+                                the mapping the routing started from
 
         Returns:
             dict: an dict object containing the Gate that cannot be executed with the given Program and mapping
                     and the qubits that are not physically connected. An empty dict otherwise. 
         """        
-        forbidden_gate = dict()
-        temp_mapping = qubit_mapping.copy()
-        for instruction in circuit.instructions:
-            if instruction.name == 'SWAP':
-                temp_mapping = self.update_initial_mapping(instruction, temp_mapping)
-            if not self.is_gate_executable(instruction, temp_mapping):
-                gate_qubits = list(instruction.get_qubits())
-                logical_qubit1, logical_qubit2 = gate_qubits[0], gate_qubits[1]
-                p_qubit1, p_qubit2 = temp_mapping.get(logical_qubit1), temp_mapping.get(logical_qubit2)
-                forbidden_gate.update({instruction: (p_qubit1, p_qubit2)})
-
-        return forbidden_gate
+        return find_forbidden_gates(circuit, pad_mapping(qubit_mapping, len(self.adjacency_bitmap)), self.adjacency_bitmap)
             
-    def cnot_count(self, circuit: Program) -> int:
+    def cnot_count(self, circuit: 'Program') -> int:
         """Counts the number of CNOT gates in the input pyquil Program
 
         Args:
@@ -268,10 +536,4 @@ class SABRE():
         Returns:
             int: number of CNOT gates in the program
         """        
-        cnot_count = 0
-        for instruction in circuit.instructions:
-            if instruction.name == 'CNOT':
-                cnot_count = cnot_count + 1
-            if instruction.name == 'SWAP':
-                cnot_count = cnot_count + 3
-        return cnot_count
\ No newline at end of file
+        return get_cnot_count(get_operation_codes(circuit.instructions))
\ No newline at end of file
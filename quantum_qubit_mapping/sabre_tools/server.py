@@ -0,0 +1,474 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pyquil import Program
+from sabre_tools.circuit_preprocess import get_distance_matrix, get_routed_quil
+from sabre_tools.device_router import DeviceRouter
+from sabre_tools.routing_strategy import RoutingStrategy, get_routing_strategy
+from sabre_tools.topologies import get_topology, get_topology_size, read_edge_list
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+DEFAULT_PORT = 8765
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_DEVICE_QUBITS = 1024
+
+server_worker_state = dict()
+
+def initialize_server_worker(device_data: dict, passes: int, extended_set_size: int, routing_strategy: RoutingStrategy = None) -> None:
+    """Stores the coupling graphs and distance matrices of the registered devices in a worker process. The
+        router of a device is built on its first request and kept for all later requests
+
+    Args:
+        device_data (dict): coupling graph and distance matrix of every registered device id
+        passes (int): maximum number of bidirectional passes per circuit
+        extended_set_size (int): maximum number of gates in the lookahead window
+        routing_strategy (RoutingStrategy, optional): routing strategy of every device. Defaults to the SABRE heuristic
+    """
+    server_worker_state.update(device_data=device_data, passes=passes, extended_set_size=extended_set_size, routing_strategy=routing_strategy, device_routers=dict())
+
+def get_worker_device_router(device_id: str) -> DeviceRouter:
+    """Returns the warm router of a device in a worker process. Device ids that are not registered are read as
+        topology specifications such as "grid:4x5", whose coupling graph is built here rather than on the event loop
+        of the server
+
+    Args:
+        device_id (str): registered device id or topology specification
+
+    Returns:
+        DeviceRouter: router of the device
+    """
+    device_routers = server_worker_state['device_routers']
+    device_router = device_routers.get(device_id)
+    if device_router is None:
+        coupling_graph, distance_matrix = server_worker_state['device_data'].get(device_id) or (get_topology(device_id), None)
+        device_router = DeviceRouter(coupling_graph, server_worker_state['passes'], server_worker_state['extended_set_size'], distance_matrix,
+                                     routing_strategy=server_worker_state['routing_strategy'])
+        device_routers[device_id] = device_router
+    return device_router
+
+def route_batch_in_worker(device_id: str, batch: list) -> list:
+    """Parses and routes a batch of Quil programs for the same device in a worker process initialized by
+        initialize_server_worker. Failures are returned per program so one bad request does not fail the batch
+
+    Args:
+        device_id (str): registered device id or topology specification
+        batch (list): pairs of Quil source and seed of the random initial mapping
+
+    Returns:
+        list: result of every program with its routed Quil source, mappings and routing time, or its error
+    """
+    device_router = get_worker_device_router(device_id)
+    results = list()
+    for quil, seed in batch:
+        start_time = time.perf_counter()
+        try:
+            circuit = Program(quil)
+            routing_result = device_router.route(circuit, seed=seed)
+            results.append({
+                'status': 'ok',
+                'quil': get_routed_quil(circuit, routing_result.final_program),
+                'initial_mapping': routing_result.initial_mapping,
+                'final_mapping': routing_result.final_mapping,
+                'routing_seconds': routing_result.runtime,
+                'worker_seconds': time.perf_counter() - start_time,
+            })
+        except Exception as error:
+            results.append({'status': 'error', 'error': "{}: {}".format(type(error).__name__, error)})
+    return results
+
+class DeviceMetrics():
+    def __init__(self) -> None:
+        """Initialize the request, batch and latency counters of a device
+        """
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.queue_seconds_sum = 0.0
+        self.latency_seconds_sum = 0.0
+        self.max_latency_seconds = 0.0
+
+    def record_batch(self) -> None:
+        """Records a batch sent to the process pool
+        """
+        self.batches += 1
+
+    def record_request(self, queue_seconds: float, latency_seconds: float, is_error: bool) -> None:
+        """Records a finished request
+
+        Args:
+            queue_seconds (float): time the request waited before its batch was sent to the process pool
+            latency_seconds (float): time from receiving the request to its result
+            is_error (bool): whether the request failed
+        """
+        self.requests += 1
+        self.errors += int(is_error)
+        self.queue_seconds_sum += queue_seconds
+        self.latency_seconds_sum += latency_seconds
+        self.max_latency_seconds = max(self.max_latency_seconds, latency_seconds)
+
+    def to_dict(self) -> dict:
+        """Returns the counters and the mean batch size, queue time and latency
+
+        Returns:
+            dict: metrics of the device
+        """
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'batches': self.batches,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'mean_queue_seconds': self.queue_seconds_sum / self.requests if self.requests else 0.0,
+            'mean_latency_seconds': self.latency_seconds_sum / self.requests if self.requests else 0.0,
+            'max_latency_seconds': self.max_latency_seconds,
+        }
+
+class RoutingServer():
+    def __init__(self, devices: dict = None, num_workers: int = None, passes: int = 3, extended_set_size: int = 20, max_batch_size: int = 16, max_batch_delay: float = 0.005, routing_strategy: RoutingStrategy = None, max_device_qubits: int = DEFAULT_MAX_DEVICE_QUBITS) -> None:
+        """Initialize a routing service shared by many clients. Requests for the same device that arrive within
+            max_batch_delay of each other are routed as one batch on a process pool, and every worker keeps the
+            distance matrix, neighbour table and adjacency bitmap of each device it has routed for
+
+        Args:
+            devices (dict, optional): coupling graph of every registered device id. Topology specifications such
+                                    as "grid:4x5" of at most max_device_qubits physical qubits are accepted as
+                                    device ids in addition
+            num_workers (int, optional): number of worker processes. Defaults to the number of CPUs
+            passes (int, optional): maximum number of bidirectional passes per circuit. Defaults to 3
+            extended_set_size (int, optional): maximum number of gates in the lookahead window. Defaults to 20
+            max_batch_size (int, optional): maximum number of requests routed in one batch. Defaults to 16
+            max_batch_delay (float, optional): time in seconds a batch waits for further requests after its first one.
+                                                Defaults to 0.005
+            routing_strategy (RoutingStrategy, optional): generates and scores the candidate SWAPs of every device.
+                                                        Defaults to the lookahead and decay heuristic of the SABRE paper
+            max_device_qubits (int, optional): maximum number of physical qubits of a topology specification used as
+                                                device id, so that a single request cannot make the workers build a huge
+                                                coupling graph. 0 accepts registered devices only. Defaults to 1024
+        """
+        if passes < 1 or passes % 2 == 0:
+            raise ValueError("passes must be a positive odd number so that the last pass is a forward pass, got {}".format(passes))
+        self.device_data = {device_id: (coupling_graph, get_distance_matrix(coupling_graph)) for device_id, coupling_graph in (devices or dict()).items()}
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.passes = passes
+        self.extended_set_size = extended_set_size
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.routing_strategy = routing_strategy
+        self.max_device_qubits = max_device_qubits
+        self.executor = None
+        self.batch_slots = None
+        self.device_queues = dict()
+        self.device_metrics = dict()
+        self.background_tasks = set()
+        self.start_time = time.perf_counter()
+
+    def start_workers(self) -> None:
+        """Starts the process pool if it is not running yet, or again after it broke
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.num_workers, initializer=initialize_server_worker,
+                                                initargs=(self.device_data, self.passes, self.extended_set_size, self.routing_strategy))
+        if self.batch_slots is None:
+            self.batch_slots = asyncio.Semaphore(2 * self.num_workers)
+
+    def restart_workers(self, broken_executor: ProcessPoolExecutor) -> None:
+        """Replaces a process pool whose worker died, so that later batches are routed by a new pool. Batches that
+            fail on the same broken pool only replace it once
+
+        Args:
+            broken_executor (ProcessPoolExecutor): pool that raised BrokenProcessPool
+        """
+        if self.executor is broken_executor:
+            broken_executor.shutdown(wait=False)
+            self.executor = None
+            self.start_workers()
+
+    def get_device_error(self, device_id: str) -> str:
+        """Determines if a device id is registered or a valid topology specification of at most max_device_qubits
+            physical qubits. The size of a topology is computed from its specification without building it
+
+        Args:
+            device_id (str): device id of a request
+
+        Returns:
+            str: why requests for the device cannot be routed, None if they can
+        """
+        if not isinstance(device_id, str):
+            return "unknown device {!r}".format(device_id)
+        if device_id in self.device_data or device_id in self.device_queues:
+            return None
+        try:
+            num_physical_qubits = get_topology_size(device_id)
+        except ValueError:
+            return "unknown device {!r}".format(device_id)
+        if num_physical_qubits > self.max_device_qubits:
+            return "device {!r} has {} physical qubits, topology specifications are limited to {}".format(device_id, num_physical_qubits, self.max_device_qubits)
+        return None
+
+    async def route(self, quil: str, device_id: str, seed: int = None) -> dict:
+        """Routes a Quil program for a device, batched with concurrent requests for the same device
+
+        Args:
+            quil (str): Quil source of the program
+            device_id (str): registered device id or topology specification
+            seed (int, optional): seed of the random initial mapping. Random if not given
+
+        Returns:
+            dict: routed Quil source, mappings and request metrics, or the error of the request
+        """
+        device_error = self.get_device_error(device_id)
+        if device_error is not None:
+            return {'status': 'error', 'error': device_error}
+        self.start_workers()
+        device_queue = self.device_queues.get(device_id)
+        if device_queue is None:
+            device_queue = self.device_queues[device_id] = asyncio.Queue()
+            self.device_metrics[device_id] = DeviceMetrics()
+            self.create_background_task(self.run_device_batcher(device_id))
+        result_future = asyncio.get_running_loop().create_future()
+        await device_queue.put((quil, seed, result_future, time.perf_counter()))
+        return await result_future
+
+    def create_background_task(self, coroutine) -> asyncio.Task:
+        """Starts a task and keeps a reference to it until it is done
+
+        Args:
+            coroutine: coroutine run by the task
+
+        Returns:
+            asyncio.Task: the started task
+        """
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+
+    async def run_device_batcher(self, device_id: str) -> None:
+        """Collects the queued requests of a device into batches and sends them to the process pool. A batch is
+            sent when it is full or max_batch_delay after its first request, and at most two batches per worker
+            are in flight
+
+        Args:
+            device_id (str): device whose queue is served
+        """
+        loop = asyncio.get_running_loop()
+        device_queue = self.device_queues[device_id]
+        while True:
+            batch = [await device_queue.get()]
+            batch_deadline = loop.time() + self.max_batch_delay
+            while len(batch) < self.max_batch_size:
+                if device_queue.empty():
+                    timeout = batch_deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(device_queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(device_queue.get_nowait())
+            await self.batch_slots.acquire()
+            self.create_background_task(self.run_batch(device_id, batch))
+
+    async def run_batch(self, device_id: str, batch: list) -> None:
+        """Routes a batch on the process pool and resolves the result of every request in it
+
+        Args:
+            device_id (str): device the batch is routed for
+            batch (list): queued requests as (Quil source, seed, result future, enqueue time)
+        """
+        dispatch_time = time.perf_counter()
+        metrics = self.device_metrics[device_id]
+        metrics.record_batch()
+        executor = self.executor
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(executor, route_batch_in_worker, device_id, [(quil, seed) for quil, seed, _, _ in batch])
+        except BrokenProcessPool as error:
+            results = [{'status': 'error', 'error': "{}: {}".format(type(error).__name__, error)} for _ in batch]
+            self.restart_workers(executor)
+        except Exception as error:
+            results = [{'status': 'error', 'error': "{}: {}".format(type(error).__name__, error)} for _ in batch]
+        finally:
+            self.batch_slots.release()
+        finish_time = time.perf_counter()
+        for (_, _, result_future, enqueue_time), result in zip(batch, results):
+            result['metrics'] = {
+                'queue_seconds': dispatch_time - enqueue_time,
+                'latency_seconds': finish_time - enqueue_time,
+                'batch_size': len(batch),
+            }
+            metrics.record_request(dispatch_time - enqueue_time, finish_time - enqueue_time, result['status'] != 'ok')
+            if not result_future.done():
+                result_future.set_result(result)
+
+    def get_metrics(self) -> dict:
+        """Returns the queue depth and the request, batch and latency metrics of every device
+
+        Returns:
+            dict: server uptime and the metrics of every device that received requests
+        """
+        devices = dict()
+        for device_id, metrics in self.device_metrics.items():
+            devices[device_id] = metrics.to_dict()
+            devices[device_id]['queue_depth'] = self.device_queues[device_id].qsize()
+        return {'uptime_seconds': time.perf_counter() - self.start_time, 'num_workers': self.num_workers, 'devices': devices}
+
+    async def handle_request(self, request: dict) -> dict:
+        """Answers a single decoded request. Requests with op "metrics" return the server metrics, all others
+            are routing requests with "quil", "device" and optionally "seed"
+
+        Args:
+            request (dict): decoded JSON request
+
+        Returns:
+            dict: response echoing the id of the request
+        """
+        if request.get('op') == 'metrics':
+            response = {'status': 'ok', 'metrics': self.get_metrics()}
+        elif not isinstance(request.get('quil'), str):
+            response = {'status': 'error', 'error': "request needs a quil string"}
+        else:
+            response = await self.route(request['quil'], request.get('device'), request.get('seed'))
+        response['id'] = request.get('id')
+        return response
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves a client connection. Every line is a JSON request and every response is written as a JSON line
+            as soon as it is ready, so a client can send many requests without waiting and match the responses by id.
+            The connection is closed quietly when the server shuts down
+
+        Args:
+            reader (asyncio.StreamReader): stream of the requests
+            writer (asyncio.StreamWriter): stream of the responses
+        """
+        response_tasks = set()
+
+        async def respond(request: dict) -> None:
+            response = await self.handle_request(request)
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as error:
+                    writer.write(json.dumps({'status': 'error', 'error': "invalid request: {}".format(error)}).encode() + b'\n')
+                    continue
+                response_task = asyncio.get_running_loop().create_task(respond(request))
+                response_tasks.add(response_task)
+                response_task.add_done_callback(response_tasks.discard)
+            if response_tasks:
+                await asyncio.gather(*response_tasks, return_exceptions=True)
+        except (ConnectionError, ValueError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Starts the worker processes and listens for clients
+
+        Args:
+            host (str, optional): address to listen on. Defaults to localhost only
+            port (int, optional): port to listen on. Defaults to DEFAULT_PORT
+
+        Returns:
+            asyncio.AbstractServer: the listening server
+        """
+        self.start_workers()
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_REQUEST_BYTES)
+
+    async def close(self) -> None:
+        """Cancels the batchers and shuts down the worker processes
+        """
+        for task in list(self.background_tasks):
+            task.cancel()
+        await asyncio.gather(*self.background_tasks, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+async def request_routing(quil: str, device_id: str, seed: int = None, host: str = '127.0.0.1', port: int = DEFAULT_PORT) -> dict:
+    """Sends a single routing request to a running RoutingServer
+
+    Args:
+        quil (str): Quil source of the program
+        device_id (str): registered device id or topology specification
+        seed (int, optional): seed of the random initial mapping. Random if not given
+        host (str, optional): address of the server. Defaults to localhost
+        port (int, optional): port of the server. Defaults to DEFAULT_PORT
+
+    Returns:
+        dict: routed Quil source, mappings and request metrics, or the error of the request
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_REQUEST_BYTES)
+    try:
+        writer.write(json.dumps({'quil': quil, 'device': device_id, 'seed': seed}).encode() + b'\n')
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+async def serve(routing_server: RoutingServer, host: str, port: int) -> None:
+    """Runs a routing server until it is cancelled
+
+    Args:
+        routing_server (RoutingServer): server to run
+        host (str): address to listen on
+        port (int): port to listen on
+    """
+    server = await routing_server.start(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await routing_server.close()
+
+def main(argv: list = None) -> None:
+    """Runs a routing server on localhost for the devices given on the command line
+
+    Args:
+        argv (list, optional): command line arguments. Defaults to sys.argv
+    """
+    parser = argparse.ArgumentParser(description="Serve SABRE routing requests for shared devices")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on. Defaults to localhost only")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--device', action='append', default=list(), metavar='ID=TOPOLOGY', help="register a named topology under a device id")
+    parser.add_argument('--edge-list', action='append', default=list(), metavar='ID=PATH', help="register an edge list file under a device id")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes. Defaults to the number of CPUs")
+    parser.add_argument('--passes', type=int, default=3)
+    parser.add_argument('--strategy', default='decay', help="routing strategy such as basic, lookahead, decay or decay:0.3. Defaults to decay")
+    parser.add_argument('--max-batch-size', type=int, default=16)
+    parser.add_argument('--max-batch-delay', type=float, default=0.005, help="seconds a batch waits for further requests")
+    parser.add_argument('--max-device-qubits', type=int, default=DEFAULT_MAX_DEVICE_QUBITS,
+                        help="largest topology specification accepted as device id, 0 accepts registered devices only. Defaults to {}".format(DEFAULT_MAX_DEVICE_QUBITS))
+    args = parser.parse_args(argv)
+
+    devices = dict()
+    try:
+        for device_spec, read_coupling_graph in [(spec, get_topology) for spec in args.device] + [(spec, read_edge_list) for spec in args.edge_list]:
+            device_id, separator, source = device_spec.partition('=')
+            if not separator:
+                raise ValueError("device {!r} must be given as ID=SOURCE".format(device_spec))
+            devices[device_id] = read_coupling_graph(source)
+        routing_server = RoutingServer(devices, args.workers, args.passes, max_batch_size=args.max_batch_size, max_batch_delay=args.max_batch_delay,
+                                       routing_strategy=get_routing_strategy(args.strategy), max_device_qubits=args.max_device_qubits)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    print("serving {} registered devices on {}:{}".format(len(devices), args.host, args.port))
+    try:
+        asyncio.run(serve(routing_server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
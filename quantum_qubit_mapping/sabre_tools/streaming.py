@@ -0,0 +1,134 @@
+from itertools import islice
+from pyquil import Program
+from pyquil.gates import SWAP
+from sabre_tools.circuit_dag import build_circuit_dag
+from sabre_tools.circuit_preprocess import get_instruction_qubits
+from sabre_tools.layout import Layout
+from sabre_tools.sabre import SABRE
+from typing import Iterable, Iterator
+
+def read_quil_instructions(quil_file_path: str) -> Iterator:
+    """Parses a Quil file lazily, one instruction at a time. Indented lines continue the instruction
+        above them, so multi-line definitions such as DEFGATE blocks are parsed as a whole
+
+    Args:
+        quil_file_path (str): path of the Quil file
+
+    Yields:
+        Iterator: pyquil instructions in program order
+    """
+    with open(quil_file_path) as quil_file:
+        block_lines = list()
+        for line in quil_file:
+            if line[:1] in (' ', '\t') and block_lines:
+                block_lines.append(line)
+                continue
+            if block_lines:
+                yield from parse_quil_block(''.join(block_lines))
+            block_lines = [line] if line.strip() and not line.lstrip().startswith('#') else list()
+        if block_lines:
+            yield from parse_quil_block(''.join(block_lines))
+
+def parse_quil_block(quil_block: str) -> list:
+    """Parses a single Quil instruction or definition block
+
+    Args:
+        quil_block (str): Quil source of the block
+
+    Returns:
+        list: gate definitions followed by the instructions of the block
+    """
+    program = Program(quil_block)
+    return list(program.defined_gates) + list(program.instructions)
+
+def route_stream(sabre: SABRE, instructions: Iterable, layout: Layout, window_size: int = 10000, commit_size: int = None) -> Iterator:
+    """Routes a stream of instructions while holding only a bounded window of the circuit in memory. The DAG
+        of the next window_size unrouted instructions is routed with SABRE, and the routed schedule is kept up
+        to the point where commit_size gates were executed. The remaining gates are routed again together with
+        the next instructions of the stream, so committed gates always had a full lookahead window.
+        Instructions that act on no qubit, such as DECLARE, PRAGMA, LABEL, JUMP or HALT, are barriers on all qubits:
+        the gates before them are routed and emitted in full, then they are emitted in their input position.
+        Bidirectional passes need the whole circuit and are therefore not available in streaming mode
+
+    Args:
+        sabre (SABRE): SABRE instance of the device
+        instructions (Iterable): pyquil instructions in program order, read lazily
+        layout (Layout): logical to physical qubit layout the routing starts from. Every logical qubit used by the
+                        stream must be mapped, otherwise a ValueError is raised. Holds the final layout afterwards
+        window_size (int, optional): maximum number of unrouted instructions held in memory. Defaults to 10000
+        commit_size (int, optional): number of gates committed per window before the rest is routed again.
+                                    Defaults to three quarters of the window
+
+    Yields:
+        Iterator: routed pyquil instructions, including the inserted SWAP gates
+    """
+    if commit_size is None:
+        commit_size = max(1, window_size * 3 // 4)
+    if not 1 <= commit_size <= window_size:
+        raise ValueError("commit_size must be between 1 and window_size ({}), got {}".format(window_size, commit_size))
+
+    instructions = iter(instructions)
+    window_instructions = list()
+    window_gate_qubits = list()
+    while True:
+        barrier_instruction = None
+        for instruction in islice(instructions, window_size - len(window_instructions)):
+            instruction_qubits = get_instruction_qubits(instruction)
+            if not instruction_qubits:
+                barrier_instruction = instruction
+                break
+            window_instructions.append(instruction)
+            window_gate_qubits.append(instruction_qubits)
+
+        if window_instructions:
+            window_dag = build_circuit_dag(window_gate_qubits, window_instructions)
+            window_layout = layout.copy()
+            routed_schedule = sabre.route_circuit_dag(window_dag.front_layer(), window_layout, window_dag)
+            is_last_window = barrier_instruction is not None or len(window_instructions) < window_size
+            window_commit_size = len(window_instructions) if is_last_window else commit_size
+
+            executed_gates = set()
+            for operation in routed_schedule:
+                if len(executed_gates) == window_commit_size:
+                    break
+                if isinstance(operation, tuple):
+                    layout.swap_logical_qubits(*operation)
+                    yield SWAP(*operation)
+                else:
+                    executed_gates.add(operation)
+                    yield window_instructions[operation]
+
+            remaining_gate_ids = [gate_id for gate_id in range(len(window_instructions)) if gate_id not in executed_gates]
+            window_instructions = [window_instructions[gate_id] for gate_id in remaining_gate_ids]
+            window_gate_qubits = [window_gate_qubits[gate_id] for gate_id in remaining_gate_ids]
+
+        if barrier_instruction is not None:
+            yield barrier_instruction
+        elif not window_instructions:
+            return
+
+def write_routed_quil(sabre: SABRE, quil_file_path: str, output_file_path: str, initial_mapping: dict = None, window_size: int = 10000, commit_size: int = None) -> dict:
+    """Routes a Quil file in streaming mode and writes the routed program to another Quil file instruction
+        by instruction, so neither the input nor the output circuit is held in memory as a whole
+
+    Args:
+        sabre (SABRE): SABRE instance of the device
+        quil_file_path (str): path of the input Quil file
+        output_file_path (str): path of the routed Quil file
+        initial_mapping (dict, optional): logical to physical qubit mapping the routing starts from. Logical qubit i
+                                        starts on the i-th physical qubit of the coupling graph if not given. Physical
+                                        qubits it leaves free are given logical qubits with pad_mapping
+        window_size (int, optional): maximum number of unrouted instructions held in memory. Defaults to 10000
+        commit_size (int, optional): number of gates committed per window. Defaults to three quarters of the window
+
+    Returns:
+        dict: logical to physical qubit mapping after the routed program
+    """
+    if initial_mapping is None:
+        initial_mapping = dict(enumerate(sabre.coupling_graph.nodes()))
+    layout = Layout.from_mapping(initial_mapping, len(sabre.adjacency_bitmap))
+    with open(output_file_path, 'w') as output_file:
+        for instruction in route_stream(sabre, read_quil_instructions(quil_file_path), layout, window_size, commit_size):
+            output_file.write(instruction.out())
+            output_file.write('\n')
+    return layout.to_mapping()
@@ -0,0 +1,145 @@
+from networkx import Graph
+from typing import Union
+
+import networkx as nx
+
+def line_topology(num_qubits: int) -> Graph:
+    """Creates a coupling graph of physical qubits connected in a line
+
+    Args:
+        num_qubits (int): number of physical qubits
+
+    Returns:
+        Graph: coupling graph with edges (i, i + 1)
+    """
+    return nx.path_graph(num_qubits)
+
+def ring_topology(num_qubits: int) -> Graph:
+    """Creates a coupling graph of physical qubits connected in a ring
+
+    Args:
+        num_qubits (int): number of physical qubits
+
+    Returns:
+        Graph: coupling graph with edges (i, i + 1 mod num_qubits)
+    """
+    return nx.cycle_graph(num_qubits)
+
+def grid_topology(rows: int, columns: int) -> Graph:
+    """Creates a coupling graph of physical qubits on a 2D grid with nearest neighbour connections
+
+    Args:
+        rows (int): number of rows of the grid
+        columns (int): number of columns of the grid
+
+    Returns:
+        Graph: coupling graph whose physical qubits are numbered row by row
+    """
+    return nx.convert_node_labels_to_integers(nx.grid_2d_graph(rows, columns), ordering='sorted')
+
+def heavy_hex_topology(rows: int, columns: int) -> Graph:
+    """Creates a heavy-hex coupling graph, i.e. a hexagonal lattice with an additional physical qubit on
+        every edge, as used by IBM devices
+
+    Args:
+        rows (int): number of rows of hexagons
+        columns (int): number of columns of hexagons
+
+    Returns:
+        Graph: heavy-hex coupling graph with physical qubits numbered 0 to n - 1
+    """
+    hexagonal_lattice = nx.hexagonal_lattice_graph(rows, columns)
+    heavy_hex_lattice = nx.Graph()
+    for u, v in hexagonal_lattice.edges():
+        heavy_hex_lattice.add_edges_from([(u, (u, v)), ((u, v), v)])
+    return nx.convert_node_labels_to_integers(heavy_hex_lattice)
+
+TOPOLOGIES = {
+    'line': line_topology,
+    'ring': ring_topology,
+    'grid': grid_topology,
+    'heavy_hex': heavy_hex_topology,
+}
+
+TOPOLOGY_SIZES = {
+    'line': lambda num_qubits: num_qubits,
+    'ring': lambda num_qubits: num_qubits,
+    'grid': lambda rows, columns: rows * columns,
+    'heavy_hex': lambda rows, columns: 5 * rows * columns + 4 * rows + 4 * columns - 1,
+}
+
+def parse_topology_spec(topology_spec: str) -> Union[str, list]:
+    """Splits a topology specification such as "grid:4x5" into its name and dimensions
+
+    Args:
+        topology_spec (str): topology name and its dimensions separated by a colon, dimensions separated by x
+
+    Returns:
+        Union[str, list]: name of the topology and its positive integer dimensions
+    """
+    name, _, dimensions = topology_spec.partition(':')
+    if name not in TOPOLOGIES:
+        raise ValueError("unknown topology {!r}, expected one of {}".format(name, sorted(TOPOLOGIES)))
+    try:
+        dimensions = [int(dimension) for dimension in dimensions.split('x')]
+        TOPOLOGY_SIZES[name](*dimensions)
+    except (TypeError, ValueError):
+        raise ValueError("invalid dimensions in topology {!r}".format(topology_spec))
+    if min(dimensions) < 1:
+        raise ValueError("invalid dimensions in topology {!r}".format(topology_spec))
+    return name, dimensions
+
+def get_topology_size(topology_spec: str) -> int:
+    """Computes the number of physical qubits of a named topology without building its coupling graph
+
+    Args:
+        topology_spec (str): topology specification understood by get_topology
+
+    Returns:
+        int: number of physical qubits
+    """
+    name, dimensions = parse_topology_spec(topology_spec)
+    return TOPOLOGY_SIZES[name](*dimensions)
+
+def get_topology(topology_spec: str) -> Graph:
+    """Creates a named coupling graph from a specification such as "line:16", "ring:16", "grid:4x5"
+        or "heavy_hex:2x3"
+
+    Args:
+        topology_spec (str): topology name and its dimensions separated by a colon, dimensions separated by x
+
+    Returns:
+        Graph: coupling graph of the topology
+    """
+    name, dimensions = parse_topology_spec(topology_spec)
+    return TOPOLOGIES[name](*dimensions)
+
+def read_edge_list(edge_list_path: str) -> Graph:
+    """Reads a coupling graph from a text file with one edge per line, given as two physical qubits separated by
+        whitespace or a comma. Blank lines and lines starting with # are skipped. The physical qubits must be numbered
+        from 0 without gaps, as they index the distance matrix and name the qubits of the routed program
+
+    Args:
+        edge_list_path (str): path of the edge list file
+
+    Returns:
+        Graph: coupling graph with physical qubits numbered as in the file
+    """
+    coupling_graph = nx.Graph()
+    with open(edge_list_path) as edge_list_file:
+        for line_number, line in enumerate(edge_list_file, start=1):
+            fields = line.split('#', 1)[0].replace(',', ' ').split()
+            if not fields:
+                continue
+            try:
+                physical_qubit_1, physical_qubit_2 = (int(physical_qubit) for physical_qubit in fields)
+            except ValueError:
+                raise ValueError("invalid edge on line {} of {!r}, expected two physical qubits".format(line_number, edge_list_path))
+            coupling_graph.add_edge(physical_qubit_1, physical_qubit_2)
+    if not coupling_graph:
+        raise ValueError("no edges in {!r}".format(edge_list_path))
+    missing_physical_qubits = sorted(set(range(coupling_graph.number_of_nodes())) - set(coupling_graph.nodes()))
+    if missing_physical_qubits:
+        raise ValueError("physical qubits of {!r} must be numbered 0 to {} without gaps, missing {}".format(
+            edge_list_path, coupling_graph.number_of_nodes() - 1, missing_physical_qubits))
+    return coupling_graph
@@ -0,0 +1,130 @@
+from concurrent.futures import ProcessPoolExecutor
+from networkx import Graph
+from pyquil import Program
+from sabre_tools.circuit_dag import CircuitDAG
+from sabre_tools.circuit_preprocess import get_compact_circuit_dag, get_initial_mapping, get_distance_matrix
+from sabre_tools.layout import Layout
+from sabre_tools.routing import route_dag_bidirectional
+from sabre_tools.sabre import SABRE
+from typing import Callable, Union
+
+import os
+import time
+import numpy as np
+
+trial_worker_state = dict()
+
+class TrialResult():
+    def __init__(self, seed: int, initial_mapping: dict, final_program: Program, final_mapping: dict, runtime: float) -> None:
+        """Initialize the result of a single SABRE trial
+
+        Args:
+            seed (int): seed of the random initial mapping of the trial
+            initial_mapping (dict): logical to physical qubit mapping the routed program starts from
+            final_program (Program): program with SWAPs inserted by the last forward pass
+            final_mapping (dict): logical to physical qubit mapping after the routed program
+            runtime (float): wall clock time of the trial in seconds
+        """
+        self.seed = seed
+        self.initial_mapping = initial_mapping
+        self.final_program = final_program
+        self.final_mapping = final_mapping
+        self.runtime = runtime
+        self.cnot_count = None
+        self.cost = None
+
+def run_sabre_trials(circuit: Program, coupling_graph: Graph, num_trials: int = 8, seed: int = None, num_workers: int = None, cost_function: Callable = None) -> Union[TrialResult, list]:
+    """Runs independent forward-backward-forward SABRE trials from seeded random initial mappings across
+        a process pool and returns the trial with the lowest cost. The circuit, coupling graph and distance
+        matrix are sent once to every worker, which builds a single SABRE instance and circuit DAG, so tasks
+        only carry a seed
+
+    Args:
+        circuit (Program): input pyquil program
+        coupling_graph (Graph): coupling graph representing qubit connections
+        num_trials (int, optional): number of trials, at least 1. Defaults to 8
+        seed (int, optional): seed from which the seed of every trial is derived. Random if not given
+        num_workers (int, optional): number of worker processes. Trials run in the calling process if 1.
+                                    Defaults to the number of CPUs
+        cost_function (Callable, optional): function rating a routed Program, lower is better. Defaults to cnot_count
+
+    Returns:
+        Union[TrialResult, list]: the trial with the lowest cost and the results of all trials in seed order
+    """
+    if num_trials < 1:
+        raise ValueError("num_trials must be at least 1, got {}".format(num_trials))
+    distance_matrix = get_distance_matrix(coupling_graph)
+    sabre = SABRE(distance_matrix, coupling_graph)
+    trial_seeds = get_trial_seeds(num_trials, seed)
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = min(num_workers, num_trials)
+
+    if num_workers <= 1:
+        circuit_dag = get_compact_circuit_dag(circuit)
+        trial_results = [run_trial(sabre, circuit, circuit_dag, coupling_graph, trial_seed) for trial_seed in trial_seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=initialize_trial_worker, initargs=(circuit, coupling_graph, distance_matrix)) as executor:
+            trial_results = list(executor.map(run_trial_in_worker, trial_seeds))
+
+    if cost_function is None:
+        cost_function = sabre.cnot_count
+    for trial_result in trial_results:
+        trial_result.cnot_count = sabre.cnot_count(trial_result.final_program)
+        trial_result.cost = cost_function(trial_result.final_program)
+    best_trial_result = min(trial_results, key=lambda trial_result: trial_result.cost)
+    return best_trial_result, trial_results
+
+def get_trial_seeds(num_trials: int, seed: int = None) -> list:
+    """Derives a deterministic seed for every trial from a single seed
+
+    Args:
+        num_trials (int): number of trials
+        seed (int, optional): seed from which the trial seeds are derived. Random if not given
+
+    Returns:
+        list: seed of every trial
+    """
+    return np.random.SeedSequence(seed).generate_state(num_trials).tolist()
+
+def run_trial(sabre: SABRE, circuit: Program, circuit_dag: CircuitDAG, coupling_graph: Graph, seed: int) -> TrialResult:
+    """Routes the circuit with forward, backward and forward SABRE passes starting from a seeded random
+        initial mapping. The final mapping of each pass is the initial mapping of the next one
+
+    Args:
+        sabre (SABRE): SABRE instance of the device
+        circuit (Program): input pyquil program
+        circuit_dag (CircuitDAG): compact DAG of the input program
+        coupling_graph (Graph): coupling graph representing qubit connections
+        seed (int): seed of the random initial mapping
+
+    Returns:
+        TrialResult: routed program of the last forward pass and its mappings
+    """
+    start_time = time.perf_counter()
+    initial_mapping = get_initial_mapping(circuit, coupling_graph, seed=seed)
+    layout = Layout.from_mapping(initial_mapping, len(sabre.adjacency_bitmap))
+    routed_schedule, pass_layout = route_dag_bidirectional(sabre, circuit_dag, layout, passes=3)
+    final_program = sabre.emit_program(routed_schedule, circuit_dag)
+    return TrialResult(seed, pass_layout.to_mapping(), final_program, layout.to_mapping(), time.perf_counter() - start_time)
+
+def initialize_trial_worker(circuit: Program, coupling_graph: Graph, distance_matrix: np.ndarray) -> None:
+    """Stores the data shared by all trials in a worker process
+
+    Args:
+        circuit (Program): input pyquil program
+        coupling_graph (Graph): coupling graph representing qubit connections
+        distance_matrix (np.ndarray): distance matrix of the coupling graph
+    """
+    trial_worker_state.update(circuit=circuit, circuit_dag=get_compact_circuit_dag(circuit), coupling_graph=coupling_graph, sabre=SABRE(distance_matrix, coupling_graph))
+
+def run_trial_in_worker(seed: int) -> TrialResult:
+    """Runs a trial in a worker process initialized by initialize_trial_worker
+
+    Args:
+        seed (int): seed of the random initial mapping
+
+    Returns:
+        TrialResult: routed program of the last forward pass and its mappings
+    """
+    return run_trial(trial_worker_state['sabre'], trial_worker_state['circuit'], trial_worker_state['circuit_dag'], trial_worker_state['coupling_graph'], seed)
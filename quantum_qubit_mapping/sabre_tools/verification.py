@@ -0,0 +1,209 @@
+from sabre_tools.circuit_dag import NO_QUBIT
+from sabre_tools.layout import UNMAPPED
+from typing import TYPE_CHECKING, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pyquil import Program
+
+OTHER_OPERATION = 0
+CNOT_OPERATION = 1
+SWAP_OPERATION = 2
+MULTI_QUBIT_OPERATION = 3
+OPERATION_CODES = {'CNOT': CNOT_OPERATION, 'SWAP': SWAP_OPERATION}
+
+def get_instruction_arrays(instructions: list) -> Union[np.ndarray, np.ndarray]:
+    """Extracts the qubits and the kind of every instruction in a single pass, so that all further checks
+        work on NumPy arrays instead of pyquil objects
+
+    Args:
+        instructions (list): pyquil instructions
+
+    Returns:
+        Union[np.ndarray, np.ndarray]: (n, 2) array of the logical qubits of every instruction, padded with NO_QUBIT,
+                                        and the operation code of every instruction. Gates acting on more than 2
+                                        qubits keep their first 2 qubits and get MULTI_QUBIT_OPERATION
+    """
+    from sabre_tools.circuit_preprocess import get_instruction_qubits
+    num_instructions = len(instructions)
+    flat_positions = list()
+    flat_qubits = list()
+    operation_codes = get_operation_codes(instructions)
+    for index, instruction in enumerate(instructions):
+        qubits = get_instruction_qubits(instruction)
+        if len(qubits) > 2:
+            operation_codes[index] = MULTI_QUBIT_OPERATION
+        for position, qubit in enumerate(qubits[:2]):
+            flat_positions.append(2 * index + position)
+            flat_qubits.append(qubit)
+    gate_qubits = np.full((num_instructions, 2), NO_QUBIT, dtype=np.int64)
+    gate_qubits.reshape(-1)[flat_positions] = flat_qubits
+    return gate_qubits, operation_codes
+
+def get_operation_codes(instructions: list) -> np.ndarray:
+    """Classifies every instruction as CNOT, SWAP or other operation
+
+    Args:
+        instructions (list): pyquil instructions
+
+    Returns:
+        np.ndarray: operation code of every instruction
+    """
+    return np.fromiter((OPERATION_CODES.get(getattr(instruction, 'name', None), OTHER_OPERATION) for instruction in instructions),
+                       dtype=np.int8, count=len(instructions))
+
+def get_physical_gate_qubits(gate_qubits: np.ndarray, operation_codes: np.ndarray, qubit_mapping: dict) -> Union[np.ndarray, dict]:
+    """Computes the physical qubits every instruction acts on when the program starts from the given mapping.
+        Only SWAPs are replayed one by one; the physical qubit of every other operand is looked up with a binary
+        search for the last SWAP that moved its logical qubit
+
+    Args:
+        gate_qubits (np.ndarray): logical qubits of every instruction as returned by get_instruction_arrays
+        operation_codes (np.ndarray): operation code of every instruction
+        qubit_mapping (dict): logical to physical qubit mapping the program starts from
+
+    Returns:
+        Union[np.ndarray, dict]: physical qubits of every instruction, UNMAPPED for missing and unmapped qubits, and
+                                the logical to physical qubit mapping after the program
+    """
+    num_instructions = len(gate_qubits)
+    num_logical_qubits = max(max(qubit_mapping, default=-1), int(gate_qubits.max(initial=-1))) + 1
+    logical_to_physical = [UNMAPPED] * num_logical_qubits
+    for logical_qubit, physical_qubit in qubit_mapping.items():
+        logical_to_physical[logical_qubit] = physical_qubit
+    initial_physical_qubits = np.array(logical_to_physical, dtype=np.int64)
+
+    swap_indices = np.flatnonzero(operation_codes == SWAP_OPERATION)
+    event_qubits = list()
+    event_physical_qubits = list()
+    for logical_qubit_1, logical_qubit_2 in gate_qubits[swap_indices].tolist():
+        logical_to_physical[logical_qubit_1], logical_to_physical[logical_qubit_2] = logical_to_physical[logical_qubit_2], logical_to_physical[logical_qubit_1]
+        event_qubits.extend((logical_qubit_1, logical_qubit_2))
+        event_physical_qubits.extend((logical_to_physical[logical_qubit_1], logical_to_physical[logical_qubit_2]))
+
+    event_keys = np.asarray(event_qubits, dtype=np.int64) * (num_instructions + 1) + np.repeat(swap_indices, 2)
+    event_order = np.argsort(event_keys, kind='stable')
+    event_keys = event_keys[event_order]
+    event_physical_qubits = np.asarray(event_physical_qubits, dtype=np.int64)[event_order]
+
+    physical_gate_qubits = np.full(gate_qubits.shape, UNMAPPED, dtype=np.int64)
+    operand_mask = gate_qubits != NO_QUBIT
+    operand_qubits = gate_qubits[operand_mask]
+    operand_times = np.broadcast_to(np.arange(num_instructions)[:, None], gate_qubits.shape)[operand_mask]
+    operand_keys = operand_qubits * (num_instructions + 1) + operand_times
+    last_events = np.searchsorted(event_keys, operand_keys, side='left') - 1
+    operands_after_swaps = np.flatnonzero(last_events >= 0)
+    same_qubit = event_keys[last_events[operands_after_swaps]] // (num_instructions + 1) == operand_qubits[operands_after_swaps]
+    moved_operands = operands_after_swaps[same_qubit]
+    operand_physical_qubits = initial_physical_qubits[operand_qubits]
+    operand_physical_qubits[moved_operands] = event_physical_qubits[last_events[moved_operands]]
+    physical_gate_qubits[operand_mask] = operand_physical_qubits
+    final_mapping = {logical_qubit: physical_qubit for logical_qubit, physical_qubit in enumerate(logical_to_physical) if physical_qubit != UNMAPPED}
+    return physical_gate_qubits, final_mapping
+
+def find_forbidden_gates(circuit: 'Program', qubit_mapping: dict, adjacency_bitmap: np.ndarray) -> dict:
+    """Finds the 2-qubit gates of a routed program that act on physical qubits which are not connected
+
+    Args:
+        circuit (Program): routed pyquil program
+        qubit_mapping (dict): logical to physical qubit mapping the program starts from
+        adjacency_bitmap (np.ndarray): boolean adjacency matrix of the coupling graph
+
+    Returns:
+        dict: every non-executable instruction and the physical qubits it acts on, empty if all gates are executable
+    """
+    instructions = circuit.instructions
+    gate_qubits, operation_codes = get_instruction_arrays(instructions)
+    physical_gate_qubits, _ = get_physical_gate_qubits(gate_qubits, operation_codes, qubit_mapping)
+    return get_forbidden_gates(instructions, gate_qubits, operation_codes, physical_gate_qubits, adjacency_bitmap)
+
+def get_forbidden_gates(instructions: list, gate_qubits: np.ndarray, operation_codes: np.ndarray, physical_gate_qubits: np.ndarray, adjacency_bitmap: np.ndarray) -> dict:
+    """Checks the physical qubits of all 2-qubit instructions against the adjacency bitmap at once
+
+    Args:
+        instructions (list): pyquil instructions
+        gate_qubits (np.ndarray): logical qubits of every instruction
+        operation_codes (np.ndarray): operation code of every instruction
+        physical_gate_qubits (np.ndarray): physical qubits of every instruction
+        adjacency_bitmap (np.ndarray): boolean adjacency matrix of the coupling graph
+
+    Returns:
+        dict: every non-executable instruction and the physical qubits it acts on. Unmapped qubits are None. As the
+                mapping is updated before a SWAP is checked, SWAPs report the physical qubits of their logical qubits
+                after the SWAP. Gates acting on more than 2 qubits are never executable on the coupling graph and
+                report the physical qubits of their first 2 qubits
+    """
+    two_qubit_indices = np.flatnonzero(gate_qubits[:, 1] != NO_QUBIT)
+    physical_qubits_1, physical_qubits_2 = physical_gate_qubits[two_qubit_indices].T
+    is_mapped = (physical_qubits_1 != UNMAPPED) & (physical_qubits_2 != UNMAPPED)
+    is_mapped &= operation_codes[two_qubit_indices] != MULTI_QUBIT_OPERATION
+    is_executable = np.zeros(len(two_qubit_indices), dtype=bool)
+    is_executable[is_mapped] = adjacency_bitmap[physical_qubits_1[is_mapped], physical_qubits_2[is_mapped]]
+    forbidden_gates = dict()
+    for index in two_qubit_indices[~is_executable].tolist():
+        physical_qubit_1, physical_qubit_2 = physical_gate_qubits[index].tolist()
+        if operation_codes[index] == SWAP_OPERATION:
+            physical_qubit_1, physical_qubit_2 = physical_qubit_2, physical_qubit_1
+        forbidden_gates[instructions[index]] = (None if physical_qubit_1 == UNMAPPED else physical_qubit_1, None if physical_qubit_2 == UNMAPPED else physical_qubit_2)
+    return forbidden_gates
+
+def get_cnot_count(operation_codes: np.ndarray) -> int:
+    """Counts CNOTs, where every SWAP counts as the 3 CNOTs it is decomposed into
+
+    Args:
+        operation_codes (np.ndarray): operation code of every instruction
+
+    Returns:
+        int: number of CNOT gates
+    """
+    return int(np.count_nonzero(operation_codes == CNOT_OPERATION) + 3 * np.count_nonzero(operation_codes == SWAP_OPERATION))
+
+def get_circuit_depth(gate_qubits: np.ndarray) -> int:
+    """Computes the number of layers of the program when every instruction is scheduled as soon as the
+        instructions before it on its qubits have finished. Instructions without qubits are not counted and gates
+        acting on more than 2 qubits only wait for their first 2 qubits. Each layer depends on the one before, so
+        the instructions are scheduled one by one
+
+    Args:
+        gate_qubits (np.ndarray): logical qubits of every instruction
+
+    Returns:
+        int: circuit depth
+    """
+    qubit_depths = dict()
+    for logical_qubit_1, logical_qubit_2 in gate_qubits.tolist():
+        if logical_qubit_1 == NO_QUBIT:
+            continue
+        if logical_qubit_2 == NO_QUBIT:
+            qubit_depths[logical_qubit_1] = qubit_depths.get(logical_qubit_1, 0) + 1
+        else:
+            gate_depth = max(qubit_depths.get(logical_qubit_1, 0), qubit_depths.get(logical_qubit_2, 0)) + 1
+            qubit_depths[logical_qubit_1] = qubit_depths[logical_qubit_2] = gate_depth
+    return max(qubit_depths.values(), default=0)
+
+def verify_routed_program(circuit: 'Program', qubit_mapping: dict, adjacency_bitmap: np.ndarray) -> Union[dict, dict]:
+    """Validates a routed program and computes its cost metrics from a single extraction of its instructions.
+        The check is only partly vectorized: the connectivity check, the operand lookup and the counts work on whole
+        NumPy arrays, but the SWAPs are replayed and the depth is computed in Python loops, as each SWAP and each
+        layer depends on the ones before. Its cost therefore still grows with the number of SWAPs and instructions
+
+    Args:
+        circuit (Program): routed pyquil program
+        qubit_mapping (dict): logical to physical qubit mapping the program starts from
+        adjacency_bitmap (np.ndarray): boolean adjacency matrix of the coupling graph
+
+    Returns:
+        Union[dict, dict]: non-executable instructions with their physical qubits as returned by find_forbidden_gates,
+                            and the cnot_count, swap_count, depth and final mapping of the program
+    """
+    instructions = circuit.instructions
+    gate_qubits, operation_codes = get_instruction_arrays(instructions)
+    physical_gate_qubits, final_mapping = get_physical_gate_qubits(gate_qubits, operation_codes, qubit_mapping)
+    metrics = {
+        'cnot_count': get_cnot_count(operation_codes),
+        'swap_count': int(np.count_nonzero(operation_codes == SWAP_OPERATION)),
+        'depth': get_circuit_depth(gate_qubits),
+        'final_mapping': final_mapping,
+    }
+    return get_forbidden_gates(instructions, gate_qubits, operation_codes, physical_gate_qubits, adjacency_bitmap), metrics
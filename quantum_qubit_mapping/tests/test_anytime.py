@@ -0,0 +1,49 @@
+from benchmarks.circuits import random_cnot_circuit
+from pyquil import Program
+from pyquil.gates import CNOT
+from sabre_tools.anytime import route_anytime
+from sabre_tools.circuit_preprocess import get_distance_matrix
+from sabre_tools.sabre import SABRE
+from sabre_tools.topologies import get_topology
+
+def get_grid_sabre():
+    coupling_graph = get_topology('grid:3x3')
+    return coupling_graph, SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+
+def test_best_result_never_gets_worse_with_more_trials():
+    coupling_graph, sabre = get_grid_sabre()
+    circuit = random_cnot_circuit(9, 80, seed=2)
+    swaps_inserted = list()
+    for max_trials in range(1, 6):
+        anytime_result = route_anytime(circuit, coupling_graph, time_budget=60.0, seed=4, max_trials=max_trials, sabre=sabre)
+        assert anytime_result.trials_completed == max_trials
+        assert not anytime_result.deadline_reached
+        assert not sabre.rewiring_correctness(anytime_result.final_program, anytime_result.initial_mapping)
+        assert sabre.cnot_count(anytime_result.final_program) == 80 + 3 * anytime_result.swaps_inserted
+        swaps_inserted.append(anytime_result.swaps_inserted)
+    assert swaps_inserted == sorted(swaps_inserted, reverse=True)
+
+def test_trials_stop_at_the_deadline():
+    coupling_graph, sabre = get_grid_sabre()
+    anytime_result = route_anytime(random_cnot_circuit(9, 80, seed=2), coupling_graph, time_budget=0.3, seed=4, sabre=sabre)
+    assert anytime_result.deadline_reached
+    assert anytime_result.trials_completed >= 1
+    assert anytime_result.first_result_seconds <= anytime_result.elapsed_seconds
+    assert not sabre.rewiring_correctness(anytime_result.final_program, anytime_result.initial_mapping)
+
+def test_tiny_budget_still_returns_a_routed_program_after_one_pass():
+    coupling_graph, sabre = get_grid_sabre()
+    anytime_result = route_anytime(random_cnot_circuit(9, 200, seed=5), coupling_graph, time_budget=0.0, seed=1, sabre=sabre)
+    assert anytime_result.deadline_reached
+    assert anytime_result.passes_completed == 1
+    assert anytime_result.trials_completed == 0
+    assert anytime_result.budget_overrun_seconds == anytime_result.elapsed_seconds
+    assert not sabre.rewiring_correctness(anytime_result.final_program, anytime_result.initial_mapping)
+
+def test_circuits_that_fit_the_device_are_returned_unrouted():
+    coupling_graph, sabre = get_grid_sabre()
+    circuit = Program(CNOT(0, 1), CNOT(1, 2))
+    anytime_result = route_anytime(circuit, coupling_graph, time_budget=1.0, sabre=sabre)
+    assert anytime_result.final_program == circuit
+    assert anytime_result.swaps_inserted == 0
+    assert not sabre.rewiring_correctness(circuit, anytime_result.initial_mapping)
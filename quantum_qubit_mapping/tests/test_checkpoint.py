@@ -0,0 +1,50 @@
+from benchmarks.circuits import random_cnot_circuit
+from pyquil import Program
+from pyquil.gates import CNOT
+from sabre_tools.checkpoint import reroute_edited_program, route_program_with_checkpoints
+from sabre_tools.circuit_preprocess import get_distance_matrix, get_instruction_qubits
+from sabre_tools.sabre import SABRE
+from sabre_tools.topologies import get_topology
+
+import pytest
+
+def get_qubit_orders(instructions: list) -> dict:
+    qubit_orders = dict()
+    for instruction in instructions:
+        if instruction.name == 'SWAP':
+            continue
+        for qubit in get_instruction_qubits(instruction):
+            qubit_orders.setdefault(qubit, list()).append(instruction)
+    return qubit_orders
+
+def assert_valid_routing(sabre: SABRE, circuit: Program, routed_program: Program, initial_mapping: dict) -> None:
+    assert not sabre.rewiring_correctness(routed_program, initial_mapping)
+    assert get_qubit_orders(routed_program.instructions) == get_qubit_orders(circuit.instructions)
+
+@pytest.fixture
+def sabre() -> SABRE:
+    coupling_graph = get_topology('grid:3x4')
+    return SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+
+def test_rerouting_an_edited_suffix_gives_a_valid_routing(sabre):
+    circuit = random_cnot_circuit(10, 400, seed=1)
+    qubit_mapping = {qubit: qubit for qubit in range(10)}
+    routed_program, checkpointed_routing = route_program_with_checkpoints(sabre, circuit, qubit_mapping, checkpoint_interval=50)
+    assert_valid_routing(sabre, circuit, routed_program, checkpointed_routing.initial_mapping)
+    assert len(checkpointed_routing.checkpoints) > 2
+
+    for edit_seed in range(3):
+        edited_circuit = Program(circuit.instructions[:300]) + random_cnot_circuit(10, 150, seed=10 + edit_seed)
+        edited_program, edited_routing = reroute_edited_program(sabre, checkpointed_routing, edited_circuit, checkpoint_interval=50)
+        assert_valid_routing(sabre, edited_circuit, edited_program, edited_routing.initial_mapping)
+        checkpointed_routing, circuit = edited_routing, edited_circuit
+
+def test_edited_program_may_use_padded_qubits(sabre):
+    circuit = random_cnot_circuit(4, 40, seed=2)
+    routed_program, checkpointed_routing = route_program_with_checkpoints(sabre, circuit, {0: 0, 1: 5, 2: 6, 3: 11}, checkpoint_interval=10)
+    edited_circuit = circuit + Program(CNOT(3, 7))
+    edited_program, edited_routing = reroute_edited_program(sabre, checkpointed_routing, edited_circuit, checkpoint_interval=10)
+    assert_valid_routing(sabre, edited_circuit, edited_program, edited_routing.initial_mapping)
+
+    with pytest.raises(ValueError, match="not mapped"):
+        reroute_edited_program(sabre, checkpointed_routing, circuit + Program(CNOT(0, 12)))
@@ -0,0 +1,65 @@
+from pyquil import Program
+from pyquil.gates import CNOT, CZ, H, X
+from sabre_tools.circuit_preprocess import create_dag, get_compact_circuit_dag, get_dag_mapping
+
+import numpy as np
+import pytest
+
+# both DAG builders call the deprecated Gate.get_qubits of pyquil 4 on every instruction
+pytestmark = pytest.mark.filterwarnings('ignore:Call to deprecated method get_qubits:DeprecationWarning')
+
+def get_quadratic_dag_mapping(instructions: list) -> dict:
+    """Reference implementation of get_dag_mapping before the single pass rewrite, which scans all previous
+        instructions for every qubit of every 2 qubit gate
+    """
+    circuit_dag_mapping = dict()
+    for curr_gate_index, curr_gate in enumerate(instructions):
+        curr_gate_qubits = list(curr_gate.get_qubits())
+        if len(curr_gate_qubits) == 2:
+            for curr_gate_qubit in curr_gate_qubits:
+                for prev_gate_index, prev_gate in enumerate(instructions[:curr_gate_index]):
+                    if curr_gate_qubit in prev_gate.get_qubits():
+                        circuit_dag_mapping.update({(curr_gate_qubit, curr_gate_index, curr_gate): (prev_gate_index, prev_gate)})
+    return circuit_dag_mapping
+
+def get_random_circuit(num_qubits: int, num_gates: int, seed: int, single_qubit_gates: bool = True) -> Program:
+    rng = np.random.default_rng(seed)
+    circuit = Program()
+    for _ in range(num_gates):
+        if single_qubit_gates and rng.random() < 0.3:
+            circuit += (H if rng.random() < 0.5 else X)(int(rng.integers(num_qubits)))
+        else:
+            control_qubit, target_qubit = rng.choice(num_qubits, 2, replace=False).tolist()
+            circuit += (CNOT if rng.random() < 0.7 else CZ)(control_qubit, target_qubit)
+    return circuit
+
+def get_edge_set(circuit_dag) -> set:
+    return {(u_index, v_index) for (_, u_index), (_, v_index) in circuit_dag.edges()}
+
+@pytest.mark.parametrize('seed', range(20))
+def test_single_pass_dag_has_the_edges_of_the_quadratic_dag(seed):
+    circuit = get_random_circuit(num_qubits=2 + seed % 5, num_gates=5 + 3 * seed, seed=seed)
+    quadratic_dag = create_dag(get_quadratic_dag_mapping(circuit.instructions))
+    single_pass_dag = create_dag(get_dag_mapping(circuit.instructions))
+    assert get_edge_set(single_pass_dag) == get_edge_set(quadratic_dag)
+
+@pytest.mark.parametrize('seed', range(20))
+def test_compact_dag_has_the_edges_of_the_quadratic_dag(seed):
+    circuit = get_random_circuit(num_qubits=2 + seed % 5, num_gates=5 + 3 * seed, seed=seed, single_qubit_gates=False)
+    quadratic_dag = create_dag(get_quadratic_dag_mapping(circuit.instructions))
+    compact_dag = get_compact_circuit_dag(circuit)
+    compact_edges = {(gate_id, successor_id) for gate_id in range(compact_dag.num_gates) for successor_id in compact_dag.successors(gate_id).tolist()}
+    assert compact_edges == get_edge_set(quadratic_dag)
+
+@pytest.mark.parametrize('seed', range(10))
+def test_reversed_dag_is_the_dag_of_the_reversed_circuit(seed):
+    circuit = get_random_circuit(num_qubits=2 + seed % 5, num_gates=5 + 3 * seed, seed=seed)
+    circuit_dag = get_compact_circuit_dag(circuit)
+    rebuilt_dag = get_compact_circuit_dag(Program(list(reversed(circuit.instructions))))
+    reversed_dag = circuit_dag.reverse()
+    np.testing.assert_array_equal(reversed_dag.gate_qubits, rebuilt_dag.gate_qubits)
+    np.testing.assert_array_equal(reversed_dag.successor_offsets, rebuilt_dag.successor_offsets)
+    np.testing.assert_array_equal(reversed_dag.successor_indices, rebuilt_dag.successor_indices)
+    assert reversed_dag.front_layer() == rebuilt_dag.front_layer()
+    assert list(reversed_dag.instructions) == list(rebuilt_dag.instructions)
+    assert reversed_dag.reverse() is circuit_dag
@@ -0,0 +1,90 @@
+from pyquil import Program
+from sabre_tools.circuit_preprocess import get_distance_matrix
+from sabre_tools.cli import find_quil_files, get_output_paths, main
+from sabre_tools.sabre import SABRE
+from sabre_tools.topologies import get_topology, read_edge_list
+
+import json
+import os
+import pytest
+
+CIRCUIT_QUIL = "H 0\nCNOT 0 2\nCNOT 1 3\nCNOT 0 3\nCNOT 2 1\n"
+
+def write_circuit_library(root) -> list:
+    quil_file_paths = [root / 'a' / 'circuit.quil', root / 'b' / 'circuit.quil', root / 'b' / 'nested' / 'other.quil']
+    for quil_file_path in quil_file_paths:
+        quil_file_path.parent.mkdir(parents=True, exist_ok=True)
+        quil_file_path.write_text(CIRCUIT_QUIL)
+    (root / 'b' / 'notes.txt').write_text("not a circuit")
+    return [str(quil_file_path) for quil_file_path in quil_file_paths]
+
+def test_find_quil_files_expands_directories_and_patterns(tmp_path):
+    quil_file_paths = write_circuit_library(tmp_path)
+    assert find_quil_files([str(tmp_path)]) == sorted(quil_file_paths)
+    assert find_quil_files([str(tmp_path / 'b'), str(tmp_path / '*' / 'circuit.quil')]) == sorted(quil_file_paths)
+    assert find_quil_files([str(tmp_path / 'a' / 'circuit.quil'), str(tmp_path / 'missing')]) == [quil_file_paths[0]]
+
+def test_output_paths_keep_the_input_directory_structure(tmp_path):
+    output_paths = get_output_paths(str(tmp_path / 'b' / 'nested' / 'other.quil'), str(tmp_path), 'routed')
+    assert output_paths == {'routed_quil': os.path.join('routed', 'b', 'nested', 'other.routed.quil'),
+                            'mapping': os.path.join('routed', 'b', 'nested', 'other.mapping.json')}
+
+def test_main_routes_a_library_and_writes_the_summary(tmp_path):
+    quil_file_paths = write_circuit_library(tmp_path / 'circuits')
+    output_dir = tmp_path / 'routed'
+    main([str(tmp_path / 'circuits'), '--topology', 'line:4', '--output-dir', str(output_dir), '--seed', '3', '--workers', '1'])
+
+    summary = json.loads((output_dir / 'summary.json').read_text())
+    assert (summary['coupling_graph'], summary['seed'], summary['strategy']) == ('line:4', 3, 'decay')
+    assert [file_summary['file'] for file_summary in summary['files']] == sorted(quil_file_paths)
+    coupling_graph = get_topology('line:4')
+    sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+    for file_summary in summary['files']:
+        assert file_summary['status'] == 'ok'
+        assert file_summary['input_cnot_count'] == 4
+        assert file_summary['cnot_count'] == 4 + 3 * file_summary['swaps_inserted']
+        with open(file_summary['mapping']) as mapping_file:
+            initial_mapping = {int(logical_qubit): physical_qubit for logical_qubit, physical_qubit in json.load(mapping_file)['initial_mapping'].items()}
+        with open(file_summary['routed_quil']) as routed_quil_file:
+            assert not sabre.rewiring_correctness(Program(routed_quil_file.read()), initial_mapping)
+    assert (output_dir / 'a' / 'circuit.routed.quil').is_file() and (output_dir / 'b' / 'circuit.routed.quil').is_file()
+
+    pooled_output_dir = tmp_path / 'pooled'
+    main([str(tmp_path / 'circuits'), '--topology', 'line:4', '--output-dir', str(pooled_output_dir), '--seed', '3', '--workers', '2'])
+    for quil_file_name in ('a/circuit.routed.quil', 'b/nested/other.routed.quil'):
+        assert (pooled_output_dir / quil_file_name).read_text() == (output_dir / quil_file_name).read_text()
+
+def test_main_exits_with_status_1_if_a_file_fails(tmp_path):
+    write_circuit_library(tmp_path / 'circuits')
+    (tmp_path / 'circuits' / 'broken.quil').write_text("CNOT 0 1 (\n")
+    output_dir = tmp_path / 'routed'
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(tmp_path / 'circuits'), '--topology', 'line:4', '--output-dir', str(output_dir), '--workers', '1'])
+    assert exit_info.value.code == 1
+
+    file_summaries = {os.path.relpath(file_summary['file'], tmp_path / 'circuits'): file_summary for file_summary in json.loads((output_dir / 'summary.json').read_text())['files']}
+    assert file_summaries['broken.quil']['status'] == 'error'
+    assert not os.path.exists(file_summaries['broken.quil']['routed_quil'])
+    assert [file_summary['status'] for name, file_summary in file_summaries.items() if name != 'broken.quil'] == ['ok'] * 3
+
+def test_main_rejects_missing_inputs_and_invalid_coupling_graphs(tmp_path):
+    write_circuit_library(tmp_path / 'circuits')
+    edge_list_path = tmp_path / 'edges.txt'
+    edge_list_path.write_text("0 1\n1 3\n")
+    for argv in ([str(tmp_path / 'nothing_here'), '--topology', 'line:4'],
+                 [str(tmp_path / 'circuits'), '--topology', 'grid:4'],
+                 [str(tmp_path / 'circuits'), '--edge-list', str(edge_list_path)],
+                 [str(tmp_path / 'circuits'), '--topology', 'line:4', '--strategy', 'foo']):
+        with pytest.raises(SystemExit) as exit_info:
+            main(argv + ['--output-dir', str(tmp_path / 'routed')])
+        assert exit_info.value.code == 2
+    assert not (tmp_path / 'routed').exists()
+
+def test_edge_lists_must_number_physical_qubits_from_0(tmp_path):
+    edge_list_path = tmp_path / 'edges.txt'
+    edge_list_path.write_text("# device\n0, 1\n1 2  # coupler\n\n2 0\n")
+    assert sorted(read_edge_list(str(edge_list_path)).edges()) == [(0, 1), (0, 2), (1, 2)]
+    for edge_list in ("1 2\n2 3\n", "0 1\n1 5\n", "", "0 1 2\n"):
+        edge_list_path.write_text(edge_list)
+        with pytest.raises(ValueError):
+            read_edge_list(str(edge_list_path))
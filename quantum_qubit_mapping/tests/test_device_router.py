@@ -0,0 +1,24 @@
+from benchmarks.circuits import random_cnot_circuit
+from sabre_tools.device_router import DeviceRouter
+from sabre_tools.routing import route_bidirectional
+from sabre_tools.topologies import get_topology
+
+def test_route_matches_route_bidirectional_for_the_same_seed():
+    coupling_graph = get_topology('grid:3x3')
+    router = DeviceRouter(coupling_graph, passes=3)
+    circuit = random_cnot_circuit(6, 60, seed=3)
+
+    routing_result = router.route(circuit, seed=7)
+    final_program, last_pass_mapping, final_mapping = route_bidirectional(circuit, coupling_graph, passes=3, seed=7, sabre=router.sabre)
+    assert routing_result.initial_mapping == last_pass_mapping
+    assert routing_result.final_mapping == final_mapping
+    assert routing_result.final_program == final_program
+    assert not router.sabre.rewiring_correctness(routing_result.final_program, routing_result.initial_mapping)
+
+def test_route_circuits_gives_the_same_results_with_workers():
+    router = DeviceRouter(get_topology('ring:8'))
+    circuits = [random_cnot_circuit(8, 40, seed=circuit_seed) for circuit_seed in range(4)]
+    serial_results = list(router.route_circuits(circuits, seed=1))
+    pool_results = list(router.route_circuits(circuits, seed=1, num_workers=2, chunk_size=1))
+    assert [result.final_program for result in serial_results] == [result.final_program for result in pool_results]
+    assert [result.initial_mapping for result in serial_results] == [result.initial_mapping for result in pool_results]
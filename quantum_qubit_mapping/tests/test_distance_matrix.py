@@ -0,0 +1,73 @@
+from sabre_tools.coupling_map import CouplingMap
+from sabre_tools.distance_matrix import DistanceMatrixCache, compute_distance_matrix, get_coupling_graph_fingerprint, get_unreachable_distance
+from sabre_tools.sabre import SABRE
+
+import networkx as nx
+import numpy as np
+import os
+import pytest
+import subprocess
+import sys
+
+def test_unreachable_pairs_hold_the_unreachable_distance():
+    coupling_map = CouplingMap([(0, 1), (1, 2), (3, 4)])
+    distance_matrix = compute_distance_matrix(coupling_map)
+    unreachable_distance = get_unreachable_distance(distance_matrix)
+    assert distance_matrix[0, 2] == 2
+    assert distance_matrix[0, 3] == unreachable_distance
+    assert unreachable_distance > distance_matrix[distance_matrix != unreachable_distance].max()
+    assert get_unreachable_distance(np.full((2, 2), np.inf)) == np.inf
+
+def test_routing_between_disconnected_qubits_raises():
+    coupling_map = CouplingMap([(0, 1), (2, 3)])
+    sabre = SABRE(compute_distance_matrix(coupling_map), coupling_map)
+    with pytest.raises(ValueError, match="not connected by any path"):
+        sabre.route_gate_qubits([(0, 1)], {0: 0, 1: 2})
+
+def test_weighted_coupling_graphs_use_the_edge_weights():
+    coupling_graph = nx.Graph()
+    coupling_graph.add_edge(0, 1, weight=5)
+    coupling_graph.add_edge(1, 2, weight=1)
+    distance_matrix = compute_distance_matrix(coupling_graph)
+    assert distance_matrix[0].tolist() == [0, 5, 6]
+    np.testing.assert_array_equal(distance_matrix, nx.floyd_warshall_numpy(coupling_graph))
+
+    unweighted_graph = nx.path_graph(3)
+    assert get_coupling_graph_fingerprint(coupling_graph) != get_coupling_graph_fingerprint(unweighted_graph)
+    assert compute_distance_matrix(unweighted_graph)[0].tolist() == [0, 1, 2]
+
+def test_routing_on_a_weighted_coupling_graph():
+    coupling_graph = nx.Graph()
+    coupling_graph.add_weighted_edges_from([(0, 1, 1), (1, 2, 1), (2, 3, 1), (0, 4, 0.5), (4, 3, 0.5)])
+    distance_matrix = compute_distance_matrix(coupling_graph)
+    assert get_unreachable_distance(distance_matrix) == np.inf
+    sabre = SABRE(distance_matrix, coupling_graph, max_swaps_without_progress=1)
+    qubit_mapping = {qubit: qubit for qubit in range(5)}
+    routed_schedule, final_mapping = sabre.route_gate_qubits([(0, 3), (1, 3), (2, 4)], qubit_mapping)
+    assert [operation for operation in routed_schedule if not isinstance(operation, tuple)] == [0, 1, 2]
+
+def test_cache_hits_evicts_and_reloads_from_disk(tmp_path):
+    line_graph, ring_graph, grid_graph = nx.path_graph(4), nx.cycle_graph(4), nx.convert_node_labels_to_integers(nx.grid_2d_graph(2, 2))
+    distance_matrix_cache = DistanceMatrixCache(maxsize=2, cache_dir=str(tmp_path))
+    line_matrix = distance_matrix_cache.get_distance_matrix(line_graph)
+    assert not line_matrix.flags.writeable
+    assert distance_matrix_cache.get_distance_matrix(nx.path_graph(4)) is line_matrix
+    assert len(list(tmp_path.glob('distance_matrix_*.npy'))) == 1
+
+    distance_matrix_cache.get_distance_matrix(ring_graph)
+    distance_matrix_cache.get_distance_matrix(line_graph)
+    distance_matrix_cache.get_distance_matrix(grid_graph)
+    assert list(distance_matrix_cache.distance_matrices) == [get_coupling_graph_fingerprint(line_graph), get_coupling_graph_fingerprint(grid_graph)]
+
+    reloaded_matrix = DistanceMatrixCache(cache_dir=str(tmp_path)).get_distance_matrix(ring_graph)
+    assert isinstance(reloaded_matrix, np.memmap)
+    np.testing.assert_array_equal(reloaded_matrix, compute_distance_matrix(ring_graph))
+
+def test_cache_directory_is_read_from_the_environment(tmp_path):
+    environment = dict(os.environ, QUBIT_MAPPING_CACHE_DIR=str(tmp_path))
+    subprocess.run([sys.executable, '-c', 'from sabre_tools.coupling_map import CouplingMap; from sabre_tools.distance_matrix import default_distance_matrix_cache; '
+                    'default_distance_matrix_cache.get_distance_matrix(CouplingMap([(0, 1), (1, 2)]))'],
+                   env=environment, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), check=True)
+    cache_files = list(tmp_path.glob('distance_matrix_*.npy'))
+    assert len(cache_files) == 1
+    assert np.load(cache_files[0]).tolist() == [[0, 1, 2], [1, 0, 1], [2, 1, 0]]
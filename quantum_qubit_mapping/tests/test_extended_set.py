@@ -0,0 +1,66 @@
+from benchmarks.circuits import random_cnot_circuit
+from sabre_tools.circuit_dag import NO_QUBIT, build_circuit_dag
+from sabre_tools.circuit_preprocess import get_distance_matrix, get_initial_mapping
+from sabre_tools.extended_set import EXTENDED_SET_SIZE, ExtendedSet
+from sabre_tools.heuristic_function import create_extended_successor_set
+from sabre_tools.layout import Layout
+from sabre_tools.sabre import SABRE
+from sabre_tools.topologies import get_topology
+
+import numpy as np
+import pytest
+
+def get_random_circuit_dag(num_qubits: int, num_gates: int, seed: int):
+    rng = np.random.default_rng(seed)
+    gate_qubits = [tuple(rng.choice(num_qubits, 2, replace=False).tolist()) if rng.random() < 0.8 else (int(rng.integers(num_qubits)),)
+                   for _ in range(num_gates)]
+    return build_circuit_dag(gate_qubits)
+
+@pytest.mark.parametrize('size', [1, 3, EXTENDED_SET_SIZE])
+def test_window_holds_the_first_successors_of_the_front_layer(size):
+    circuit_dag = get_random_circuit_dag(num_qubits=12, num_gates=300, seed=size)
+    rng = np.random.default_rng(0)
+    extended_set = ExtendedSet(circuit_dag, size)
+    remaining_predecessors = circuit_dag.in_degree.copy()
+    front_layer = circuit_dag.front_layer()
+    for gate_id in front_layer:
+        extended_set.add_front_gate(gate_id)
+    while front_layer:
+        two_qubit_successors = {successor_id for gate_id in front_layer for successor_id in circuit_dag.successors(gate_id).tolist()
+                                if circuit_dag.gate_qubits[successor_id, 1] != NO_QUBIT}
+        extended_set_gates = extended_set.get_gates()
+        assert len(extended_set_gates) == min(size, len(two_qubit_successors))
+        assert set(extended_set_gates) <= two_qubit_successors
+
+        executed_gate_id = front_layer.pop(int(rng.integers(len(front_layer))))
+        extended_set.remove_front_gate(executed_gate_id)
+        for successor_id in circuit_dag.successors(executed_gate_id).tolist():
+            remaining_predecessors[successor_id] -= 1
+            if remaining_predecessors[successor_id] == 0:
+                front_layer.append(successor_id)
+                extended_set.add_front_gate(successor_id)
+    assert not extended_set.get_gates()
+
+def test_scalar_extended_set_has_the_same_size_limit():
+    circuit_dag = build_circuit_dag([(qubit, qubit + 1) for qubit in range(0, 60, 2)] + [(qubit, qubit + 1) for qubit in range(1, 59, 2)])
+    front_layer = circuit_dag.front_layer()
+    assert len(front_layer) == 30
+    assert len(create_extended_successor_set(front_layer, circuit_dag)) == EXTENDED_SET_SIZE
+    extended_set = ExtendedSet(circuit_dag)
+    for gate_id in front_layer:
+        extended_set.add_front_gate(gate_id)
+    assert len(extended_set.get_gates()) == EXTENDED_SET_SIZE
+
+@pytest.mark.parametrize('extended_set_size', [1, 5, EXTENDED_SET_SIZE])
+def test_routed_gates_follow_all_their_predecessors(extended_set_size):
+    coupling_graph = get_topology('grid:3x3')
+    sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph, extended_set_size=extended_set_size)
+    circuit = random_cnot_circuit(9, 150, seed=extended_set_size)
+    circuit_dag = sabre.build_circuit_dag(circuit)
+    layout = Layout.from_mapping(get_initial_mapping(circuit, coupling_graph, seed=1), 9)
+    routed_schedule = sabre.route_circuit_dag(circuit_dag.front_layer(), layout, circuit_dag)
+    gate_positions = {operation: position for position, operation in enumerate(routed_schedule) if not isinstance(operation, tuple)}
+    assert sorted(gate_positions) == list(range(circuit_dag.num_gates))
+    for gate_id in range(circuit_dag.num_gates):
+        for successor_id in circuit_dag.successors(gate_id).tolist():
+            assert gate_positions[gate_id] < gate_positions[successor_id]
@@ -0,0 +1,43 @@
+from sabre_tools.circuit_dag import build_circuit_dag
+from sabre_tools.circuit_preprocess import get_distance_matrix
+from sabre_tools.heuristic_function import batch_heuristic_function, heuristic_function
+from sabre_tools.layout import Layout
+
+import itertools
+import networkx as nx
+import numpy as np
+import pytest
+
+@pytest.mark.parametrize('seed', range(10))
+def test_batch_scores_match_the_scalar_heuristic(seed):
+    rng = np.random.default_rng(seed)
+    coupling_graph = nx.convert_node_labels_to_integers(nx.grid_2d_graph(3, 3))
+    distance_matrix = get_distance_matrix(coupling_graph)
+    num_qubits = coupling_graph.number_of_nodes()
+    circuit_dag = build_circuit_dag([tuple(rng.choice(num_qubits, 2, replace=False).tolist()) for _ in range(5 + 5 * seed)])
+    layout = Layout.from_mapping(dict(enumerate(rng.permutation(num_qubits).tolist())), num_qubits)
+    decay_parameter = (1 + rng.integers(0, 3, num_qubits) * 0.001).tolist()
+    front_layer_gates = circuit_dag.front_layer()
+    swap_candidates = list(itertools.combinations(range(num_qubits), 2))
+
+    batch_scores = batch_heuristic_function(front_layer_gates, circuit_dag, layout, distance_matrix, swap_candidates, decay_parameter)
+    scalar_scores = list()
+    for swap_qubits in swap_candidates:
+        swapped_layout = layout.copy()
+        swapped_layout.swap_logical_qubits(*swap_qubits)
+        scalar_scores.append(heuristic_function(front_layer_gates, circuit_dag, swapped_layout, distance_matrix, swap_qubits, decay_parameter))
+    np.testing.assert_allclose(batch_scores, scalar_scores)
+
+def test_batch_scores_without_candidates_are_empty():
+    coupling_graph = nx.path_graph(3)
+    circuit_dag = build_circuit_dag([(0, 2)])
+    layout = Layout.from_mapping({0: 0, 1: 1, 2: 2}, 3)
+    scores = batch_heuristic_function(circuit_dag.front_layer(), circuit_dag, layout, get_distance_matrix(coupling_graph), [], [1, 1, 1])
+    assert scores.shape == (0,)
+
+def test_batch_scores_without_front_layer_gates_use_the_extended_set_alone():
+    coupling_graph = nx.path_graph(3)
+    circuit_dag = build_circuit_dag([(0, 2)])
+    layout = Layout.from_mapping({0: 0, 1: 1, 2: 2}, 3)
+    scores = batch_heuristic_function([], circuit_dag, layout, get_distance_matrix(coupling_graph), [(0, 1), (1, 2)], [1, 1, 1], E=[0])
+    np.testing.assert_allclose(scores, [0.5, 0.5])
@@ -0,0 +1,39 @@
+from sabre_tools.circuit_dag import build_circuit_dag
+from sabre_tools.circuit_preprocess import get_distance_matrix
+from sabre_tools.instrumentation import ROUTING_PHASES
+from sabre_tools.layout import Layout
+from sabre_tools.sabre import SABRE
+
+import networkx as nx
+import numpy as np
+import time
+
+def test_routing_phases_and_counters_are_collected():
+    coupling_graph = nx.convert_node_labels_to_integers(nx.grid_2d_graph(3, 3))
+    sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph, collect_stats=True)
+    rng = np.random.default_rng(0)
+    circuit_dag = build_circuit_dag([tuple(rng.choice(9, 2, replace=False).tolist()) for _ in range(500)])
+    layout = Layout.from_mapping({qubit: qubit for qubit in range(9)}, 9)
+
+    routing_start = time.perf_counter()
+    routed_schedule = sabre.route_circuit_dag(circuit_dag.front_layer(), layout, circuit_dag)
+    routing_seconds = time.perf_counter() - routing_start
+
+    phase_seconds = sabre.stats.phase_seconds
+    assert tuple(phase_seconds) == ROUTING_PHASES
+    loop_phases = ('front_layer_update', 'candidate_generation', 'heuristic_scoring')
+    assert all(phase_seconds[phase] > 0 for phase in loop_phases)
+    assert phase_seconds['dag_build'] == phase_seconds['output_emission'] == 0
+    assert sum(phase_seconds[phase] for phase in loop_phases) <= routing_seconds
+
+    swaps_inserted = sum(1 for operation in routed_schedule if isinstance(operation, tuple))
+    assert sabre.stats.gates_executed == circuit_dag.num_gates
+    assert sabre.stats.swaps_inserted == swaps_inserted > 0
+    assert sabre.stats.iterations >= swaps_inserted
+    assert sabre.heuristic_evaluations == sabre.stats.candidates_scored > 0
+    assert sabre.stats.scoring_calls > 0
+    assert 0 < sabre.stats.max_extended_set_size <= sabre.extended_set_size
+
+    sabre.stats.reset()
+    assert sabre.stats.to_dict()['phase_seconds'] == dict.fromkeys(ROUTING_PHASES, 0.0)
+    assert sabre.stats.gates_executed == sabre.stats.candidates_scored == 0
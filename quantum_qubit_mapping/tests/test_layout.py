@@ -0,0 +1,41 @@
+from pyquil import Program
+from pyquil.gates import CNOT
+from sabre_tools.circuit_preprocess import get_compact_circuit_dag, get_distance_matrix
+from sabre_tools.layout import Layout, UNMAPPED, pad_mapping
+from sabre_tools.sabre import SABRE
+
+import networkx as nx
+import pytest
+
+def get_line_sabre(num_physical_qubits: int) -> SABRE:
+    coupling_graph = nx.path_graph(num_physical_qubits)
+    return SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+
+def test_pad_mapping_fills_missing_logical_qubits_then_ancillas():
+    assert pad_mapping({0: 0, 2: 3}, 5) == {0: 0, 2: 3, 1: 1, 3: 2, 4: 4}
+    assert pad_mapping({0: 1, 1: 0}, 2) == {0: 1, 1: 0}
+
+def test_layout_from_sparse_mapping_holds_a_logical_qubit_on_every_physical_qubit():
+    layout = Layout.from_mapping({0: 0, 1: 3}, 4)
+    assert UNMAPPED not in layout.physical_to_logical.tolist()
+    assert layout.to_mapping() == {0: 0, 1: 3, 2: 1, 3: 2}
+
+def test_sparse_mapping_with_only_empty_neighbours_is_routed():
+    sabre = get_line_sabre(4)
+    circuit = Program(CNOT(0, 1))
+    qubit_mapping = {0: 0, 1: 3}
+
+    circuit_dag = get_compact_circuit_dag(circuit)
+    routed_program, final_mapping = sabre.execute_sabre_algorithm(circuit_dag.front_layer(), qubit_mapping, circuit_dag)
+    assert not sabre.rewiring_correctness(routed_program, qubit_mapping)
+    # the qubits are 3 apart, so 2 SWAPs of 3 CNOTs each are needed
+    assert sabre.cnot_count(routed_program) == 1 + 2 * 3
+
+    routed_schedule, final_mapping = sabre.route_gate_qubits([(0, 1)], qubit_mapping)
+    assert routed_schedule[-1] == 0
+    assert abs(final_mapping[0] - final_mapping[1]) == 1
+
+def test_circuit_qubits_that_cannot_be_mapped_raise():
+    sabre = get_line_sabre(4)
+    with pytest.raises(ValueError, match=r"\[5\]"):
+        sabre.route_gate_qubits([(0, 5)], {0: 0, 9: 1})
@@ -0,0 +1,44 @@
+from pyquil import Program
+from pyquil.gates import CNOT, H
+from sabre_tools.circuit_preprocess import get_compact_circuit_dag, get_distance_matrix
+from sabre_tools.placement import find_embedding, get_initial_placement, get_interaction_graph
+from sabre_tools.routing import route_with_placement
+from sabre_tools.sabre import SABRE
+from sabre_tools.topologies import get_topology
+
+import networkx as nx
+import time
+
+def test_embeddable_circuit_is_returned_unchanged():
+    coupling_graph = get_topology('grid:3x3')
+    sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+    circuit = Program(H(0), CNOT(0, 1), CNOT(1, 2), CNOT(2, 3), CNOT(3, 0), CNOT(2, 4))
+    final_program, initial_mapping, final_mapping = route_with_placement(circuit, coupling_graph, sabre=sabre)
+    assert final_program == circuit
+    assert initial_mapping == final_mapping
+    assert not sabre.rewiring_correctness(final_program, initial_mapping)
+
+def test_non_embeddable_circuit_falls_back_to_greedy_placement():
+    coupling_graph = get_topology('line:4')
+    sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+    circuit = Program(CNOT(0, 1), CNOT(1, 2), CNOT(2, 0), CNOT(0, 3))
+    initial_mapping, is_executable = get_initial_placement(get_compact_circuit_dag(circuit), coupling_graph, sabre.distance_matrix)
+    assert not is_executable
+    assert sorted(initial_mapping) == [0, 1, 2, 3]
+    assert sorted(initial_mapping.values()) == [0, 1, 2, 3]
+
+    final_program, initial_mapping, final_mapping = route_with_placement(circuit, coupling_graph, sabre=sabre)
+    assert sabre.cnot_count(final_program) > 4
+    assert not sabre.rewiring_correctness(final_program, initial_mapping)
+
+def test_interaction_graph_counts_gates_between_qubits():
+    interaction_graph = get_interaction_graph(get_compact_circuit_dag(Program(CNOT(0, 1), CNOT(1, 0), H(2))))
+    assert sorted(interaction_graph.nodes()) == [0, 1, 2]
+    assert interaction_graph[0][1]['weight'] == 2
+
+def test_embedding_search_honours_the_time_budget():
+    # the grid is bipartite, so the odd cycle has no embedding, but the degree and size checks cannot tell
+    coupling_graph = get_topology('grid:6x6')
+    start_time = time.perf_counter()
+    assert find_embedding(nx.cycle_graph(15), coupling_graph, time_budget=0.05) is None
+    assert time.perf_counter() - start_time < 1.0
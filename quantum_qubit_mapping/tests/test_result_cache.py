@@ -0,0 +1,70 @@
+from pyquil import Program
+from pyquil.gates import CNOT, RZ
+from sabre_tools.circuit_preprocess import get_distance_matrix
+from sabre_tools.result_cache import CachedRouting, RoutingResultCache, get_routing_cache_key
+from sabre_tools.routing import route_bidirectional
+from sabre_tools.routing_strategy import get_routing_strategy
+from sabre_tools.sabre import SABRE
+from sabre_tools.topologies import get_topology
+
+def get_ansatz(angle: float) -> Program:
+    return Program(RZ(angle, 0), CNOT(0, 3), RZ(angle, 3), CNOT(1, 4), CNOT(2, 0), RZ(2 * angle, 4), CNOT(4, 3))
+
+def get_line_sabre(routing_strategy=None):
+    coupling_graph = get_topology('line:5')
+    return coupling_graph, SABRE(get_distance_matrix(coupling_graph), coupling_graph, routing_strategy=routing_strategy)
+
+def test_new_angles_hit_the_cached_schedule():
+    coupling_graph, sabre = get_line_sabre()
+    cache = RoutingResultCache()
+    route_bidirectional(get_ansatz(0.1), coupling_graph, seed=3, sabre=sabre, cache=cache)
+    cached_program, cached_initial_mapping, cached_final_mapping = route_bidirectional(get_ansatz(0.7), coupling_graph, seed=3, sabre=sabre, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (cached_program, cached_initial_mapping, cached_final_mapping) == route_bidirectional(get_ansatz(0.7), coupling_graph, seed=3, sabre=sabre)
+    assert not sabre.rewiring_correctness(cached_program, cached_initial_mapping)
+
+def test_other_mappings_seeds_and_strategies_miss():
+    coupling_graph, sabre = get_line_sabre()
+    cache = RoutingResultCache()
+    route_bidirectional(get_ansatz(0.1), coupling_graph, seed=3, sabre=sabre, cache=cache)
+    route_bidirectional(get_ansatz(0.1), coupling_graph, seed=4, sabre=sabre, cache=cache)
+    route_bidirectional(get_ansatz(0.1), coupling_graph, initial_mapping={qubit: qubit for qubit in range(5)}, sabre=sabre, cache=cache)
+    _, basic_sabre = get_line_sabre(get_routing_strategy('basic'))
+    route_bidirectional(get_ansatz(0.1), coupling_graph, seed=3, sabre=basic_sabre, cache=cache)
+    route_bidirectional(get_ansatz(0.1), coupling_graph, seed=3, passes=1, sabre=sabre, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 5)
+    assert len(cache.cached_routings) == 5
+
+def test_least_recently_used_entries_are_evicted():
+    coupling_graph, sabre = get_line_sabre()
+    cache = RoutingResultCache(maxsize=2)
+    for seed in (1, 2, 1, 3):
+        route_bidirectional(get_ansatz(0.1), coupling_graph, seed=seed, sabre=sabre, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 3)
+    route_bidirectional(get_ansatz(0.1), coupling_graph, seed=2, sabre=sabre, cache=cache)
+    route_bidirectional(get_ansatz(0.1), coupling_graph, seed=3, sabre=sabre, cache=cache)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+def test_entries_are_reloaded_from_disk(tmp_path):
+    coupling_graph, sabre = get_line_sabre()
+    routed = route_bidirectional(get_ansatz(0.1), coupling_graph, seed=3, sabre=sabre, cache=RoutingResultCache(cache_dir=str(tmp_path)))
+    assert len(list(tmp_path.glob('routing_*.npz'))) == 1
+    reloading_cache = RoutingResultCache(cache_dir=str(tmp_path))
+    assert route_bidirectional(get_ansatz(0.1), coupling_graph, seed=3, sabre=sabre, cache=reloading_cache) == routed
+    assert (reloading_cache.hits, reloading_cache.misses) == (1, 0)
+
+def test_corrupt_files_and_schedules_of_other_circuits_are_misses(tmp_path):
+    coupling_graph, sabre = get_line_sabre()
+    routed = route_bidirectional(get_ansatz(0.1), coupling_graph, seed=3, sabre=sabre, cache=RoutingResultCache(cache_dir=str(tmp_path)))
+    cache_path, = tmp_path.glob('routing_*.npz')
+    cache_path.write_bytes(cache_path.read_bytes()[:40])
+    cache = RoutingResultCache(cache_dir=str(tmp_path))
+    assert route_bidirectional(get_ansatz(0.1), coupling_graph, seed=3, sabre=sabre, cache=cache) == routed
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    circuit_dag = sabre.build_circuit_dag(get_ansatz(0.1))
+    cache_key = get_routing_cache_key(circuit_dag, coupling_graph, dict(sabre.get_routing_settings(), passes=3), seed=3)
+    cache.put(cache_key, CachedRouting.from_routing([0, (0, 9), 1], {qubit: qubit for qubit in range(5)}, {qubit: qubit for qubit in range(5)}))
+    assert cache.get(cache_key, circuit_dag.num_gates) is None
+    assert RoutingResultCache(cache_dir=str(tmp_path)).get(cache_key, circuit_dag.num_gates) is None
+    assert route_bidirectional(get_ansatz(0.1), coupling_graph, seed=3, sabre=sabre, cache=cache) == routed
@@ -0,0 +1,73 @@
+from benchmarks.circuits import qft_circuit, random_cnot_circuit
+from pyquil import Program
+from pyquil.gates import CNOT
+from sabre_tools.circuit_preprocess import get_distance_matrix, get_initial_mapping
+from sabre_tools.layout import Layout
+from sabre_tools.routing import route_bidirectional, route_dag_bidirectional
+from sabre_tools.sabre import SABRE
+from sabre_tools.topologies import get_topology
+
+import pytest
+
+def record_pass_directions(monkeypatch, sabre: SABRE, circuit_dag) -> list:
+    pass_directions = list()
+    route_circuit_dag = sabre.route_circuit_dag
+
+    def record_pass(front_layer_gates, layout, pass_dag, *args, **kwargs):
+        pass_directions.append('forward' if pass_dag is circuit_dag else 'backward')
+        return route_circuit_dag(front_layer_gates, layout, pass_dag, *args, **kwargs)
+
+    monkeypatch.setattr(sabre, 'route_circuit_dag', record_pass)
+    return pass_directions
+
+def route_rebuilding_every_pass(sabre: SABRE, circuit: Program, initial_mapping: dict, passes: int) -> tuple:
+    layout = Layout.from_mapping(initial_mapping, len(sabre.adjacency_bitmap))
+    pass_circuit = circuit
+    for _ in range(passes):
+        pass_dag = sabre.build_circuit_dag(pass_circuit)
+        pass_layout = layout.copy()
+        routed_schedule = sabre.route_circuit_dag(pass_dag.front_layer(), layout, pass_dag)
+        pass_circuit = Program(list(reversed(pass_circuit.instructions)))
+    return sabre.emit_program(routed_schedule, pass_dag), pass_layout.to_mapping(), layout.to_mapping()
+
+@pytest.mark.parametrize('passes', [1, 3, 5])
+def test_odd_pass_counts_end_on_a_forward_pass(monkeypatch, passes):
+    coupling_graph = get_topology('grid:3x3')
+    sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+    circuit = random_cnot_circuit(9, 80, seed=1)
+    circuit_dag = sabre.build_circuit_dag(circuit)
+    pass_directions = record_pass_directions(monkeypatch, sabre, circuit_dag)
+    layout = Layout.from_mapping(get_initial_mapping(circuit, coupling_graph, seed=2), 9)
+    routed_schedule, pass_layout = route_dag_bidirectional(sabre, circuit_dag, layout, passes)
+    assert pass_directions == ['forward', 'backward'] * (passes // 2) + ['forward']
+    assert not sabre.rewiring_correctness(sabre.emit_program(routed_schedule, circuit_dag), pass_layout.to_mapping())
+
+@pytest.mark.parametrize('passes', [0, 2, 4, -1])
+def test_even_pass_counts_are_rejected(passes):
+    coupling_graph = get_topology('line:4')
+    with pytest.raises(ValueError, match="positive odd number"):
+        route_bidirectional(Program(CNOT(0, 3)), coupling_graph, passes=passes, seed=0)
+
+def test_passes_stop_once_the_layout_is_unchanged(monkeypatch):
+    coupling_graph = get_topology('line:4')
+    sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+    circuit = Program(CNOT(0, 1), CNOT(1, 2), CNOT(2, 3), CNOT(1, 0))
+    circuit_dag = sabre.build_circuit_dag(circuit)
+    pass_directions = record_pass_directions(monkeypatch, sabre, circuit_dag)
+    identity_mapping = {qubit: qubit for qubit in range(4)}
+    final_program, initial_mapping, final_mapping = route_bidirectional(circuit, coupling_graph, passes=7, initial_mapping=identity_mapping,
+                                                                        sabre=sabre, circuit_dag=circuit_dag)
+    assert pass_directions == ['forward']
+    assert final_program == circuit
+    assert initial_mapping == final_mapping == identity_mapping
+
+@pytest.mark.parametrize('circuit, topology_spec', [(random_cnot_circuit(9, 120, seed=3), 'grid:3x3'),
+                                                     (random_cnot_circuit(16, 200, seed=4), 'ring:16'),
+                                                     (qft_circuit(8), 'line:8')])
+def test_reversed_dag_matches_rebuilding_the_reversed_circuit(monkeypatch, circuit, topology_spec):
+    coupling_graph = get_topology(topology_spec)
+    sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+    for seed in range(3):
+        initial_mapping = get_initial_mapping(circuit, coupling_graph, seed=seed)
+        assert route_bidirectional(circuit, coupling_graph, passes=3, initial_mapping=initial_mapping, sabre=sabre) == \
+            route_rebuilding_every_pass(sabre, circuit, initial_mapping, passes=3)
@@ -0,0 +1,58 @@
+from benchmarks import strategy_sweep
+from benchmarks.circuits import random_cnot_circuit
+from sabre_tools.circuit_preprocess import get_distance_matrix
+from sabre_tools.routing import route_bidirectional
+from sabre_tools.routing_strategy import ROUTING_STRATEGIES, get_routing_strategy
+from sabre_tools.sabre import SABRE
+from sabre_tools.topologies import get_topology
+
+import json
+import pytest
+
+def test_strategy_specifications_are_parsed():
+    routing_strategy = get_routing_strategy('decay:0.3')
+    assert routing_strategy.get_settings() == {'name': 'decay', 'extended_set_weight': 0.3, 'use_decay': True}
+    assert get_routing_strategy('lookahead').get_settings() == {'name': 'lookahead', 'extended_set_weight': 0.5, 'use_decay': False}
+    assert not get_routing_strategy('basic').uses_extended_set
+
+@pytest.mark.parametrize('strategy_spec', ['foo', 'decay:x', 'basic:0.5', ':0.5'])
+def test_invalid_strategy_specifications_are_rejected(strategy_spec):
+    with pytest.raises(ValueError):
+        get_routing_strategy(strategy_spec)
+
+def test_basic_strategy_never_builds_an_extended_set(monkeypatch):
+    def fail_to_build_extended_set(*args, **kwargs):
+        raise AssertionError("the basic strategy built an extended set")
+
+    monkeypatch.setattr('sabre_tools.sabre.ExtendedSet', fail_to_build_extended_set)
+    coupling_graph = get_topology('grid:3x3')
+    sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph, routing_strategy=get_routing_strategy('basic'))
+    final_program, initial_mapping, _ = route_bidirectional(random_cnot_circuit(9, 60, seed=1), coupling_graph, seed=2, sabre=sabre)
+    assert not sabre.rewiring_correctness(final_program, initial_mapping)
+
+@pytest.mark.parametrize('strategy_spec', sorted(ROUTING_STRATEGIES) + ['decay:0.25', 'lookahead:1.0'])
+def test_every_strategy_routes_correctly(strategy_spec):
+    coupling_graph = get_topology('heavy_hex:1x1')
+    sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph, routing_strategy=get_routing_strategy(strategy_spec))
+    circuit = random_cnot_circuit(12, 80, seed=3)
+    final_program, initial_mapping, _ = route_bidirectional(circuit, coupling_graph, seed=4, sabre=sabre)
+    assert not sabre.rewiring_correctness(final_program, initial_mapping)
+    assert sabre.cnot_count(final_program) >= 80
+
+def test_strategy_sweep_compares_strategies_to_the_baseline(monkeypatch, tmp_path):
+    monkeypatch.setitem(strategy_sweep.BENCHMARK_SUITES, 'tiny', [('random_cnot', {'num_gates': 40}, 'line:5'), ('qft', {}, 'grid:2x3')])
+    output_path = tmp_path / 'sweep.json'
+    strategy_sweep.main(['--suite', 'tiny', '--strategy', 'basic', '--strategy', 'lookahead:0.3', '--seeds', '2', '--output', str(output_path)])
+
+    sweep = json.loads(output_path.read_text())
+    assert sweep['baseline'] == 'decay'
+    assert len(sweep['results']) == 2 * 2 * 3
+    summaries = {summary['strategy']: summary for summary in sweep['summary']}
+    assert sorted(summaries) == ['basic', 'decay', 'lookahead:0.3']
+    assert all(summary['runs'] == 4 for summary in summaries.values())
+    assert summaries['decay']['routing_time_ratio'] == pytest.approx(1.0)
+    assert summaries['decay']['cnot_count_ratio'] == pytest.approx(1.0)
+
+def test_strategy_sweep_rejects_invalid_strategies():
+    with pytest.raises(SystemExit):
+        strategy_sweep.main(['--strategy', 'decay:x'])
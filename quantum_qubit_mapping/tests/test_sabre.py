@@ -0,0 +1,29 @@
+from sabre_tools.circuit_dag import build_circuit_dag
+from sabre_tools.coupling_map import CouplingMap
+from sabre_tools.distance_matrix import compute_distance_matrix
+from sabre_tools.layout import Layout, UNMAPPED
+from sabre_tools.sabre import SABRE
+
+import random
+import numpy as np
+import pytest
+
+def get_sabre(edges: list, **sabre_options) -> SABRE:
+    coupling_map = CouplingMap(edges)
+    return SABRE(compute_distance_matrix(coupling_map), coupling_map, **sabre_options)
+
+def test_forced_routing_bounds_the_swaps_per_gate():
+    sabre = get_sabre([(qubit, qubit + 1) for qubit in range(11)], max_swaps_without_progress=1)
+    rng = random.Random(0)
+    gate_qubits = [tuple(rng.sample(range(12), 2)) for _ in range(200)]
+    routed_schedule, _ = sabre.route_gate_qubits(gate_qubits, {qubit: qubit for qubit in range(12)})
+    assert sorted(operation for operation in routed_schedule if not isinstance(operation, tuple)) == list(range(200))
+    # every gate is made executable after at most one scored SWAP per front gate and a shortest path of forced SWAPs
+    assert sum(isinstance(operation, tuple) for operation in routed_schedule) <= 200 * (12 + 11)
+
+def test_forced_routing_without_a_shortest_path_step_raises():
+    sabre = get_sabre([(0, 1), (1, 2), (2, 3)])
+    layout = Layout(np.array([0, 3], dtype=np.int32), np.array([0, UNMAPPED, UNMAPPED, 1], dtype=np.int32))
+    circuit_dag = build_circuit_dag([(0, 1)])
+    with pytest.raises(ValueError, match="cannot move"):
+        sabre.route_closest_front_gate({0}, layout, circuit_dag)
@@ -0,0 +1,97 @@
+from pyquil import Program
+from sabre_tools.server import RoutingServer, main, request_routing
+from sabre_tools.topologies import get_topology
+
+import asyncio
+import pytest
+
+CIRCUIT_QUIL = "CNOT 0 2\nCNOT 1 3\nCNOT 0 3\n"
+
+def run_with_server(coroutine_function, **server_options):
+    async def run():
+        routing_server = RoutingServer(num_workers=1, **server_options)
+        try:
+            return await coroutine_function(routing_server)
+        finally:
+            await routing_server.close()
+    return asyncio.run(run())
+
+def test_concurrent_requests_for_one_device_are_batched():
+    async def route_concurrently(routing_server):
+        responses = await asyncio.gather(*(routing_server.route(CIRCUIT_QUIL, 'line:4', seed=seed) for seed in range(4)))
+        metrics = await routing_server.handle_request({'op': 'metrics', 'id': 1})
+        return responses, metrics
+
+    responses, metrics = run_with_server(route_concurrently, max_batch_delay=0.5)
+    assert [response['status'] for response in responses] == ['ok'] * 4
+    assert [response['metrics']['batch_size'] for response in responses] == [4] * 4
+    routed_program = Program(responses[0]['quil'])
+    assert len([instruction for instruction in routed_program.instructions if instruction.name == 'CNOT']) == 3
+
+    assert metrics['status'] == 'ok' and metrics['id'] == 1
+    device_metrics = metrics['metrics']['devices']['line:4']
+    assert device_metrics['requests'] == 4
+    assert device_metrics['batches'] == 1
+    assert device_metrics['errors'] == 0
+    assert device_metrics['mean_batch_size'] == 4
+
+def test_unknown_devices_and_bad_quil_get_error_responses():
+    async def send_bad_requests(routing_server):
+        return [
+            await routing_server.handle_request({'quil': CIRCUIT_QUIL, 'device': 'no_such_chip', 'id': 'a'}),
+            await routing_server.handle_request({'quil': CIRCUIT_QUIL, 'device': 'line:100000000'}),
+            await routing_server.handle_request({'quil': CIRCUIT_QUIL, 'device': 4}),
+            await routing_server.handle_request({'device': 'line:4'}),
+            await routing_server.handle_request({'quil': "CNOT 0 1 (", 'device': 'line:4'}),
+            await routing_server.handle_request({'op': 'metrics'}),
+        ]
+
+    unknown_device, huge_device, device_not_a_string, missing_quil, bad_quil, metrics = run_with_server(send_bad_requests)
+    assert unknown_device == {'status': 'error', 'error': "unknown device 'no_such_chip'", 'id': 'a'}
+    assert huge_device['status'] == 'error' and 'limited to 1024' in huge_device['error']
+    assert device_not_a_string['status'] == 'error'
+    assert missing_quil['status'] == 'error'
+    assert bad_quil['status'] == 'error' and bad_quil['metrics']['batch_size'] == 1
+    assert list(metrics['metrics']['devices']) == ['line:4']
+    assert metrics['metrics']['devices']['line:4']['errors'] == 1
+
+def test_only_registered_devices_are_accepted_without_topology_specifications():
+    async def route_both(routing_server):
+        return await routing_server.route(CIRCUIT_QUIL, 'chip', seed=0), await routing_server.route(CIRCUIT_QUIL, 'line:4', seed=0)
+
+    registered_device, topology_spec = run_with_server(route_both, devices={'chip': get_topology('line:4')}, max_device_qubits=0)
+    assert registered_device['status'] == 'ok'
+    assert topology_spec['status'] == 'error'
+
+def test_broken_process_pool_is_replaced():
+    async def kill_workers_between_requests(routing_server):
+        first_response = await routing_server.route(CIRCUIT_QUIL, 'line:4', seed=0)
+        broken_executor = routing_server.executor
+        for process in list(broken_executor._processes.values()):
+            process.kill()
+        failed_response = await routing_server.route(CIRCUIT_QUIL, 'line:4', seed=0)
+        return first_response, failed_response, await routing_server.route(CIRCUIT_QUIL, 'line:4', seed=0), routing_server.executor is broken_executor
+
+    first_response, failed_response, recovered_response, same_executor = run_with_server(kill_workers_between_requests)
+    assert first_response['status'] == 'ok'
+    assert failed_response['status'] == 'error' and 'BrokenProcessPool' in failed_response['error']
+    assert recovered_response['status'] == 'ok'
+    assert recovered_response['quil'] == first_response['quil']
+    assert not same_executor
+
+def test_requests_over_a_connection():
+    async def request_over_tcp(routing_server):
+        server = await routing_server.start('127.0.0.1', 0)
+        async with server:
+            port = server.sockets[0].getsockname()[1]
+            return await request_routing(CIRCUIT_QUIL, 'ring:4', seed=3, port=port)
+
+    response = run_with_server(request_over_tcp)
+    assert response['status'] == 'ok'
+    assert set(response['initial_mapping']) == {'0', '1', '2', '3'}
+
+def test_server_command_rejects_malformed_devices():
+    with pytest.raises(SystemExit):
+        main(['--device', 'grid:4x5'])
+    with pytest.raises(SystemExit):
+        main(['--device', 'chip=grid:4'])
@@ -0,0 +1,51 @@
+from pyquil import Program
+from pyquil.gates import CNOT, H, MEASURE
+from pyquil.quilbase import Declare, Pragma
+from sabre_tools.circuit_preprocess import get_distance_matrix
+from sabre_tools.sabre import SABRE
+from sabre_tools.layout import Layout
+from sabre_tools.streaming import route_stream, write_routed_quil
+
+import networkx as nx
+
+def test_write_routed_quil_with_sparse_mapping(tmp_path):
+    coupling_graph = nx.path_graph(6)
+    sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+    circuit = Program(H(0), CNOT(0, 1), CNOT(1, 2), CNOT(0, 2), CNOT(2, 0))
+    quil_file_path = tmp_path / 'circuit.quil'
+    routed_file_path = tmp_path / 'routed.quil'
+    quil_file_path.write_text(circuit.out())
+    qubit_mapping = {0: 0, 1: 5, 2: 3}
+
+    final_mapping = write_routed_quil(sabre, str(quil_file_path), str(routed_file_path), qubit_mapping, window_size=2, commit_size=1)
+    routed_program = Program(routed_file_path.read_text())
+    assert not sabre.rewiring_correctness(routed_program, qubit_mapping)
+    assert sorted(final_mapping.values()) == list(range(6))
+    assert [instruction for instruction in routed_program.instructions if instruction.name != 'SWAP'] == list(circuit.instructions)
+
+def assert_barriers_keep_their_position(circuit: Program, routed_instructions: list) -> None:
+    routed_positions = [routed_instructions.index(instruction) for instruction in circuit.instructions]
+    declaration, first_pragma, second_pragma = routed_positions[0], routed_positions[3], routed_positions[6]
+    assert declaration == 0
+    assert max(routed_positions[1:3]) < first_pragma < min(routed_positions[4:6])
+    assert max(routed_positions[4:6]) < second_pragma < min(routed_positions[7:])
+
+def test_instructions_without_qubits_keep_their_position(tmp_path):
+    coupling_graph = nx.path_graph(4)
+    sabre = SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+    circuit = Program(Declare('ro', 'BIT', 2), CNOT(0, 3), CNOT(1, 2), Pragma('PRESERVE_BLOCK'), CNOT(3, 0), CNOT(0, 2),
+                      Pragma('END_PRESERVE_BLOCK'), H(1), MEASURE(0, ('ro', 0)), MEASURE(3, ('ro', 1)))
+    qubit_mapping = {qubit: qubit for qubit in range(4)}
+    for window_size, commit_size in ((2, 1), (100, None)):
+        layout = Layout.from_mapping(qubit_mapping, 4)
+        routed_instructions = list(route_stream(sabre, circuit.instructions, layout, window_size, commit_size))
+        assert not sabre.rewiring_correctness(Program(routed_instructions), qubit_mapping)
+        assert_barriers_keep_their_position(circuit, routed_instructions)
+
+    quil_file_path = tmp_path / 'circuit.quil'
+    routed_file_path = tmp_path / 'routed.quil'
+    quil_file_path.write_text(circuit.out())
+    write_routed_quil(sabre, str(quil_file_path), str(routed_file_path), qubit_mapping, window_size=3, commit_size=2)
+    routed_program = Program(routed_file_path.read_text())
+    assert not sabre.rewiring_correctness(routed_program, qubit_mapping)
+    assert_barriers_keep_their_position(circuit, list(routed_program.instructions))
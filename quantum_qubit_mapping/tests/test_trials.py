@@ -0,0 +1,39 @@
+from benchmarks.circuits import random_cnot_circuit
+from sabre_tools.topologies import get_topology
+from sabre_tools.trials import get_trial_seeds, run_sabre_trials
+
+import pytest
+
+def get_trial_programs(trial_results: list) -> list:
+    return [trial_result.final_program for trial_result in trial_results]
+
+def test_same_seed_gives_the_same_trials():
+    coupling_graph = get_topology('grid:3x3')
+    circuit = random_cnot_circuit(9, 60, seed=1)
+    best_trial_result, trial_results = run_sabre_trials(circuit, coupling_graph, num_trials=4, seed=5, num_workers=1)
+    repeated_best_trial_result, repeated_trial_results = run_sabre_trials(circuit, coupling_graph, num_trials=4, seed=5, num_workers=1)
+    assert [trial_result.seed for trial_result in trial_results] == get_trial_seeds(4, 5)
+    assert get_trial_programs(trial_results) == get_trial_programs(repeated_trial_results)
+    assert best_trial_result.seed == repeated_best_trial_result.seed
+    assert best_trial_result.cost == min(trial_result.cnot_count for trial_result in trial_results)
+
+def test_pool_and_serial_trials_pick_the_same_best_trial():
+    coupling_graph = get_topology('ring:8')
+    circuit = random_cnot_circuit(8, 50, seed=2)
+    serial_best, serial_results = run_sabre_trials(circuit, coupling_graph, num_trials=4, seed=3, num_workers=1)
+    pool_best, pool_results = run_sabre_trials(circuit, coupling_graph, num_trials=4, seed=3, num_workers=2)
+    assert get_trial_programs(serial_results) == get_trial_programs(pool_results)
+    assert [trial_result.initial_mapping for trial_result in serial_results] == [trial_result.initial_mapping for trial_result in pool_results]
+    assert serial_best.seed == pool_best.seed
+
+def test_custom_cost_function_picks_the_best_trial():
+    coupling_graph = get_topology('grid:3x3')
+    circuit = random_cnot_circuit(9, 60, seed=1)
+    cost_function = lambda final_program: -len(final_program.instructions)
+    best_trial_result, trial_results = run_sabre_trials(circuit, coupling_graph, num_trials=4, seed=5, num_workers=1, cost_function=cost_function)
+    assert best_trial_result.cost == min(cost_function(trial_result.final_program) for trial_result in trial_results)
+    assert best_trial_result.cnot_count == max(trial_result.cnot_count for trial_result in trial_results)
+
+def test_at_least_one_trial_is_required():
+    with pytest.raises(ValueError, match="num_trials must be at least 1"):
+        run_sabre_trials(random_cnot_circuit(4, 5), get_topology('line:4'), num_trials=0)
@@ -0,0 +1,51 @@
+from pyquil import Program
+from pyquil.gates import CCNOT, CNOT, H, SWAP
+from sabre_tools.checkpoint import reroute_edited_program, route_program_with_checkpoints
+from sabre_tools.circuit_preprocess import get_compact_circuit_dag, get_distance_matrix
+from sabre_tools.sabre import SABRE
+from sabre_tools.verification import find_forbidden_gates, verify_routed_program
+
+import networkx as nx
+import pytest
+
+def get_line_sabre(num_physical_qubits: int) -> SABRE:
+    coupling_graph = nx.path_graph(num_physical_qubits)
+    return SABRE(get_distance_matrix(coupling_graph), coupling_graph)
+
+def test_forbidden_gates_follow_the_swaps():
+    sabre = get_line_sabre(3)
+    qubit_mapping = {0: 0, 1: 1, 2: 2}
+    circuit = Program(CNOT(0, 2), SWAP(1, 2), CNOT(0, 2), CNOT(0, 1))
+    forbidden_gates = find_forbidden_gates(circuit, qubit_mapping, sabre.adjacency_bitmap)
+    assert list(forbidden_gates.values()) == [(0, 2), (0, 2)]
+    assert [str(instruction) for instruction in forbidden_gates] == ['CNOT 0 2', 'CNOT 0 1']
+
+def test_verify_routed_program_metrics():
+    sabre = get_line_sabre(4)
+    qubit_mapping = {0: 0, 1: 1, 2: 2, 3: 3}
+    circuit = Program(H(0), CNOT(0, 3), CNOT(1, 2), CNOT(2, 3))
+    circuit_dag = get_compact_circuit_dag(circuit)
+    routed_program, final_mapping = sabre.execute_sabre_algorithm(circuit_dag.front_layer(), qubit_mapping, circuit_dag)
+
+    forbidden_gates, metrics = verify_routed_program(routed_program, qubit_mapping, sabre.adjacency_bitmap)
+    assert not forbidden_gates
+    assert metrics['cnot_count'] == sabre.cnot_count(routed_program)
+    assert metrics['swap_count'] == (metrics['cnot_count'] - 3) // 3
+    assert metrics['final_mapping'] == final_mapping
+    assert metrics['depth'] >= 3
+
+def test_gates_on_more_than_two_qubits_are_reported_as_forbidden():
+    sabre = get_line_sabre(3)
+    qubit_mapping = {0: 0, 1: 1, 2: 2}
+    circuit = Program(CNOT(0, 1), CCNOT(0, 1, 2), H(2))
+    forbidden_gates, metrics = verify_routed_program(circuit, qubit_mapping, sabre.adjacency_bitmap)
+    assert [str(instruction) for instruction in forbidden_gates] == ['CCNOT 0 1 2']
+    assert list(forbidden_gates.values()) == [(0, 1)]
+    assert metrics['cnot_count'] == 1
+    assert sabre.rewiring_correctness(circuit, qubit_mapping) == forbidden_gates
+
+def test_rerouting_an_edit_with_gates_on_more_than_two_qubits_raises():
+    sabre = get_line_sabre(3)
+    _, checkpointed_routing = route_program_with_checkpoints(sabre, Program(CNOT(0, 2)), {0: 0, 1: 1, 2: 2})
+    with pytest.raises(ValueError, match="more than 2 qubits"):
+        reroute_edited_program(sabre, checkpointed_routing, Program(CCNOT(0, 1, 2)))
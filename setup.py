@@ -8,7 +8,7 @@
 # that they have been altered from the originals.
 
 import pathlib
-from setuptools import setup, find_namespace_packages
+from setuptools import setup, find_packages
 
 # The directory containing this file
 HERE = pathlib.Path(__file__).parent
@@ -34,9 +34,14 @@ setup(
         "Intended Audience :: Science/Research"
         ],
 
-    namespace_packages=['quantum_qubit_mapping'],
-    packages=find_namespace_packages(),
+    package_dir={'': 'quantum_qubit_mapping'},
+    packages=find_packages('quantum_qubit_mapping', include=['sabre_tools', 'sabre_tools.*']),
     include_package_data=True,
-    install_requires=[],
-    entry_points={},
+    install_requires=['numpy', 'networkx', 'pyquil'],
+    entry_points={
+        'console_scripts': [
+            'sabre-route=sabre_tools.cli:main',
+            'sabre-route-server=sabre_tools.server:main',
+        ],
+    },
 )
\ No newline at end of file